@@ -0,0 +1,6 @@
+"""Benchmark operasi Gabung/Validasi dan langkah cleaning dengan data sintetis.
+
+Contoh:
+    python -m benchmarks.run --sizes 10k,100k --output hasil_benchmark.json
+    python -m benchmarks.run --sizes 10k --baseline hasil_benchmark.json
+"""
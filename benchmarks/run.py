@@ -0,0 +1,190 @@
+"""Jalankan benchmark dan simpan hasilnya sebagai JSON agar bisa dibandingkan antar commit."""
+import argparse
+import datetime
+import gc
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.synthetic import generate_cleaning_frame, generate_merge_frames, parse_size
+from cleaning_pipeline import STEPS
+from export import FORMATS, tulis
+from gabung_engine import MODES, VALIDATION_MODES, jalankan_mode, urutan_kolom
+from gabung_stream import rekonsiliasi_streaming
+
+DEFAULT_SIZES = "10k,100k,1M,10M"
+# Nama operasi ekspor per format export.FORMATS ("Ekspor Excel" sama dengan hasil benchmark lama)
+EXPORT_OPERATIONS = {"xlsx": "Ekspor Excel", "csv.gz": "Ekspor CSV.gz", "parquet": "Ekspor Parquet"}
+
+# Parameter tiap langkah cleaning untuk frame dari generate_cleaning_frame
+CLEANING_PARAMS = {
+    "compact": {},
+    "select_columns": {"columns": ["id", "harga", "kota", "tanggal", "catatan", "alamat"]},
+    "rename": {"rename_dict": {"kota": "city"}},
+    "engine_size": {},
+    "label_encode": {"columns": ["kota"]},
+    "clean_numeric": {"columns": ["harga"]},
+    "clean_date": {"columns": ["tanggal"]},
+    "clean_text": {"columns": ["catatan"]},
+    "dropna": {},
+    "swap_values": {"row_index": 0, "column1": "kota", "column2": "catatan"},
+    "move_column": {"column": "alamat", "reference": "id", "direction": "Kiri"},
+    "replace": {"columns": ["kota"], "rules": [("kota", "Jakarta", "DKI Jakarta", False, False)]},
+    "clean_address": {},
+}
+
+# ---------------------------
+# Pengukuran
+# ---------------------------
+def measure(func, repeat=1):
+    """Waktu terbaik dari `repeat` kali jalan, lalu satu jalan terpisah di bawah tracemalloc untuk puncak memori."""
+    timings = []
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    gc.collect()
+    tracemalloc.start()
+    try:
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return {"seconds": min(timings), "peak_mb": peak / 1024 ** 2}
+
+def _ekspor(df, fmt):
+    """Ekspor lewat jalur yang dipakai aplikasi (export.tulis) ke file sementara di disk.
+
+    Memori yang dialokasikan pyarrow tidak tercatat tracemalloc, jadi puncak memori Parquet terlalu kecil.
+    """
+    with tempfile.TemporaryDirectory() as tmp:
+        tulis([("Sheet1", df)], fmt, os.path.join(tmp, f"hasil.{fmt}"))
+
+def _streaming(tmp, path1, path2):
+    """Rekonsiliasi file CSV lewat jalur streaming (spill partisi ke disk), hasil ditulis ke tmp."""
+    rekonsiliasi_streaming(path1, path2, "ID", "ID", "Gabung & Validasi", os.path.join(tmp, "hasil.csv"),
+                           "Harga", "Harga", spill_dir=tmp)
+
+def gabung_cases(rows, args):
+    df1, df2 = generate_merge_frames(rows, args.key_cardinality, args.duplicate_rate,
+                                     args.mismatch_rate, args.overlap, args.seed)
+    for mode in MODES:
+        cmp1 = cmp2 = "Harga" if mode in VALIDATION_MODES else None
+        yield mode, lambda mode=mode, cmp1=cmp1, cmp2=cmp2: jalankan_mode(mode, df1, df2, "ID", "ID", cmp1, cmp2)
+
+    result_df = jalankan_mode("Gabung & Validasi", df1, df2, "ID", "ID", "Harga", "Harga")
+    result_df = result_df[urutan_kolom(result_df, df1.columns, "Gabung & Validasi", "Harga", "Harga")]
+    # Excel ditulis dengan constant_memory dan dipecah per sheet, jadi semua ukuran bisa diukur
+    for fmt in FORMATS:
+        yield EXPORT_OPERATIONS[fmt], lambda fmt=fmt: _ekspor(result_df, fmt)
+
+    # File input ditulis sekali di luar pengukuran; direktori dihapus setelah generator habis
+    with tempfile.TemporaryDirectory() as tmp:
+        path1, path2 = os.path.join(tmp, "data1.csv"), os.path.join(tmp, "data2.csv")
+        df1.to_csv(path1, index=False)
+        df2.to_csv(path2, index=False)
+        yield "Streaming Validasi", lambda: _streaming(tmp, path1, path2)
+
+def cleaning_cases(rows, args):
+    df = generate_cleaning_frame(rows, args.address_mess, args.date_mess, args.number_mess,
+                                 args.missing_rate, args.seed)
+    for name, step in STEPS.items():
+        params = CLEANING_PARAMS[name]
+        yield name, lambda step=step, params=params: step(df, **params)
+
+GROUPS = {"gabung": gabung_cases, "cleaning": cleaning_cases}
+
+# ---------------------------
+# Hasil & Perbandingan
+# ---------------------------
+def _git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def metadata(args):
+    return {
+        "commit": _git_commit(),
+        "timestamp": datetime.datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "pandas": pd.__version__,
+        "numpy": np.__version__,
+        "platform": platform.platform(),
+        "params": {k: v for k, v in vars(args).items() if k not in ("output", "baseline")},
+    }
+
+def compare(results, baseline, threshold):
+    """Baris hasil yang lebih lambat dari baseline melebihi `threshold` kali."""
+    old = {(r["group"], r["operation"], r["rows"]): r for r in baseline["results"] if r["status"] == "ok"}
+    regressions = []
+    for r in results:
+        before = old.get((r["group"], r["operation"], r["rows"]))
+        if before is None or r["status"] != "ok" or not before["seconds"]:
+            continue
+        ratio = r["seconds"] / before["seconds"]
+        if ratio > threshold:
+            regressions.append({**r, "baseline_seconds": before["seconds"], "ratio": ratio})
+    return regressions
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Benchmark operasi Gabung/Validasi dan langkah cleaning.")
+    parser.add_argument("--sizes", default=DEFAULT_SIZES, help="Jumlah baris, dipisah koma (mis. 10k,100k,1M)")
+    parser.add_argument("--groups", default=",".join(GROUPS), help="Kelompok benchmark: gabung, cleaning")
+    parser.add_argument("--repeat", type=int, default=3, help="Jumlah pengulangan pengukuran waktu")
+    parser.add_argument("--output", default="hasil_benchmark.json", help="File JSON hasil")
+    parser.add_argument("--baseline", help="File JSON hasil sebelumnya untuk dibandingkan")
+    parser.add_argument("--threshold", type=float, default=1.2, help="Rasio waktu yang dianggap regresi")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--key-cardinality", type=float, default=1.0)
+    parser.add_argument("--duplicate-rate", type=float, default=0.0)
+    parser.add_argument("--mismatch-rate", type=float, default=0.1)
+    parser.add_argument("--overlap", type=float, default=0.9)
+    parser.add_argument("--address-mess", type=float, default=0.3)
+    parser.add_argument("--date-mess", type=float, default=0.3)
+    parser.add_argument("--number-mess", type=float, default=0.3)
+    parser.add_argument("--missing-rate", type=float, default=0.05)
+    return parser
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    results = []
+    for rows in [parse_size(s) for s in args.sizes.split(",")]:
+        for group in args.groups.split(","):
+            for operation, func in GROUPS[group](rows, args):
+                row = {"group": group, "operation": operation, "rows": rows}
+                try:
+                    row.update(status="ok", **measure(func, args.repeat))
+                except MemoryError:
+                    row.update(status="memory_error", seconds=None, peak_mb=None)
+                results.append(row)
+                detail = (f"{row['seconds']:.3f} s, puncak {row['peak_mb']:.1f} MB"
+                          if row["status"] == "ok" else row["status"])
+                print(f"{group:<9} {operation:<20} {rows:>10,} baris: {detail}", flush=True)
+
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump({"meta": metadata(args), "results": results}, f, indent=2)
+    print(f"Hasil disimpan ke {args.output}")
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.threshold)
+        for r in regressions:
+            print(f"REGRESI {r['group']} {r['operation']} {r['rows']:,} baris: "
+                  f"{r['baseline_seconds']:.3f} s -> {r['seconds']:.3f} s ({r['ratio']:.2f}x)")
+        return 1 if regressions else 0
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
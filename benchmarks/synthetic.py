@@ -0,0 +1,128 @@
+import numpy as np
+import pandas as pd
+
+# ---------------------------
+# Generator Data Sintetis
+# ---------------------------
+# Nilai teks diambil dari pool nilai unik yang dibentuk sekali, lalu diindeks per baris,
+# sehingga frame 10 juta baris tetap bisa dibuat dalam hitungan detik.
+
+CITIES = ["Jakarta", "Bandung", "Surabaya", "Medan", "Semarang", "Makassar", "Denpasar", "Palembang"]
+STREETS = ["Mawar", "Melati", "Sudirman", "Thamrin", "Gatot Subroto", "Diponegoro", "Merdeka", "Pahlawan"]
+WORDS = ["a", "b", "c", "lunas", "cicilan", "baru", "bekas", "promo"]
+DATE_FORMATS = ["%d/%m/%Y", "%m-%d-%Y", "%d %b %Y", "%Y/%m/%d", "%d.%m.%y"]
+POOL_SIZE = 50_000
+
+def parse_size(text):
+    """'10k' -> 10000, '1M' -> 1000000."""
+    text = str(text).strip().lower()
+    factor = {"k": 1_000, "m": 1_000_000}.get(text[-1:], 1)
+    return int(float(text[:-1] if factor > 1 else text) * factor)
+
+def _pick(rng, pool, rows):
+    pool = np.asarray(pool, dtype=object)
+    return pool[rng.integers(0, len(pool), rows)]
+
+def _with_missing(rng, values, missing_rate):
+    if missing_rate:
+        values[rng.random(len(values)) < missing_rate] = np.nan
+    return values
+
+def generate_merge_frames(rows, key_cardinality=1.0, duplicate_rate=0.0, mismatch_rate=0.1,
+                          overlap=0.9, seed=0):
+    """Pasangan (Data 1, Data 2) untuk mode Gabung/Validasi dengan kolom ID, Harga, Nama.
+
+    key_cardinality: jumlah key unik Data 1 dibanding jumlah baris (1.0 = semua unik).
+    duplicate_rate: porsi baris Data 2 yang memakai ulang key baris Data 2 lain.
+    mismatch_rate: porsi baris Data 2 dengan key cocok tetapi Harga berbeda.
+    overlap: porsi key Data 2 yang juga ada di Data 1; sisanya hanya ada di Data 2.
+    """
+    rng = np.random.default_rng(seed)
+    n_keys = max(1, int(rows * key_cardinality))
+    keys1 = rng.permutation(rows) % n_keys
+    prices1 = rng.integers(1_000, 1_000_000, n_keys)
+    names = np.array([f"Produk {i}" for i in range(min(n_keys, POOL_SIZE))], dtype=object)
+
+    df1 = pd.DataFrame({
+        "ID": keys1,
+        "Harga": prices1[keys1],
+        "Nama": names[keys1 % len(names)],
+    })
+
+    found = rng.random(rows) < overlap
+    keys2 = np.where(found, rng.integers(0, n_keys, rows), n_keys + np.arange(rows))
+    duplicate = rng.random(rows) < duplicate_rate
+    if duplicate.any():
+        keys2[duplicate] = keys2[rng.integers(0, rows, int(duplicate.sum()))]
+    prices2 = np.where(keys2 < n_keys, prices1[np.minimum(keys2, n_keys - 1)], rng.integers(1_000, 1_000_000, rows))
+    mismatch = rng.random(rows) < mismatch_rate
+    prices2[mismatch] += rng.integers(1, 1_000, int(mismatch.sum()))
+
+    df2 = pd.DataFrame({
+        "ID": keys2,
+        "Harga": prices2,
+        "Nama": names[keys2 % len(names)],
+    })
+    return df1, df2
+
+def _messy_numbers(rng, rows, mess):
+    values = rng.integers(1_000, 1_000_000, POOL_SIZE)
+    clean = values.astype(object)
+    messy = np.array(
+        [[f"{v:,}", f" {v} ", f"Rp {v}x", f"{v}.00", "abc"][i % 5] for i, v in enumerate(values)],
+        dtype=object,
+    )
+    idx = rng.integers(0, POOL_SIZE, rows)
+    return np.where(rng.random(rows) < mess, messy[idx], clean[idx])
+
+def _messy_dates(rng, rows, mess):
+    days = pd.Timestamp("2000-01-01") + pd.to_timedelta(np.arange(9_000), unit="D")
+    clean = np.asarray(days.strftime("%Y-%m-%d"), dtype=object)
+    variants = [np.asarray(days.strftime(fmt), dtype=object) for fmt in DATE_FORMATS]
+    serials = np.asarray((days - pd.Timestamp("1899-12-30")).days.astype(str), dtype=object)
+    variants += [serials, np.full(len(days), "n/a", dtype=object)]
+    messy = np.stack(variants)
+
+    idx = rng.integers(0, len(days), rows)
+    result = clean[idx]
+    is_messy = rng.random(rows) < mess
+    which = rng.integers(0, len(variants), int(is_messy.sum()))
+    result[is_messy] = messy[which, idx[is_messy]]
+    return result
+
+def _messy_addresses(rng, rows, mess):
+    numbers = rng.integers(1, 1_000, POOL_SIZE)
+    streets = _pick(rng, STREETS, POOL_SIZE)
+    clean = np.array([f"Jl. {s} No. {n}" for s, n in zip(streets, numbers)], dtype=object)
+    messy = np.array(
+        [[f"  {a}  ", "-", "x", "", f"{a} "][i % 5] for i, a in enumerate(clean)],
+        dtype=object,
+    )
+    idx = rng.integers(0, POOL_SIZE, rows)
+    return np.where(rng.random(rows) < mess, messy[idx], clean[idx])
+
+def _notes(rng, rows):
+    pool = np.array(
+        ["; ".join(rng.choice(WORDS, rng.integers(1, 6))) for _ in range(2_000)],
+        dtype=object,
+    )
+    return _pick(rng, pool, rows)
+
+def generate_cleaning_frame(rows, address_mess=0.3, date_mess=0.3, number_mess=0.3,
+                            missing_rate=0.05, seed=0):
+    """Frame untuk langkah cleaning: id, harga, kota, tanggal, catatan, alamat, engine size.
+
+    *_mess: porsi sel yang ditulis dalam bentuk kotor (format campur, spasi, simbol, sampah).
+    missing_rate: porsi sel kosong pada kolom selain id.
+    """
+    rng = np.random.default_rng(seed)
+    engine = _pick(rng, ["1.5", "2000", "1,5", "2.4", "1300", "abc"], rows)
+    return pd.DataFrame({
+        "id": np.arange(rows),
+        "harga": _with_missing(rng, _messy_numbers(rng, rows, number_mess), missing_rate),
+        "kota": _with_missing(rng, _pick(rng, CITIES, rows), missing_rate),
+        "tanggal": _with_missing(rng, _messy_dates(rng, rows, date_mess), missing_rate),
+        "catatan": _with_missing(rng, _notes(rng, rows), missing_rate),
+        "alamat": _with_missing(rng, _messy_addresses(rng, rows, address_mess), missing_rate),
+        "Engine Size": _with_missing(rng, engine, missing_rate),
+    })
@@ -0,0 +1,69 @@
+"""Jalankan resep cleaning (diunduh dari aplikasi Data Cleaning) tanpa Streamlit pada banyak file.
+
+Contoh:
+    python cleaning_cli.py resep_cleaning.json data/harian_*.csv --output-dir bersih --workers 8
+
+    # workbook: sheet tertentu, chunk lebih kecil untuk memori terbatas
+    python cleaning_cli.py resep_cleaning.json laporan.xlsx --sheet Januari --chunksize 20000
+"""
+import argparse
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from cleaning_recipe import baca_resep, jalankan_resep_file
+from gabung_cli import output_paths
+from gabung_stream import DEFAULT_CHUNKSIZE
+
+# Resep dibaca sekali per proses worker, bukan sekali per file
+_recipe = None
+
+def _init_worker(recipe_path):
+    global _recipe
+    _recipe = baca_resep(recipe_path)
+
+def proses_satu_file(path, output_path, args):
+    return path, jalankan_resep_file(_recipe, path, output_path, sheet=args.sheet, chunksize=args.chunksize)
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Terapkan resep cleaning ke banyak file CSV/Excel (output CSV).")
+    parser.add_argument("recipe", help="File resep JSON dari aplikasi Data Cleaning")
+    parser.add_argument("files", nargs="+", help="File CSV/Excel yang dibersihkan")
+    parser.add_argument("--sheet", help="Sheet yang dibaca (Excel); bawaan sheet pertama")
+    parser.add_argument("--output-dir", default=".", help="Folder hasil")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="Jumlah proses paralel")
+    parser.add_argument("--chunksize", type=int, default=DEFAULT_CHUNKSIZE, help="Jumlah baris per chunk")
+    return parser
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    try:
+        baca_resep(args.recipe)
+    except (OSError, ValueError) as exc:
+        parser.error(str(exc))
+    if args.chunksize < 1:
+        parser.error("--chunksize harus lebih dari 0.")
+    os.makedirs(args.output_dir, exist_ok=True)
+
+    failed = 0
+    outputs = output_paths(args.files, args.output_dir, "csv")
+    workers = max(1, min(args.workers or 1, len(args.files)))
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(args.recipe,)) as pool:
+        futures = {pool.submit(proses_satu_file, path, output_path, args): path
+                   for path, output_path in zip(args.files, outputs)}
+        for future in as_completed(futures):
+            path = futures[future]
+            try:
+                _, summary = future.result()
+            except Exception as exc:
+                failed += 1
+                print(f"GAGAL {path}: {exc}", file=sys.stderr)
+                continue
+            unknown = ", ".join(f"{col}={count}" for col, count in summary["unknown_labels"].items())
+            note = f"; label baru (kode -1): {unknown}" if unknown else ""
+            print(f"OK {path} -> {summary['output']} ({summary['rows']} dari {summary['rows_in']} baris{note})")
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,465 @@
+import re
+import warnings
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+
+# ---------------------------
+# Fungsi per Sel (Referensi)
+# ---------------------------
+# Versi per sel dipertahankan sebagai definisi perilaku dan sebagai fallback
+# untuk nilai langka yang tidak tertangani jalur vektor (mis. objek non-teks).
+
+def convert_to_cc(value):
+    try:
+        num = float(value)
+        if num < 10:
+            return int(num * 1000)
+        return int(num)
+    except ValueError:
+        return np.nan
+
+def clean_numeric(value):
+    if isinstance(value, str):
+        value = value.replace(',', '').strip()
+        value = re.sub(r'[^0-9.]', '', value)
+
+    try:
+        return "{:.0f}".format(float(value))
+    except (ValueError, TypeError):
+        return ""
+    except Exception:
+        return value
+
+def clean_text(value):
+    if isinstance(value, str):
+        words = [word.strip() for word in value.split(";") if word.strip()]
+        unique_words = list(dict.fromkeys(words))
+        return "; ".join(unique_words)
+    return value
+
+def clean_address(value):
+    if pd.isna(value) or pd.isnull(value):
+        return value
+    if isinstance(value, str):
+        value = value.strip()
+        if len(value) <= 1 or len(value) < 3:
+            return ""
+        return value.strip()
+    return value
+
+# ---------------------------
+# Kernel Vektor
+# ---------------------------
+# Sel teks difaktorisasi dulu sehingga operasi hanya dilakukan sekali per nilai unik,
+# lalu operasi string dijalankan lewat Arrow compute (bukan loop Python per sel).
+_MAX_EXACT_FLOAT = 2 ** 53
+
+def _is_str(s):
+    """Mask sel bertipe str (kolom object bisa berisi campuran tipe)."""
+    if pd.api.types.is_string_dtype(s.dtype) and s.dtype != object:
+        return s.notna().to_numpy()
+    if s.dtype != object:
+        return np.zeros(len(s), dtype=bool)
+    if pd.api.types.infer_dtype(s, skipna=True) in ("string", "empty"):
+        return s.notna().to_numpy()
+    return np.fromiter((isinstance(v, str) for v in s.to_numpy()), dtype=bool, count=len(s))
+
+def _on_categories(s, kernel):
+    """Jalankan kernel hanya pada daftar kategori, lalu petakan kembali lewat kode kategori."""
+    categories = pd.Series(s.cat.categories.to_numpy(dtype=object), dtype=object)
+    mapped = kernel(categories).to_numpy()
+    missing = kernel(pd.Series([np.nan], dtype=object)).to_numpy()
+    result = np.concatenate([mapped, missing.astype(mapped.dtype, copy=False)])[s.cat.codes.to_numpy()]
+    return pd.Series(result, index=s.index, name=s.name)
+
+def _unique_strings(values):
+    """Faktorisasi array teks: (kode per sel, nilai unik sebagai array Arrow)."""
+    codes, uniques = pd.factorize(np.asarray(values, dtype=object))
+    return codes, pa.array(uniques, type=pa.string())
+
+def _keep_digits_and_dots(strings):
+    """Buang semua karakter selain 0-9 dan "." langsung pada buffer UTF-8 Arrow.
+
+    Byte karakter multi-byte selalu >= 0x80 sehingga ikut terbuang utuh,
+    sama dengan re.sub(r'[^0-9.]', '', value).
+    """
+    strings = pc.cast(strings, pa.large_string()) if strings.type != pa.large_string() else strings
+    _, offsets_buf, data_buf = strings.buffers()
+    offsets = np.frombuffer(offsets_buf, dtype=np.int64)[strings.offset:strings.offset + len(strings) + 1]
+    data = np.frombuffer(data_buf, dtype=np.uint8) if data_buf is not None else np.empty(0, dtype=np.uint8)
+    data = data[offsets[0]:offsets[-1]]
+    keep = ((data >= ord("0")) & (data <= ord("9"))) | (data == ord("."))
+    kept_before = np.concatenate([[0], np.cumsum(keep, dtype=np.int64)])
+    new_offsets = kept_before[offsets - offsets[0]]
+    return pa.LargeStringArray.from_buffers(len(strings), pa.py_buffer(new_offsets), pa.py_buffer(data[keep].tobytes()))
+
+def _format_whole(values):
+    """Setara "{:.0f}".format(v) untuk array float: round-half-even, termasuk "-0", "nan", "inf"."""
+    out = np.empty(len(values), dtype=object)
+    exact = np.isfinite(values) & (np.abs(values) < _MAX_EXACT_FLOAT)
+    rounded = np.round(values[exact])
+    text = rounded.astype(np.int64).astype(str).astype(object)
+    text[np.signbit(rounded) & (rounded == 0)] = "-0"
+    out[exact] = text
+    out[~exact] = ["{:.0f}".format(v) for v in values[~exact]]
+    return out
+
+def _convert_to_cc_scalar(value):
+    try:
+        return convert_to_cc(value)
+    except (TypeError, OverflowError):
+        return np.nan
+
+def _convert_to_cc_values(s):
+    values = pd.to_numeric(s, errors="coerce").to_numpy(dtype=float, na_value=np.nan)
+    converted = np.trunc(np.where(values < 10, values * 1000, values))
+    converted[~np.isfinite(converted)] = np.nan
+    # Format yang diterima float() tapi tidak oleh to_numeric (mis. "1_000") dihitung per nilai
+    residual = np.isnan(values) & s.notna().to_numpy()
+    if residual.any():
+        converted[residual] = s[residual].map(_convert_to_cc_scalar).to_numpy(dtype=float)
+    return converted
+
+def convert_to_cc_series(s):
+    """Versi vektor convert_to_cc: nilai < 10 dianggap liter (x1000), sisanya dibulatkan ke bawah (int).
+
+    Nilai yang gagal diparse menjadi NaN. Berbeda dari versi per sel, None dan inf
+    juga menjadi NaN alih-alih menimbulkan error.
+    """
+    if isinstance(s.dtype, pd.CategoricalDtype):
+        return _on_categories(s, convert_to_cc_series)
+    if pd.api.types.is_bool_dtype(s.dtype):
+        s = s.astype(float)
+    if s.dtype == object:
+        # Hitung pada nilai unik saja; 1, 1.0 dan True memang menghasilkan nilai yang sama
+        codes, uniques = pd.factorize(s.to_numpy())
+        unique_values = _convert_to_cc_values(pd.Series(uniques, dtype=object))
+        converted = np.append(unique_values, np.nan)[codes]
+    else:
+        converted = _convert_to_cc_values(s)
+
+    result = pd.Series(converted, index=s.index, name=s.name)
+    if not result.isna().any() and (result.abs() < 2 ** 63).all():
+        result = result.astype(np.int64)
+    return result
+
+def clean_numeric_series(s):
+    """Versi vektor clean_numeric: hasil berupa teks bilangan bulat, "" jika tidak valid."""
+    if isinstance(s.dtype, pd.CategoricalDtype):
+        return _on_categories(s, clean_numeric_series)
+    if pd.api.types.is_numeric_dtype(s.dtype):
+        out = _format_whole(s.to_numpy(dtype=float, na_value=np.nan))
+        if isinstance(s.dtype, pd.api.extensions.ExtensionDtype):
+            out[s.isna().to_numpy()] = ""  # float(pd.NA) gagal, sama seperti versi per sel
+        return pd.Series(out, index=s.index, name=s.name, dtype=object)
+
+    out = np.empty(len(s), dtype=object)
+    is_str = _is_str(s)
+    if is_str.any():
+        codes, uniques = _unique_strings(s.to_numpy(dtype=object)[is_str])
+        text = _keep_digits_and_dots(uniques)
+        valid = pc.match_substring_regex(text, r"^(\d+\.?\d*|\.\d+)$").to_numpy(zero_copy_only=False)
+        formatted = np.full(len(uniques), "", dtype=object)
+        if valid.any():
+            numbers = pc.cast(text.filter(pa.array(valid)), pa.float64()).to_numpy()
+            formatted[valid] = _format_whole(numbers)
+        out[is_str] = formatted[codes]
+    if (~is_str).any():
+        out[~is_str] = s[~is_str].map(clean_numeric).to_numpy(dtype=object)
+    return pd.Series(out, index=s.index, name=s.name, dtype=object)
+
+def _dedupe_words(uniques):
+    """Pecah per ";", rapikan, buang kata kosong dan duplikat (urutan pertama), gabung "; "."""
+    lists = pc.split_pattern(uniques, ";")
+    words = pc.utf8_trim_whitespace(lists.flatten())
+    parents = pc.list_parent_indices(lists).to_numpy()
+    word_codes = pc.dictionary_encode(words).indices.to_numpy().astype(np.int64)
+    keep = pc.not_equal(words, "").to_numpy(zero_copy_only=False)
+    pair = parents.astype(np.int64) * (int(word_codes.max(initial=0)) + 1) + word_codes
+    _, first = np.unique(pair, return_index=True)
+    is_first = np.zeros(len(pair), dtype=bool)
+    is_first[first] = True
+    keep &= is_first
+    counts = np.bincount(parents[keep], minlength=len(uniques))
+    offsets = pa.array(np.concatenate([[0], np.cumsum(counts)]).astype(np.int32))
+    kept = pa.ListArray.from_arrays(offsets, words.filter(pa.array(keep)))
+    return pc.binary_join(kept, "; ")
+
+def clean_text_series(s):
+    """Versi vektor clean_text: pecah per ";", rapikan, buang kosong dan duplikat, gabung dengan "; "."""
+    if isinstance(s.dtype, pd.CategoricalDtype):
+        return _on_categories(s, clean_text_series)
+    is_str = _is_str(s)
+    if not is_str.any():
+        return s.copy()
+    out = s.to_numpy(dtype=object).copy()
+    codes, uniques = _unique_strings(out[is_str])
+    out[is_str] = np.asarray(_dedupe_words(uniques).to_pylist(), dtype=object)[codes]
+    return pd.Series(out, index=s.index, name=s.name, dtype=object)
+
+def clean_address_series(s):
+    """Versi vektor clean_address: teks dirapikan, teks < 3 karakter menjadi "", lainnya tidak diubah."""
+    if isinstance(s.dtype, pd.CategoricalDtype):
+        return _on_categories(s, clean_address_series)
+    is_str = _is_str(s)
+    if not is_str.any():
+        return s.copy()
+    out = s.to_numpy(dtype=object).copy()
+    codes, uniques = _unique_strings(out[is_str])
+    text = pc.utf8_trim_whitespace(uniques)
+    text = pc.if_else(pc.less(pc.utf8_length(text), 3), "", text)
+    out[is_str] = np.asarray(text.to_pylist(), dtype=object)[codes]
+    return pd.Series(out, index=s.index, name=s.name, dtype=object)
+
+# ---------------------------
+# Kernel Tanggal
+# ---------------------------
+# Tanggal diparse hanya pada nilai unik. Format dominan dipilih sekali per kolom
+# (format yang paling banyak cocok dipakai dulu, lalu format berikutnya untuk sisanya),
+# dan hanya nilai yang tidak cocok dengan format mana pun yang diparse satu per satu.
+
+DATE_OUTPUT_FORMAT = "%d-%m-%Y"
+EXCEL_EPOCH = pd.Timestamp("1899-12-30")
+EXCEL_SERIAL_MAX = 2958465  # 31-12-9999
+# Deteksi otomatis hanya menganggap angka sebagai serial Excel jika berada di rentang yang wajar
+# dan mendominasi kolom, agar angka biasa (mis. tahun 2021) tidak menjadi tanggal tahun 1905
+EXCEL_SERIAL_PLAUSIBLE = (10958, 73050)  # 01-01-1930 s.d. 31-12-2099
+EXCEL_SERIAL_SHARE = 0.8
+_EXCEL_SERIAL_TEXT = r"\d{5}(\.\d+)?"
+_DAY_FIRST_FORMATS = ["%d/%m/%Y", "%d-%m-%Y", "%d.%m.%Y", "%d/%m/%y", "%d/%m/%Y %H:%M", "%d/%m/%Y %H:%M:%S"]
+_MONTH_FIRST_FORMATS = ["%m/%d/%Y", "%m-%d-%Y", "%m.%d.%Y", "%m/%d/%y", "%m/%d/%Y %H:%M", "%m/%d/%Y %H:%M:%S"]
+_OTHER_FORMATS = ["%Y/%m/%d", "%d %B %Y", "%d %b %Y", "%B %d, %Y", "%b %d, %Y"]
+
+def clean_date(value):
+    try:
+        return pd.to_datetime(value, errors="coerce").strftime(DATE_OUTPUT_FORMAT)
+    except Exception:
+        return np.nan
+
+def _candidate_formats(dayfirst):
+    """Urutan kandidat format; jika jumlah cocok sama, format yang lebih awal menang.
+
+    Tanpa pilihan dayfirst, bulan-dulu didahulukan agar tanggal ambigu (05/02/2021)
+    tetap dibaca seperti pd.to_datetime biasa kecuali kolomnya jelas hari-dulu.
+    """
+    if dayfirst is True:
+        ordered = _DAY_FIRST_FORMATS
+    elif dayfirst is False:
+        ordered = _MONTH_FIRST_FORMATS
+    else:
+        ordered = _MONTH_FIRST_FORMATS + _DAY_FIRST_FORMATS
+    return ["ISO8601"] + ordered + _OTHER_FORMATS
+
+def _format_dates(parsed):
+    """Ubah hasil parsing (Series) menjadi teks DD-MM-YYYY; NaT menjadi NaN."""
+    if pd.api.types.is_datetime64_any_dtype(parsed.dtype):
+        return parsed.dt.strftime(DATE_OUTPUT_FORMAT).to_numpy(dtype=object)
+    # Zona waktu campuran menghasilkan Series object berisi Timestamp
+    return parsed.map(lambda t: np.nan if pd.isna(t) else t.strftime(DATE_OUTPUT_FORMAT)).to_numpy(dtype=object)
+
+def _parse_with(values, fmt):
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        try:
+            return pd.to_datetime(pd.Series(values, dtype=object), format=fmt, errors="coerce")
+        except (ValueError, TypeError, OverflowError):
+            return None
+
+def _kandidat_serial(uniques, is_number, is_text, bounds):
+    """Nilai angka per nilai unik yang bisa dibaca sebagai serial Excel dalam rentang bounds, selain itu NaN."""
+    numbers = np.full(len(uniques), np.nan)
+    numbers[is_number] = uniques[is_number].astype(float)
+    if is_text.any():
+        text = pd.Series(uniques[is_text], dtype=object)
+        numbers[is_text] = pd.to_numeric(text.where(text.str.fullmatch(_EXCEL_SERIAL_TEXT)), errors="coerce")
+    with np.errstate(invalid="ignore"):
+        return np.where((numbers >= bounds[0]) & (numbers <= bounds[1]), numbers, np.nan)
+
+def _excel_serial_dates(numbers):
+    numbers = np.asarray(numbers, dtype=float)
+    in_range = (numbers >= 1) & (numbers <= EXCEL_SERIAL_MAX)
+    days = np.where(in_range, numbers, np.nan)
+    parsed = pd.Series(EXCEL_EPOCH + pd.to_timedelta(days, unit="D"))
+    return _format_dates(parsed)
+
+def _fallback_date(value, dayfirst):
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        try:
+            return pd.to_datetime(value, errors="coerce", dayfirst=bool(dayfirst)).strftime(DATE_OUTPUT_FORMAT)
+        except Exception:
+            return np.nan
+
+def urutan_hari_dulu(formats):
+    """True jika format tanggal terdeteksi hanya berurutan hari-dulu, False jika hanya bulan-dulu, selain itu None."""
+    day_first = any(fmt in _DAY_FIRST_FORMATS for fmt in formats)
+    month_first = any(fmt in _MONTH_FIRST_FORMATS for fmt in formats)
+    return None if day_first == month_first else day_first
+
+def _pakai_format(uniques, remaining, fmt):
+    """Hasil parsing nilai unik remaining dengan fmt (Series) beserta jumlah yang cocok, atau None."""
+    parsed = _parse_with(uniques[remaining], fmt)
+    return None if parsed is None else (int(parsed.notna().sum()), parsed)
+
+def clean_date_series(s, dayfirst=None, excel_serial=None, report=None, formats=None):
+    """Versi vektor clean_date: teks tanggal campuran dan serial Excel menjadi DD-MM-YYYY.
+
+    Nilai yang tidak bisa dibaca menjadi NaN. Jika report (dict) diberikan, isinya diisi
+    ringkasan: jumlah nilai unik, format yang terdeteksi (dengan jumlah nilai unik per format),
+    jumlah nilai unik yang diparse satu per satu, dan jumlah nilai yang menjadi NaT.
+    excel_serial None (otomatis) membaca angka sebagai serial Excel hanya jika angka dalam
+    EXCEL_SERIAL_PLAUSIBLE mencakup minimal EXCEL_SERIAL_SHARE nilai kolom; True selalu membaca
+    angka 1 s.d. EXCEL_SERIAL_MAX sebagai serial, False tidak pernah.
+    formats opsional berisi daftar format hasil deteksi sebelumnya (kunci report["formats"]);
+    format itu dipakai sesuai urutannya tanpa deteksi ulang, mis. saat resep diulang per chunk.
+    """
+    if isinstance(s.dtype, pd.CategoricalDtype):
+        s = s.astype(object)
+    stats = {"values": int(s.notna().sum()), "unique": 0, "formats": {}, "fallback": 0, "nat": 0}
+    if pd.api.types.is_datetime64_any_dtype(s.dtype):
+        out = s.dt.strftime(DATE_OUTPUT_FORMAT).to_numpy(dtype=object)
+        formats = {"datetime": stats["values"]}
+    else:
+        values = s.to_numpy(dtype=object)
+        codes, uniques = pd.factorize(values)
+        uniques = np.asarray(uniques, dtype=object)
+        unique_out = np.full(len(uniques), np.nan, dtype=object)
+        done = np.zeros(len(uniques), dtype=bool)
+        pinned = None
+        check_share = excel_serial is None
+        if formats is not None:
+            pinned = [fmt for fmt in formats if fmt not in ("excel serial", "datetime")]
+            # Keputusan serial Excel ikut dari deteksi sebelumnya, bukan dari porsi chunk ini
+            check_share = False
+            if "excel serial" not in formats:
+                excel_serial = False
+        formats = {}
+
+        is_text = np.fromiter((isinstance(v, str) for v in uniques), dtype=bool, count=len(uniques))
+        is_number = np.fromiter((isinstance(v, (int, float, np.number)) and not isinstance(v, (bool, np.bool_))
+                                 for v in uniques), dtype=bool, count=len(uniques))
+        if excel_serial is not False:
+            bounds = (1, EXCEL_SERIAL_MAX) if excel_serial else EXCEL_SERIAL_PLAUSIBLE
+            numbers = _kandidat_serial(uniques, is_number, is_text, bounds)
+            serial = ~np.isnan(numbers)
+            if check_share and serial.any():
+                counts = np.bincount(codes[codes >= 0], minlength=len(uniques))
+                if counts[serial].sum() < EXCEL_SERIAL_SHARE * counts.sum():
+                    serial[:] = False
+            if serial.any():
+                unique_out[serial] = _excel_serial_dates(numbers[serial])
+                done |= serial
+                formats["excel serial"] = int(serial.sum())
+
+        candidates = _candidate_formats(dayfirst) if pinned is None else pinned
+        for step in range(len(candidates)):
+            remaining = np.flatnonzero(is_text & ~done)
+            if not len(remaining):
+                break
+            best = None
+            # Format tetap dipakai berurutan; tanpa itu dipilih format yang paling banyak cocok
+            for fmt in candidates if pinned is None else candidates[step:step + 1]:
+                if fmt in formats:
+                    continue
+                result = _pakai_format(uniques, remaining, fmt)
+                if result is not None and result[0] and (best is None or result[0] > best[1]):
+                    best = (fmt, *result)
+                    if result[0] == len(remaining):
+                        # Semua sisa nilai cocok: format lain tidak mungkin lebih baik
+                        break
+            if best is None:
+                if pinned is None:
+                    break
+                continue
+            fmt, hits, parsed = best
+            matched = parsed.notna().to_numpy()
+            unique_out[remaining[matched]] = _format_dates(parsed[matched])
+            done[remaining[matched]] = True
+            formats[fmt] = hits
+
+        # Sisa nilai (format tak dikenal, objek datetime, dsb.) diparse satu per satu
+        leftover = np.flatnonzero(~done & pd.notna(uniques))
+        for i in leftover:
+            unique_out[i] = _fallback_date(uniques[i], dayfirst)
+        out = np.append(unique_out, np.nan)[codes]
+        stats["unique"] = len(uniques)
+        stats["fallback"] = int(len(leftover))
+
+    result = pd.Series(out, index=s.index, name=s.name, dtype=object)
+    stats["formats"] = formats
+    stats["nat"] = int((s.notna() & result.isna()).sum())
+    if report is not None:
+        report.update(stats)
+    return result
+
+# ---------------------------
+# Mapping Nilai (Replace Value)
+# ---------------------------
+# Aturan dicocokkan terhadap nilai unik kolom saja, lalu hasilnya dipetakan kembali lewat
+# kode faktorisasi, sehingga biayanya bergantung pada jumlah nilai unik, bukan jumlah baris.
+
+def _faktor_per_tipe(values):
+    """pd.factorize untuk kolom object yang membedakan tipe nilai.
+
+    factorize menganggap 1, 1.0 dan True sama, padahal bentuk teksnya berbeda ("1", "1.0",
+    "True"). Kolom yang seluruhnya teks memakai factorize biasa.
+    """
+    if pd.api.types.infer_dtype(values, skipna=True) in ("string", "empty"):
+        return pd.factorize(values)
+    present = np.flatnonzero(pd.notna(values))
+    tagged = np.full(len(values), None, dtype=object)
+    tagged[present] = [(type(v), v) for v in values[present]]
+    codes, _ = pd.factorize(tagged)
+    _, first = np.unique(codes[present], return_index=True)
+    return codes, values[present[first]]
+
+def map_values_series(s, rules):
+    """Ganti nilai menurut rules: urutan (nilai lama, nilai baru, regex, abaikan kapital).
+
+    Setiap nilai diganti paling banyak sekali (aturan tidak berantai). Kecocokan persis
+    didahulukan, lalu kecocokan tanpa membedakan huruf besar/kecil, lalu aturan regex sesuai
+    urutan (substitusi seperti re.sub, hanya untuk nilai teks); di tiap kelompok aturan yang
+    lebih awal menang. Nilai non-teks dicocokkan lewat bentuk teksnya, mis. 1200 dengan "1200".
+    """
+    if isinstance(s.dtype, pd.CategoricalDtype):
+        return _on_categories(s, lambda categories: map_values_series(categories, rules))
+    codes, uniques = _faktor_per_tipe(s.to_numpy(dtype=object))
+    keys = pd.Series(uniques, dtype=object).astype(str)
+    new_values = pd.Series(uniques, dtype=object)
+    mapped = np.zeros(len(uniques), dtype=bool)
+
+    # dict dari daftar terbalik: untuk nilai lama yang sama, aturan paling awal yang tersisa
+    exact = dict(reversed([(old, new) for old, new, regex, ignore_case in rules if not regex and not ignore_case]))
+    if exact:
+        hit = keys.isin(exact.keys()).to_numpy()
+        new_values[hit] = keys[hit].map(exact)
+        mapped |= hit
+
+    folded = dict(reversed([(old.lower(), new) for old, new, regex, ignore_case in rules if not regex and ignore_case]))
+    if folded and not mapped.all():
+        lower = keys.str.lower()
+        hit = ~mapped & lower.isin(folded.keys()).to_numpy()
+        new_values[hit] = lower[hit].map(folded)
+        mapped |= hit
+
+    is_text = np.fromiter((isinstance(v, str) for v in uniques), dtype=bool, count=len(uniques))
+    for old, new, regex, ignore_case in rules:
+        if not regex:
+            continue
+        candidates = np.flatnonzero(is_text & ~mapped)
+        if not len(candidates):
+            break
+        pattern = re.compile(old, re.IGNORECASE if ignore_case else 0)
+        before = keys.iloc[candidates]
+        after = before.str.replace(pattern, new, regex=True)
+        changed = candidates[(after != before).to_numpy()]
+        new_values[changed] = after[after != before].to_numpy()
+        mapped[changed] = True
+
+    if not mapped.any():
+        return s
+    out = np.append(new_values.to_numpy(), np.nan)[codes]
+    return pd.Series(out, index=s.index, name=s.name, dtype=object)
@@ -0,0 +1,310 @@
+import functools
+import hashlib
+import os
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+from sklearn.preprocessing import LabelEncoder
+
+from cleaning_kernels import (
+    clean_address_series,
+    clean_date_series,
+    clean_numeric_series,
+    clean_text_series,
+    convert_to_cc_series,
+    map_values_series,
+    urutan_hari_dulu,
+)
+from dtype_compaction import compact_frame
+from jobs import lapor
+
+# ---------------------------
+# Langkah Cleaning
+# ---------------------------
+# Setiap langkah menerima DataFrame dan parameter, lalu mengembalikan DataFrame baru
+# tanpa mengubah input, karena frame input bisa saja berasal dari cache.
+
+ENGINE_SIZE_VARIANTS = {'engine size', 'engine_size', 'enginesize', 'engine size2', 'engine_size2', 'enginesize2'}
+ADDRESS_COLUMNS = ['address', 'alamat']
+
+def step_compact(df):
+    """Perkecil tipe data; laporan memori per kolom disimpan di df.attrs["memory_report"]."""
+    df, report = compact_frame(df)
+    df.attrs["memory_report"] = report.to_dict("records")
+    return df
+
+def step_select_columns(df, columns):
+    return df[columns]
+
+def step_rename(df, rename_dict):
+    return df.rename(columns=rename_dict)
+
+def step_engine_size(df):
+    """Ubah nama kolom ke huruf kecil dan konversi kolom engine size ke cc."""
+    df = df.copy()
+    df.columns = df.columns.str.lower()
+    matching_column = next((col for col in df.columns if col in ENGINE_SIZE_VARIANTS), None)
+    if matching_column:
+        df['engine size'] = convert_to_cc_series(df[matching_column])
+        df = df.drop(columns=[matching_column])
+    return df
+
+def _lapor_kolom(progress, i, columns):
+    lapor(progress, i / len(columns), f"kolom {i}/{len(columns)}")
+
+class LabelVocabulary(tuple):
+    """Kategori hasil fit LabelEncoder (terurut); kode sebuah nilai = posisinya di tuple.
+
+    Tidak disalin ulang oleh deepcopy df.attrs dan repr-nya hanya digest, sehingga kosakata besar
+    tetap murah disimpan di attrs dan di parameter langkah (kunci cache).
+    """
+
+    def __deepcopy__(self, memo):
+        return self
+
+    def __repr__(self):
+        digest = hashlib.blake2b("\x1f".join(self).encode("utf-8"), digest_size=16).hexdigest()
+        return f"LabelVocabulary({len(self)}, {digest})"
+
+def _kode_label(s, vocabulary):
+    """Kode nilai menurut kosakata tetap; nilai di luar kosakata menjadi -1."""
+    codes = pd.Categorical(s.astype(str), categories=list(vocabulary)).codes.astype(np.int64)
+    missing = codes < 0
+    if missing.any() and s.dtype.kind in "iuf":
+        # Dtype chunk bisa berbeda dengan data saat fit (5 vs 5.0); coba bentuk teks angka lainnya
+        numbers = s.to_numpy(dtype=float, na_value=np.nan)[missing]
+        integral = np.isfinite(numbers) & (numbers == np.floor(numbers))
+        alternatives = np.full(len(numbers), None, dtype=object)
+        if s.dtype.kind == "f":
+            alternatives[integral] = numbers[integral].astype(np.int64).astype(str)
+        else:
+            alternatives[integral] = pd.Series(numbers[integral]).astype(str).to_numpy()
+        codes[missing] = pd.Categorical(alternatives, categories=list(vocabulary)).codes
+    return codes
+
+def step_label_encode(df, columns, vocabularies=None, progress=None):
+    """Label encoding; kosakata per kolom disimpan di df.attrs["label_vocabularies"].
+
+    Kolom yang ada di vocabularies memakai kosakata tersebut (kode sama antar file/chunk, nilai
+    baru = -1, jumlahnya di df.attrs["label_unknown"]); kolom lain di-fit dari datanya sendiri.
+    """
+    df = df.copy()
+    le = LabelEncoder()
+    vocabularies = vocabularies or {}
+    fitted, unknown = {}, {}
+    for i, col in enumerate(columns, start=1):
+        vocabulary = vocabularies.get(col)
+        if vocabulary is None:
+            df[col] = le.fit_transform(df[col].astype(str))
+            fitted[col] = LabelVocabulary(le.classes_.tolist())
+        else:
+            codes = _kode_label(df[col], vocabulary)
+            df[col] = codes
+            fitted[col] = LabelVocabulary(vocabulary)
+            unknown[col] = int((codes < 0).sum())
+        _lapor_kolom(progress, i, columns)
+    df.attrs["label_vocabularies"] = fitted
+    df.attrs["label_unknown"] = unknown
+    return df
+
+def _apply_columns(df, columns, func, progress=None):
+    df = df.copy()
+    for i, col in enumerate(columns, start=1):
+        df[col] = func(df[col])
+        _lapor_kolom(progress, i, columns)
+    return df
+
+def step_clean_numeric(df, columns, progress=None):
+    return _apply_columns(df, columns, clean_numeric_series, progress)
+
+def step_clean_date(df, columns, dayfirst=None, formats=None, progress=None):
+    """Konversi tanggal; ringkasan parsing per kolom disimpan di df.attrs["date_report"].
+
+    formats opsional berisi format terdeteksi per kolom (lihat parameter_terlatih).
+    """
+    df = df.copy()
+    reports = {}
+    for i, col in enumerate(columns, start=1):
+        reports[col] = {}
+        df[col] = clean_date_series(df[col], dayfirst=dayfirst, report=reports[col],
+                                    formats=(formats or {}).get(col))
+        _lapor_kolom(progress, i, columns)
+    df.attrs["date_report"] = reports
+    return df
+
+def step_clean_text(df, columns, progress=None):
+    return _apply_columns(df, columns, clean_text_series, progress)
+
+def step_dropna(df):
+    return df.dropna()
+
+def step_swap_values(df, row_index, column1, column2):
+    df = df.copy()
+    # Kolom category hanya menerima nilai yang sudah ada di kategorinya
+    for col in (column1, column2):
+        if isinstance(df[col].dtype, pd.CategoricalDtype):
+            df[col] = df[col].astype(object)
+    df.at[row_index, column1], df.at[row_index, column2] = df.at[row_index, column2], df.at[row_index, column1]
+    return df
+
+def step_move_column(df, column, reference, direction):
+    # Arah Kanan dan Kiri menghasilkan urutan yang sama, mengikuti perilaku form sebelumnya
+    cols = df.columns.tolist()
+    cols.insert(cols.index(reference), cols.pop(cols.index(column)))
+    return df[cols]
+
+def step_replace(df, columns, rules, progress=None):
+    """rules: tuple (kolom, nilai lama, nilai baru, regex, abaikan kapital) sesuai urutan tabel mapping.
+
+    Aturan dengan kolom kosong berlaku untuk semua kolom terpilih.
+    """
+    df = df.copy()
+    for i, col in enumerate(columns, start=1):
+        col_rules = [rule[1:] for rule in rules if rule[0] in ("", col)]
+        if col_rules:
+            df[col] = map_values_series(df[col], col_rules)
+        _lapor_kolom(progress, i, columns)
+    return df
+
+def step_clean_address(df):
+    df = df.copy()
+    df.columns = df.columns.str.lower()
+    target_column = next((col for col in df.columns if col in ADDRESS_COLUMNS), None)
+    df[target_column] = clean_address_series(df[target_column])
+    return df
+
+STEPS = {
+    "compact": step_compact,
+    "select_columns": step_select_columns,
+    "rename": step_rename,
+    "engine_size": step_engine_size,
+    "label_encode": step_label_encode,
+    "clean_numeric": step_clean_numeric,
+    "clean_date": step_clean_date,
+    "clean_text": step_clean_text,
+    "dropna": step_dropna,
+    "swap_values": step_swap_values,
+    "move_column": step_move_column,
+    "replace": step_replace,
+    "clean_address": step_clean_address,
+}
+
+# Langkah per kolom yang melaporkan progress setelah setiap kolom selesai
+PROGRESS_STEPS = {"label_encode", "clean_numeric", "clean_date", "clean_text", "replace"}
+
+def parameter_terlatih(name, params, df):
+    """Parameter langkah ditambah hasil fit dari frame keluarannya, agar langkah bisa diulang persis.
+
+    label_encode mendapat kosakata per kolom; clean_date mendapat format terdeteksi per kolom dan,
+    tanpa urutan hari/bulan, urutan yang terdeteksi (jika semua kolom sepakat) untuk nilai yang
+    diparse satu per satu.
+    """
+    if name == "label_encode":
+        return {**params, "vocabularies": dict(df.attrs.get("label_vocabularies", {}))}
+    if name == "clean_date":
+        reports = df.attrs.get("date_report", {})
+        params = {**params, "formats": {col: list(report.get("formats", {})) for col, report in reports.items()}}
+        orders = {urutan_hari_dulu(report.get("formats", {})) for report in reports.values()}
+        orders.discard(None)
+        if params.get("dayfirst") is None and len(orders) == 1:
+            return {**params, "dayfirst": orders.pop()}
+    return params
+
+def jalankan_langkah(df, name, params, progress=None):
+    """Jalankan satu langkah dari STEPS; progress hanya diteruskan ke langkah di PROGRESS_STEPS."""
+    if name in PROGRESS_STEPS:
+        return STEPS[name](df, progress=progress, **params)
+    return STEPS[name](df, **params)
+
+# ---------------------------
+# Cache Hasil Langkah
+# ---------------------------
+PIPELINE_CACHE_MAX_BYTES = int(os.environ.get("DATA_CLEANING_PIPELINE_CACHE_MB", "1024")) * 1024 * 1024
+FRAME_BYTES_SAMPLE_ROWS = 1_000
+
+def frame_bytes(df):
+    """Perkiraan memori frame tanpa memory_usage(deep=True) pada seluruh baris.
+
+    Ukuran dangkal dihitung persis; isi objek Python (teks) di kolom object diperkirakan dari
+    sampel baris yang tersebar rata lalu diskalakan ke jumlah baris.
+    """
+    total = int(df.memory_usage(deep=False, index=True).sum())
+    positions = [i for i, dtype in enumerate(df.dtypes)
+                 if dtype == object or (isinstance(dtype, pd.StringDtype) and dtype.storage == "python")]
+    if not positions or not len(df):
+        return total
+    rows = np.unique(np.linspace(0, len(df) - 1, min(len(df), FRAME_BYTES_SAMPLE_ROWS)).astype(np.intp))
+    sample = df.iloc[rows, positions]
+    extra = sample.memory_usage(deep=True, index=False).sum() - sample.memory_usage(deep=False, index=False).sum()
+    return total + int(extra * len(df) / len(rows))
+
+def step_key(input_key, name, params):
+    """Kunci langkah = hash(kunci input, nama langkah, konfigurasi)."""
+    payload = repr((input_key, name, sorted(params.items())))
+    return hashlib.blake2b(payload.encode("utf-8"), digest_size=16).hexdigest()
+
+class StepCache:
+    """Cache LRU untuk frame hasil langkah dengan batas total memori."""
+
+    def __init__(self, max_bytes=PIPELINE_CACHE_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self.total_bytes = 0
+        self._entries = OrderedDict()
+
+    def get(self, key):
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        self._entries.move_to_end(key)
+        return entry[0]
+
+    def put(self, key, df):
+        size = frame_bytes(df)
+        if size > self.max_bytes:
+            return
+        if key in self._entries:
+            self.total_bytes -= self._entries.pop(key)[1]
+        self._entries[key] = (df, size)
+        self.total_bytes += size
+        while self.total_bytes > self.max_bytes:
+            _, (_, old_size) = self._entries.popitem(last=False)
+            self.total_bytes -= old_size
+
+class Pipeline:
+    """Jalankan langkah cleaning berurutan; hasil tiap langkah diambil dari cache bila konfigurasinya sama.
+
+    Karena kunci tiap langkah dirantai dari kunci langkah sebelumnya, mengubah satu langkah
+    hanya menghitung ulang langkah itu dan langkah-langkah sesudahnya.
+    """
+
+    def __init__(self, df, source_key, cache, profiler=None, runner=None):
+        self.df = df
+        self.key = source_key
+        self.cache = cache
+        self.profiler = profiler
+        # runner(key, name, compute) opsional menjalankan compute(progress=...) di tempat lain,
+        # mis. sebagai job latar belakang, dan mengembalikan hasilnya
+        self.runner = runner
+        self.steps = []
+
+    def _run_step(self, name, params):
+        key = step_key(self.key, name, params)
+        df = self.cache.get(key)
+        cache_hit = df is not None
+        if df is None:
+            compute = functools.partial(jalankan_langkah, self.df, name, params)
+            df = compute() if self.runner is None else self.runner(key, name, compute)
+            self.cache.put(key, df)
+        return df, key, cache_hit
+
+    def run(self, name, **params):
+        if self.profiler is None:
+            df, key, _ = self._run_step(name, params)
+        else:
+            with self.profiler.stage(f"cleaning: {name}", rows_in=len(self.df)) as record:
+                df, key, record["cache_hit"] = self._run_step(name, params)
+                record["rows_out"] = len(df)
+        self.df, self.key = df, key
+        self.steps.append((name, parameter_terlatih(name, params, df)))
+        return df
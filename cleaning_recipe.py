@@ -0,0 +1,115 @@
+import json
+import os
+import shutil
+import tempfile
+
+import pandas as pd
+
+from cleaning_pipeline import STEPS, LabelVocabulary, jalankan_langkah
+from gabung_stream import DEFAULT_CHUNKSIZE, HasilBertahap, baca_chunks_seragam, baca_header, skema_file
+from jobs import bagian, lapor
+
+# ---------------------------
+# Resep Cleaning
+# ---------------------------
+# Resep = daftar langkah (nama, parameter) yang dikonfigurasi di aplikasi, lengkap dengan hasil
+# fit-nya (kosakata label encoding, urutan hari/bulan tanggal; lihat parameter_terlatih), disimpan
+# sebagai JSON. Resep yang sama bisa dijalankan ulang tanpa Streamlit pada banyak file, per chunk,
+# dan menghasilkan kode label yang sama di semua file. Semua langkah resep bekerja per baris/kolom
+# dengan parameter yang sudah tetap (kosakata label, format tanggal per kolom), dan setiap chunk
+# dibaca dengan tipe kolom seluruh file (gabung_stream.skema_file), jadi hasil per chunk sama
+# dengan hasil seluruh file sekaligus (lihat tests/test_cleaning_recipe.py).
+
+RECIPE_VERSION = 1
+# compact hanya mengatur memori di aplikasi; swap_values menunjuk indeks baris data tertentu
+NON_RECIPE_STEPS = {"compact", "swap_values"}
+RECIPE_STEPS = [name for name in STEPS if name not in NON_RECIPE_STEPS]
+
+def buat_resep(steps):
+    """Resep dari daftar langkah Pipeline.steps; langkah di NON_RECIPE_STEPS dilewati."""
+    return {
+        "versi": RECIPE_VERSION,
+        "langkah": [{"nama": name, "parameter": params} for name, params in steps if name not in NON_RECIPE_STEPS],
+    }
+
+def resep_json(recipe):
+    return json.dumps(recipe, ensure_ascii=False, indent=2)
+
+def _parameter(name, params):
+    """Kembalikan bentuk parameter yang hilang saat disimpan sebagai JSON (tuple, kosakata)."""
+    if name == "label_encode":
+        params["vocabularies"] = {col: LabelVocabulary(v) for col, v in (params.get("vocabularies") or {}).items()}
+    if name == "replace":
+        params["rules"] = [tuple(rule) for rule in params["rules"]]
+    return params
+
+def baca_resep(source):
+    """Resep dari teks JSON, path file, atau file upload. ValueError jika formatnya tidak dikenal."""
+    if hasattr(source, "getvalue"):
+        source = source.getvalue()
+    elif isinstance(source, (str, os.PathLike)) and os.path.exists(source):
+        with open(source, "rb") as handle:
+            source = handle.read()
+    try:
+        recipe = json.loads(source)
+    except (TypeError, ValueError) as exc:
+        raise ValueError(f"Resep bukan JSON yang valid: {exc}") from exc
+    if not isinstance(recipe, dict) or recipe.get("versi") != RECIPE_VERSION:
+        raise ValueError(f"Versi resep tidak didukung (harus {RECIPE_VERSION}).")
+    steps = []
+    for step in recipe.get("langkah", []):
+        name = step.get("nama")
+        if name not in RECIPE_STEPS:
+            raise ValueError(f"Langkah resep tidak dikenal: {name}")
+        steps.append({"nama": name, "parameter": _parameter(name, dict(step.get("parameter") or {}))})
+    return {**recipe, "langkah": steps}
+
+def kosakata_label(recipe):
+    """Kosakata label encoding per kolom dari resep (kolom yang di-encode lebih dari sekali: yang terakhir)."""
+    vocabularies = {}
+    for step in recipe["langkah"]:
+        if step["nama"] == "label_encode":
+            vocabularies.update(step["parameter"].get("vocabularies", {}))
+    return vocabularies
+
+def terapkan_resep(df, recipe, progress=None):
+    """Jalankan semua langkah resep pada df."""
+    steps = recipe["langkah"]
+    for i, step in enumerate(steps):
+        df = jalankan_langkah(df, step["nama"], step["parameter"], bagian(progress, i / len(steps), (i + 1) / len(steps)))
+    return df
+
+def jalankan_resep_file(recipe, path, output_path, sheet=None, chunksize=DEFAULT_CHUNKSIZE, progress=None):
+    """Terapkan resep pada file CSV/Excel per chunk dan tulis hasilnya ke CSV. Mengembalikan ringkasan.
+
+    File dibaca dua kali: sekali untuk tipe kolom seluruh file, sekali untuk diproses. Progress
+    CSV diambil dari posisi baca file; untuk Excel hanya nomor chunk yang dilaporkan.
+    """
+    rows_in = rows = 0
+    unknown = {}
+    is_excel = str(path).endswith(".xlsx")
+    file_size = max(os.path.getsize(path), 1)
+    schema = skema_file(path, chunksize=chunksize, sheet=sheet, progress=bagian(progress, 0.0, 0.3))
+    progress = bagian(progress, 0.3, 1.0)
+    work_dir = tempfile.mkdtemp(prefix="resep_")
+    try:
+        results = HasilBertahap(work_dir)
+        with open(path, "rb") as handle:
+            source = path if is_excel else handle
+            for chunk_no, chunk in enumerate(baca_chunks_seragam(source, schema, chunksize, sheet), start=1):
+                lapor(progress, 0.0 if is_excel else handle.tell() / file_size, f"chunk {chunk_no}")
+                result = terapkan_resep(chunk, recipe)
+                for col, count in result.attrs.get("label_unknown", {}).items():
+                    unknown[col] = unknown.get(col, 0) + count
+                results.tambah(result)
+                rows_in += len(chunk)
+                rows += len(result)
+        if not results.written:
+            # File tanpa baris data: tetap tulis header hasil resep
+            results.tambah(terapkan_resep(pd.DataFrame(columns=baca_header(path, sheet)), recipe))
+        results.tulis(output_path)
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+    lapor(progress, 1.0)
+    return {"output": output_path, "rows_in": rows_in, "rows": rows,
+            "unknown_labels": {col: count for col, count in unknown.items() if count}}
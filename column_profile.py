@@ -0,0 +1,271 @@
+import math
+import os
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+from gabung_stream import DEFAULT_CHUNKSIZE, baca_chunks
+from jobs import lapor
+from key_index import hash_kolom
+
+# ---------------------------
+# Profil Kolom (Satu Kali Baca per Chunk)
+# ---------------------------
+# Semua kolom diprofilkan dalam satu kali baca chunk demi chunk, jadi file yang tidak muat di memori
+# juga bisa diprofilkan (lihat profil_file). Setiap kolom punya sketsa berukuran tetap:
+# - nilai unik: dihitung persis dari hash nilai sampai EXACT_DISTINCT_LIMIT, setelah itu
+#   diperkirakan dengan HyperLogLog (galat standar sekitar 1.04 / sqrt(2^HLL_PRECISION) = 0.4%);
+# - nilai terbanyak: ringkasan Misra-Gries dengan TOP_K_CAPACITY penghitung; jumlahnya persis
+#   selama nilai unik tidak melebihi kapasitas, selain itu batas bawah dengan galat <= baris / kapasitas;
+# - min/max/rata-rata persis, kuantil dari sampel acak seragam QUANTILE_SAMPLE_SIZE nilai.
+# Hasil disimpan per sidik jari data (kunci pipeline atau path + ukuran + waktu ubah file).
+
+PROFILE_CHUNK_ROWS = 200_000
+HLL_PRECISION = 16
+EXACT_DISTINCT_LIMIT = 100_000
+TOP_K = 10
+TOP_K_CAPACITY = 1_000
+QUANTILES = (0.05, 0.25, 0.5, 0.75, 0.95)
+QUANTILE_SAMPLE_SIZE = 20_000
+PROFILE_CACHE_ENTRIES = 32
+
+TYPE_LABELS = {
+    "integer": "Bilangan bulat",
+    "floating": "Desimal",
+    "decimal": "Desimal",
+    "mixed-integer-float": "Desimal",
+    "string": "Teks",
+    "bytes": "Teks",
+    "boolean": "Boolean",
+    "datetime64": "Tanggal",
+    "datetime": "Tanggal",
+    "date": "Tanggal",
+    "timedelta64": "Durasi",
+    "timedelta": "Durasi",
+    "categorical": "Kategori",
+    "empty": "Kosong",
+}
+MIXED_TYPE_LABEL = "Campuran"
+
+class HyperLogLog:
+    """Sketsa HyperLogLog untuk hash uint64: 2^precision register berukuran satu byte."""
+
+    def __init__(self, precision=HLL_PRECISION):
+        self.precision = precision
+        self.registers = np.zeros(1 << precision, dtype=np.uint8)
+
+    def tambah(self, hashes):
+        hashes = np.asarray(hashes, dtype=np.uint64)
+        p = np.uint64(self.precision)
+        buckets = (hashes >> (np.uint64(64) - p)).astype(np.intp)
+        # Rank = posisi bit 1 pertama pada sisa 64-p bit. 53 bit teratas muat persis di float64,
+        # dan eksponen frexp memberi panjang bitnya.
+        top = ((hashes << p) >> np.uint64(11)).astype(np.float64)
+        _, exponent = np.frexp(top)
+        max_rank = 64 - self.precision + 1
+        ranks = np.where(top > 0, np.minimum(54 - exponent, max_rank), max_rank).astype(np.uint8)
+        np.maximum.at(self.registers, buckets, ranks)
+
+    def perkiraan(self):
+        m = len(self.registers)
+        alpha = 0.7213 / (1 + 1.079 / m)
+        estimate = alpha * m * m / np.sum(np.ldexp(1.0, -self.registers.astype(np.int64)))
+        zeros = int((self.registers == 0).sum())
+        if estimate <= 2.5 * m and zeros:
+            estimate = m * math.log(m / zeros)  # linear counting untuk kardinalitas kecil
+        return int(round(estimate))
+
+def _jenis(kinds):
+    kinds = set(kinds) - {"empty"}
+    if not kinds:
+        return TYPE_LABELS["empty"]
+    labels = {TYPE_LABELS.get(kind, MIXED_TYPE_LABEL) for kind in kinds}
+    if labels == {TYPE_LABELS["integer"], TYPE_LABELS["floating"]}:
+        return TYPE_LABELS["floating"]  # chunk CSV tanpa nilai kosong terbaca int, yang lain float
+    return labels.pop() if len(labels) == 1 else MIXED_TYPE_LABEL
+
+class ColumnSketch:
+    """Statistik satu kolom yang diperbarui per chunk dengan memori tetap."""
+
+    def __init__(self, seed=0):
+        self.rows = 0
+        self.nulls = 0
+        self.kinds = set()
+        self.hll = HyperLogLog()
+        self.distinct = np.empty(0, dtype=np.uint64)  # None setelah melewati EXACT_DISTINCT_LIMIT
+        self.count_keys = np.empty(0, dtype=object)
+        self.count_values = np.empty(0, dtype=np.int64)
+        self.counts_exact = True
+        self.minimum = self.maximum = None
+        self.numeric_count = 0
+        self.numeric_sum = 0.0
+        self.sample = np.empty(0, dtype=np.float64)
+        self.sample_keys = np.empty(0, dtype=np.float64)
+        self._rng = np.random.default_rng(seed)
+
+    def tambah(self, s):
+        self.rows += len(s)
+        present = s.notna().to_numpy()
+        self.nulls += int(len(s) - present.sum())
+        self.kinds.add(pd.api.types.infer_dtype(s, skipna=True))
+        values = s[present]
+        if values.empty:
+            return
+        # Satu faktorisasi per chunk: jumlah per nilai dari kodenya, hash hanya untuk nilai unik chunk
+        codes, uniques = pd.factorize(values)
+        uniques = pd.Series(uniques)
+        self._tambah_unik(uniques)
+        self._tambah_frekuensi(uniques.to_numpy(dtype=object), np.bincount(codes, minlength=len(uniques)))
+        self._tambah_rentang(values)
+
+    def _tambah_unik(self, uniques):
+        hashes, _ = hash_kolom(uniques)
+        self.hll.tambah(hashes)
+        if self.distinct is not None:
+            self.distinct = np.union1d(self.distinct, hashes)
+            if len(self.distinct) > EXACT_DISTINCT_LIMIT:
+                self.distinct = None
+
+    def _tambah_frekuensi(self, keys, counts):
+        if len(self.count_keys):
+            codes, keys = pd.factorize(np.concatenate([self.count_keys, keys]))
+            counts = np.bincount(codes, weights=np.concatenate([self.count_values, counts])).astype(np.int64)
+        if len(keys) > TOP_K_CAPACITY:
+            # Misra-Gries: kurangi semua penghitung dengan penghitung ke-(kapasitas + 1)
+            cutoff = np.partition(counts, -(TOP_K_CAPACITY + 1))[-(TOP_K_CAPACITY + 1)]
+            counts = counts - cutoff
+            keys, counts = keys[counts > 0], counts[counts > 0]
+            self.counts_exact = False
+        self.count_keys, self.count_values = np.asarray(keys, dtype=object), counts
+
+    def _tambah_rentang(self, values):
+        if pd.api.types.is_bool_dtype(values.dtype):
+            return
+        if values.dtype.kind in "mM":
+            low, high = values.min(), values.max()
+            self.minimum = low if self.minimum is None else min(self.minimum, low)
+            self.maximum = high if self.maximum is None else max(self.maximum, high)
+            return
+        if not pd.api.types.is_numeric_dtype(values.dtype):
+            return
+        numbers = values.to_numpy(dtype=np.float64)
+        low, high = float(numbers.min()), float(numbers.max())
+        self.minimum = low if self.minimum is None else min(self.minimum, low)
+        self.maximum = high if self.maximum is None else max(self.maximum, high)
+        self.numeric_count += len(numbers)
+        self.numeric_sum += float(numbers.sum())
+        # Sampel seragam tanpa pengembalian: simpan nilai dengan kunci acak terkecil
+        keys = np.concatenate([self.sample_keys, self._rng.random(len(numbers))])
+        pool = np.concatenate([self.sample, numbers])
+        if len(pool) > QUANTILE_SAMPLE_SIZE:
+            keep = np.argpartition(keys, QUANTILE_SAMPLE_SIZE)[:QUANTILE_SAMPLE_SIZE]
+            keys, pool = keys[keep], pool[keep]
+        self.sample_keys, self.sample = keys, pool
+
+    def unik(self):
+        """(jumlah nilai unik, True jika hasil perkiraan)."""
+        if self.distinct is not None:
+            return len(self.distinct), False
+        return self.hll.perkiraan(), True
+
+    def terbanyak(self, k=TOP_K):
+        top = np.argsort(-self.count_values, kind="stable")[:k]
+        return pd.DataFrame({"Nilai": self.count_keys[top], "Jumlah": self.count_values[top]})
+
+    def ringkasan(self, name):
+        distinct, approximate = self.unik()
+        row = {
+            "Kolom": name,
+            "Tipe": _jenis(self.kinds),
+            "Kosong": self.nulls,
+            "% Kosong": round(100 * self.nulls / self.rows, 2) if self.rows else 0.0,
+            "Unik": distinct,
+            "Unik Perkiraan": approximate,
+            "Min": self.minimum,
+            "Max": self.maximum,
+            "Rata-rata": self.numeric_sum / self.numeric_count if self.numeric_count else np.nan,
+        }
+        quantiles = np.quantile(self.sample, QUANTILES) if len(self.sample) else [np.nan] * len(QUANTILES)
+        for q, value in zip(QUANTILES, quantiles):
+            row[f"P{q * 100:g}"] = value
+        return row
+
+def profil_chunks(chunks, progress=None, total_rows=None):
+    """Profil semua kolom dari iterator DataFrame (chunk).
+
+    Mengembalikan dict: rows, summary (satu baris per kolom), top_values (nama kolom ->
+    DataFrame Nilai/Jumlah) dan top_exact (nama kolom -> True jika jumlah top_values persis).
+    progress dipanggil per chunk; fraksinya dari total_rows jika diketahui.
+    """
+    sketches = OrderedDict()
+    rows = 0
+    for chunk_no, chunk in enumerate(chunks, start=1):
+        for i, col in enumerate(chunk.columns):
+            sketch = sketches.get(col)
+            if sketch is None:
+                sketch = sketches[col] = ColumnSketch(seed=i)
+                sketch.rows = rows  # kolom yang baru muncul: chunk sebelumnya dihitung kosong
+                sketch.nulls = rows
+            sketch.tambah(chunk.iloc[:, i])
+        rows += len(chunk)
+        for sketch in sketches.values():
+            if sketch.rows < rows:  # kolom yang tidak ada di chunk ini
+                sketch.nulls += rows - sketch.rows
+                sketch.rows = rows
+        fraction = rows / total_rows if total_rows else 0.0
+        lapor(progress, fraction, f"chunk {chunk_no} ({rows:,} baris)")
+    summary = pd.DataFrame([sketch.ringkasan(col) for col, sketch in sketches.items()])
+    return {
+        "rows": rows,
+        "summary": summary,
+        "top_values": {col: sketch.terbanyak() for col, sketch in sketches.items()},
+        "top_exact": {col: sketch.counts_exact for col, sketch in sketches.items()},
+    }
+
+def _chunks_frame(df, chunksize):
+    for start in range(0, len(df), chunksize):
+        yield df.iloc[start:start + chunksize]
+
+def profil_frame(df, chunksize=PROFILE_CHUNK_ROWS, progress=None):
+    """Profil DataFrame di memori, dibaca per chunk baris."""
+    result = profil_chunks(_chunks_frame(df, chunksize), progress, total_rows=len(df))
+    if not len(df):
+        result["summary"] = pd.DataFrame([ColumnSketch().ringkasan(col) for col in df.columns])
+        result["top_values"] = {col: ColumnSketch().terbanyak() for col in df.columns}
+        result["top_exact"] = {col: True for col in df.columns}
+    return result
+
+def profil_file(path, sheet=None, chunksize=DEFAULT_CHUNKSIZE, progress=None):
+    """Profil file CSV/Excel tanpa memuat seluruh isinya; progress CSV dari posisi baca file."""
+    is_excel = str(path).endswith(".xlsx")
+    file_size = max(os.path.getsize(path), 1)
+    with open(path, "rb") as handle:
+        chunks = baca_chunks(path if is_excel else handle, [], chunksize=chunksize, sheet=sheet)
+
+        def dengan_progress(fraction, message=None):
+            lapor(progress, 0.0 if is_excel else handle.tell() / file_size, message)
+
+        return profil_chunks(chunks, dengan_progress if progress is not None else None)
+
+def sidik_jari_file(path, sheet=None):
+    stat = os.stat(path)
+    return (os.path.abspath(path), sheet, stat.st_size, stat.st_mtime_ns)
+
+_cache = OrderedDict()
+_cache_lock = threading.Lock()
+
+def profil_tercache(fingerprint, compute, progress=None):
+    """Hasil compute(progress=...) untuk sidik jari data ini; dihitung sekali lalu disimpan (LRU)."""
+    with _cache_lock:
+        result = _cache.get(fingerprint)
+        if result is not None:
+            _cache.move_to_end(fingerprint)
+            return result
+    result = compute(progress=progress)
+    with _cache_lock:
+        _cache[fingerprint] = result
+        while len(_cache) > PROFILE_CACHE_ENTRIES:
+            _cache.popitem(last=False)
+    return result
@@ -0,0 +1,44 @@
+from functools import partial
+
+import pandas as pd
+import streamlit as st
+
+from column_profile import TOP_K_CAPACITY, profil_frame, profil_tercache
+from jobs_ui import hasil_job
+
+# ---------------------------
+# Profil Kolom: Komponen Streamlit
+# ---------------------------
+# Profil dihitung sebagai job latar belakang dan disimpan per sidik jari data, jadi membuka
+# ulang panel atau berpindah kolom tidak menghitung ulang.
+
+def _teks(values):
+    # Min/Max bisa berisi angka dan tanggal sekaligus; ditampilkan sebagai teks
+    return values.map(lambda v: "" if v is None or pd.isna(v) else str(v))
+
+def profil_job(job_key, fingerprint, compute, label="Profil kolom"):
+    """Profil dari cache atau job yang menjalankan compute(progress=...); None selama belum selesai."""
+    return hasil_job(job_key, fingerprint, profil_tercache, fingerprint, compute, label=label)
+
+def profil_data(df, fingerprint, job_key="column_profile_job"):
+    return profil_job(job_key, fingerprint, partial(profil_frame, df))
+
+def tampilkan_profil_kolom(profile, key):
+    """Tabel ringkasan semua kolom dan nilai terbanyak untuk kolom yang dipilih."""
+    summary = profile["summary"]
+    st.caption(f"{profile['rows']:,} baris, {len(summary)} kolom. Kolom 'Unik Perkiraan' menandai jumlah "
+               "nilai unik hasil perkiraan (HyperLogLog, galat sekitar 0.4%).")
+    if summary.empty:
+        return
+    st.dataframe(summary.assign(Min=_teks(summary["Min"]), Max=_teks(summary["Max"])), hide_index=True)
+    column = st.selectbox("Nilai terbanyak untuk kolom", summary["Kolom"].tolist(), key=f"{key}_column")
+    top = profile["top_values"][column]
+    error = profile["rows"] // (TOP_K_CAPACITY + 1)
+    if profile["top_exact"][column]:
+        st.dataframe(top.assign(Nilai=_teks(top["Nilai"])), hide_index=True)
+    elif top.empty:
+        st.caption(f"Tidak ada nilai yang muncul lebih dari {error:,} kali (nilai kolom ini hampir semuanya unik).")
+    else:
+        st.dataframe(top.assign(Nilai=_teks(top["Nilai"])), hide_index=True)
+        st.caption(f"Nilai unik kolom ini terlalu banyak untuk dihitung persis: jumlah di atas adalah batas bawah "
+                   f"(kurang paling banyak {error:,} dari jumlah sebenarnya).")
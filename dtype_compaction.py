@@ -0,0 +1,61 @@
+import numpy as np
+import pandas as pd
+
+# ---------------------------
+# Kompaksi Tipe Data (Hemat Memori)
+# ---------------------------
+# Kolom teks dengan sedikit nilai unik menjadi category, kolom teks lainnya menjadi
+# string berbasis Arrow, dan kolom angka diperkecil selama nilainya tidak berubah.
+
+CATEGORY_MAX_RATIO = 0.5
+
+def _is_text_column(s):
+    return s.dtype == object and pd.api.types.infer_dtype(s, skipna=True) in ("string", "empty")
+
+def _compact_column(s, category_max_ratio, arrow_strings):
+    if pd.api.types.is_bool_dtype(s.dtype):
+        return s
+    if pd.api.types.is_integer_dtype(s.dtype):
+        downcast = "unsigned" if len(s) and s.min() >= 0 else "integer"
+        return pd.to_numeric(s, downcast=downcast)
+    if pd.api.types.is_float_dtype(s.dtype):
+        smaller = s.astype(np.float32)
+        # Hanya diperkecil jika semua nilai tetap sama persis (harga/ID tidak boleh berubah)
+        if ((smaller.astype(s.dtype) == s) | s.isna()).all():
+            return smaller
+        return s
+    if s.dtype == object:
+        non_null = s.notna().sum()
+        if non_null and s.nunique(dropna=True) / non_null <= category_max_ratio:
+            try:
+                return s.astype("category")
+            except TypeError:
+                return s  # nilai tidak hashable
+        if arrow_strings and _is_text_column(s):
+            return s.astype("string[pyarrow]")
+    return s
+
+def compact_frame(df, category_max_ratio=CATEGORY_MAX_RATIO, arrow_strings=True):
+    """Perkecil tipe data setiap kolom. Mengembalikan (frame baru, laporan memori per kolom)."""
+    compacted = []
+    rows = []
+    for i, col in enumerate(df.columns):
+        before = df.iloc[:, i]
+        after = _compact_column(before, category_max_ratio, arrow_strings)
+        compacted.append(after)
+        rows.append({
+            "Kolom": col,
+            "Tipe Awal": str(before.dtype),
+            "Tipe Baru": str(after.dtype),
+            "Memori Awal (MB)": before.memory_usage(deep=True, index=False) / 1024 ** 2,
+            "Memori Baru (MB)": after.memory_usage(deep=True, index=False) / 1024 ** 2,
+        })
+    result = pd.concat(compacted, axis=1) if compacted else df.copy()
+    result.columns = df.columns
+    result.attrs = dict(df.attrs)
+    report = pd.DataFrame(rows)
+    return result, report
+
+def memory_summary(report):
+    """Total memori sebelum/sesudah dari laporan compact_frame, dalam MB."""
+    return report["Memori Awal (MB)"].sum(), report["Memori Baru (MB)"].sum()
@@ -0,0 +1,78 @@
+import importlib.util
+import io
+import os
+
+import pandas as pd
+
+# ---------------------------
+# Backend Pembaca Excel (xlsx)
+# ---------------------------
+# Parsing xlsx adalah tahap paling lambat saat memuat data. Backend didaftarkan dengan urutan
+# kecepatan: yang pertama tersedia dipakai otomatis. calamine (Rust, lewat paket python-calamine)
+# beberapa kali lebih cepat dari openpyxl; openpyxl selalu ada sebagai cadangan.
+# Backend dapat dipaksa lewat env DATA_CLEANING_XLSX_ENGINE, dan backend baru ditambah dengan
+# daftarkan_backend.
+
+XLSX_ENGINE_ENV = "DATA_CLEANING_XLSX_ENGINE"
+
+# nama backend -> modul yang harus terpasang; urutan = prioritas (tercepat dulu)
+_BACKENDS = {
+    "calamine": "python_calamine",
+    "openpyxl": "openpyxl",
+}
+_readers = {}
+
+def daftarkan_backend(name, module=None, reader=None, first=False):
+    """Tambah backend xlsx.
+
+    module: nama modul yang harus bisa diimpor agar backend dianggap tersedia. reader: fungsi
+    (BytesIO, sheet) -> DataFrame; jika None, dipakai pd.read_excel(engine=name). first=True
+    menempatkan backend di urutan teratas.
+    """
+    _BACKENDS.pop(name, None)
+    others = list(_BACKENDS.items()) if first else []
+    for other in others:
+        del _BACKENDS[other[0]]
+    _BACKENDS[name] = module
+    _BACKENDS.update(others)
+    if reader is not None:
+        _readers[name] = reader
+    else:
+        _readers.pop(name, None)
+
+def _tersedia(module):
+    return module is None or importlib.util.find_spec(module) is not None
+
+def backend_tersedia():
+    return [name for name, module in _BACKENDS.items() if _tersedia(module)]
+
+def pilih_backend():
+    """Backend xlsx yang dipakai: dari env jika diisi dan tersedia, selain itu yang tercepat."""
+    available = backend_tersedia()
+    forced = os.environ.get(XLSX_ENGINE_ENV)
+    if forced:
+        if forced not in available:
+            raise ValueError(f"Backend Excel '{forced}' tidak tersedia. Pilihan: {', '.join(available)}")
+        return forced
+    if not available:
+        raise ValueError("Tidak ada backend Excel yang terpasang (pasang openpyxl).")
+    return available[0]
+
+def _sumber(data):
+    return io.BytesIO(data) if isinstance(data, (bytes, bytearray)) else data
+
+def read_excel(data, sheet=0):
+    """Baca satu sheet xlsx (bytes atau path) dengan backend tercepat yang tersedia."""
+    engine = pilih_backend()
+    reader = _readers.get(engine)
+    if reader is not None:
+        return reader(_sumber(data), sheet)
+    return pd.read_excel(_sumber(data), sheet_name=sheet, engine=engine)
+
+def excel_sheet_names(data):
+    """Daftar sheet workbook (bytes atau path)."""
+    engine = pilih_backend()
+    if engine in _readers:
+        engine = "openpyxl"  # backend khusus hanya membaca isi sheet
+    with pd.ExcelFile(_sumber(data), engine=engine) as workbook:
+        return workbook.sheet_names
@@ -0,0 +1,152 @@
+import gzip
+import os
+import re
+import tempfile
+import time
+
+import pandas as pd
+import pyarrow as pa
+import xlsxwriter
+
+from jobs import jalankan, lapor
+
+# ---------------------------
+# Ekspor Hasil ke File
+# ---------------------------
+# File ditulis ke folder sementara di disk, bukan ke io.BytesIO, dan dibuat di thread latar
+# belakang. Excel ditulis baris per baris dengan mode constant_memory xlsxwriter sehingga
+# pemakaian memori tidak bergantung pada jumlah baris; sheet yang melebihi batas baris Excel
+# otomatis dipecah menjadi beberapa sheet.
+
+EXCEL_MAX_ROWS = 1_048_576
+EXCEL_SHEET_NAME_MAX = 31
+WRITE_BATCH_ROWS = 50_000
+EXPORT_DIR = os.path.join(tempfile.gettempdir(), "data_cleaning_exports")
+EXPORT_MAX_AGE_SECONDS = 6 * 60 * 60
+
+FORMATS = {
+    "xlsx": ("Excel (.xlsx)", "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"),
+    "csv.gz": ("CSV terkompresi (.csv.gz)", "application/gzip"),
+    "parquet": ("Parquet (.parquet)", "application/vnd.apache.parquet"),
+}
+
+def _sheet_name(name, used):
+    """Nama sheet valid untuk Excel (tanpa []:*?/\\, maks. 31 karakter) dan belum dipakai."""
+    base = re.sub(r"[\[\]:*?/\\]", "_", str(name))[:EXCEL_SHEET_NAME_MAX] or "Sheet"
+    candidate, counter = base, 1
+    while candidate.lower() in used:
+        counter += 1
+        suffix = f"_{counter}"
+        candidate = base[:EXCEL_SHEET_NAME_MAX - len(suffix)] + suffix
+    used.add(candidate.lower())
+    return candidate
+
+def _excel_values(part):
+    """Nilai per kolom sebagai list Python; nilai kosong menjadi None (sel kosong seperti to_excel)."""
+    columns = []
+    for i in range(part.shape[1]):
+        col = part.iloc[:, i]
+        if isinstance(col.dtype, pd.DatetimeTZDtype):
+            col = col.dt.tz_localize(None)  # Excel tidak mendukung zona waktu
+        values = col.astype(object)
+        columns.append(values.where(col.notna(), None).tolist())
+    return zip(*columns)
+
+def tulis_excel(sheets, path, progress=None):
+    """Tulis pasangan (nama sheet, DataFrame) ke xlsx; frame besar dipecah per 1.048.575 baris data.
+
+    sheets boleh berupa generator; progress dilaporkan per batch dalam sheet yang sedang ditulis.
+    """
+    workbook = xlsxwriter.Workbook(path, {
+        "constant_memory": True,
+        "nan_inf_to_errors": True,
+        "strings_to_formulas": False,
+        "strings_to_urls": False,
+        "default_date_format": "yyyy-mm-dd hh:mm:ss",
+    })
+    used = set()
+    try:
+        for name, df in sheets:
+            rows_per_sheet = EXCEL_MAX_ROWS - 1  # satu baris untuk header
+            starts = range(0, len(df), rows_per_sheet) if len(df) else [0]
+            for part_no, start in enumerate(starts, start=1):
+                worksheet = workbook.add_worksheet(_sheet_name(name if part_no == 1 else f"{name}_{part_no}", used))
+                worksheet.write_row(0, 0, [str(c) for c in df.columns])
+                row_no = 1
+                stop = min(start + rows_per_sheet, len(df))
+                for batch_start in range(start, stop, WRITE_BATCH_ROWS):
+                    batch_stop = min(batch_start + WRITE_BATCH_ROWS, stop)
+                    batch = df.iloc[batch_start:batch_stop]
+                    for values in _excel_values(batch):
+                        worksheet.write_row(row_no, 0, values)
+                        row_no += 1
+                    lapor(progress, batch_stop / len(df), f"sheet {name}: {batch_stop:,}/{len(df):,} baris")
+    finally:
+        workbook.close()
+
+def tulis_csv_gz(df, path, progress=None):
+    with gzip.open(path, "wt", encoding="utf-8", newline="") as f:
+        if not len(df):
+            df.to_csv(f, index=False)
+        for start in range(0, len(df), WRITE_BATCH_ROWS):
+            stop = min(start + WRITE_BATCH_ROWS, len(df))
+            df.iloc[start:stop].to_csv(f, index=False, header=start == 0)
+            lapor(progress, stop / len(df), f"{stop:,}/{len(df):,} baris")
+
+def tulis_parquet(df, path):
+    try:
+        df.to_parquet(path, index=False)
+    except (pa.ArrowInvalid, pa.ArrowTypeError):
+        # Kolom object bertipe campuran disimpan sebagai teks
+        df = df.copy()
+        for col in df.columns[df.dtypes == object]:
+            df[col] = df[col].where(df[col].isna(), df[col].astype(str))
+        df.to_parquet(path, index=False)
+
+def tulis(sheets, fmt, path, progress=None):
+    """Tulis ke format yang dipilih. CSV/Parquet hanya memuat sheet pertama."""
+    if fmt == "xlsx":
+        tulis_excel(sheets, path, progress)
+        return
+    _, df = next(iter(sheets))
+    if fmt == "csv.gz":
+        tulis_csv_gz(df, path, progress)
+    elif fmt == "parquet":
+        tulis_parquet(df, path)
+    else:
+        raise ValueError(f"Format ekspor tidak dikenal: {fmt}")
+
+def _hapus_file_lama():
+    now = time.time()
+    for name in os.listdir(EXPORT_DIR):
+        path = os.path.join(EXPORT_DIR, name)
+        try:
+            if now - os.path.getmtime(path) > EXPORT_MAX_AGE_SECONDS:
+                os.remove(path)
+        except OSError:
+            pass
+
+def _jalankan_ekspor(sheets, fmt, path, progress=None):
+    start = time.perf_counter()
+    try:
+        tulis(sheets, fmt, path, progress)
+    except Exception:
+        hapus_file(path)  # termasuk saat dibatalkan (JobCancelled)
+        raise
+    return {"path": path, "seconds": time.perf_counter() - start, "bytes": os.path.getsize(path)}
+
+def mulai_ekspor(sheets, fmt, pool=None):
+    """Mulai ekspor sebagai job latar belakang (jobs.Job) berisi path, durasi, dan ukuran file."""
+    if fmt not in FORMATS:
+        raise ValueError(f"Format ekspor tidak dikenal: {fmt}")
+    os.makedirs(EXPORT_DIR, exist_ok=True)
+    _hapus_file_lama()
+    fd, path = tempfile.mkstemp(suffix=f".{fmt}", dir=EXPORT_DIR)
+    os.close(fd)
+    return jalankan(_jalankan_ekspor, sheets, fmt, path, pool=pool)
+
+def hapus_file(path):
+    try:
+        os.remove(path)
+    except OSError:
+        pass
@@ -0,0 +1,71 @@
+import streamlit as st
+
+from export import FORMATS, hapus_file, mulai_ekspor
+from jobs_ui import pool_sesi, tampilkan_progress
+
+# ---------------------------
+# Ekspor Latar Belakang: Komponen Streamlit
+# ---------------------------
+# Status ekspor disimpan di st.session_state[job_key]. Selama file masih dibuat, hanya fragment
+# progress dari jobs_ui yang dijalankan ulang; setelah selesai, app dijalankan ulang sekali untuk
+# menampilkan tombol download.
+
+def pilih_format(key):
+    return st.radio("Format file", list(FORMATS), format_func=lambda f: FORMATS[f][0], key=key, horizontal=True)
+
+def mulai(job_key, sheets, fmt, file_name, signature, rows=None):
+    """Mulai ekspor baru; file ekspor sebelumnya untuk job_key ini dihapus."""
+    batalkan(job_key)
+    st.session_state[job_key] = {
+        "job": mulai_ekspor(sheets, fmt, pool_sesi()),
+        "fmt": fmt,
+        "file_name": f"{file_name}.{fmt}",
+        "signature": signature,
+        "rows": rows,
+        "logged": False,
+    }
+
+def _hapus_hasil(job):
+    if not job.cancelled() and job.exception() is None:
+        hapus_file(job.result()["path"])
+
+def batalkan(job_key):
+    entry = st.session_state.pop(job_key, None)
+    if entry is None:
+        return
+    entry["job"].batalkan()
+    # Job yang sudah selesai (atau selesai sebelum sempat berhenti) meninggalkan file; hapus
+    entry["job"].add_done_callback(_hapus_hasil)
+
+def tampilkan_unduhan(job_key, signature, profiler=None):
+    """Tampilkan status/tombol download. Job untuk data yang sudah berubah (signature beda) dibuang."""
+    job = st.session_state.get(job_key)
+    if job is None:
+        return
+    if job["signature"] != signature:
+        batalkan(job_key)
+        return
+    export_job = job["job"]
+    if not export_job.done():
+        tampilkan_progress(job_key, "Membuat file")
+        return
+    if export_job.cancelled():
+        st.session_state.pop(job_key, None)
+        st.info("Pembuatan file dibatalkan.")
+        return
+    if export_job.exception() is not None:
+        st.error(f"Gagal membuat file: {export_job.exception()}")
+        return
+    result = export_job.result()
+    if profiler is not None and not job["logged"]:
+        profiler.catat(f"export: {job['fmt']}", result["seconds"], rows_in=job["rows"])
+        job["logged"] = True
+    st.caption(f"File siap: {result['bytes'] / 1024 ** 2:.1f} MB, dibuat dalam {result['seconds']:.1f} s.")
+    with open(result["path"], "rb") as f:
+        st.download_button(
+            label=f"Download {FORMATS[job['fmt']][0]}",
+            data=f,
+            file_name=job["file_name"],
+            mime=FORMATS[job["fmt"]][1],
+            key=f"{job_key}_download",
+        )
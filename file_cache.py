@@ -0,0 +1,162 @@
+import hashlib
+import io
+import json
+import os
+import threading
+
+import numpy as np
+import pandas as pd
+
+from excel_reader import excel_sheet_names, read_excel
+
+# ---------------------------
+# Cache File Upload (Content-Addressed)
+# ---------------------------
+# Hasil parsing CSV/Excel disimpan di disk dengan kunci hash isi file + nama sheet,
+# sehingga file yang sama (walau diunggah ulang atau dari app lain) tidak perlu diparse lagi.
+# Frame disimpan sebagai Parquet; kolom yang tidak bisa dikonversi ke Arrow disimpan sebagai pickle.
+# Akses terakhir dicatat lewat mtime, dan entri terlama dihapus jika ukuran cache melebihi batas.
+
+CACHE_DIR = os.environ.get("DATA_CLEANING_CACHE_DIR", os.path.join(os.path.expanduser("~"), ".cache", "data_cleaning"))
+CACHE_MAX_BYTES = int(os.environ.get("DATA_CLEANING_CACHE_MAX_MB", "2048")) * 1024 * 1024
+
+_lock = threading.Lock()
+
+def _file_bytes(file):
+    """Ambil isi file dari UploadedFile Streamlit, path, atau bytes."""
+    if isinstance(file, (bytes, bytearray)):
+        return bytes(file)
+    if hasattr(file, "getvalue"):
+        return file.getvalue()
+    with open(file, "rb") as f:
+        return f.read()
+
+def _file_name(file):
+    return getattr(file, "name", file if isinstance(file, (str, os.PathLike)) else "")
+
+def content_hash(data):
+    return hashlib.blake2b(data, digest_size=20).hexdigest()
+
+def _entry_path(digest, sheet, ext):
+    sheet_key = hashlib.blake2b(str(sheet).encode("utf-8"), digest_size=6).hexdigest()
+    return os.path.join(CACHE_DIR, f"{digest}-{sheet_key}.{ext}")
+
+def _touch(path):
+    try:
+        os.utime(path)
+    except OSError:
+        pass
+
+def _evict():
+    """Hapus entri yang paling lama tidak diakses sampai ukuran cache di bawah batas."""
+    entries = []
+    for name in os.listdir(CACHE_DIR):
+        path = os.path.join(CACHE_DIR, name)
+        try:
+            stat = os.stat(path)
+        except OSError:
+            continue
+        entries.append((stat.st_mtime, stat.st_size, path))
+    total = sum(size for _, size, _ in entries)
+    for _, size, path in sorted(entries):
+        if total <= CACHE_MAX_BYTES:
+            break
+        try:
+            os.remove(path)
+            total -= size
+        except OSError:
+            pass
+
+def _write_frame(df, digest, sheet):
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    path = _entry_path(digest, sheet, "parquet")
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        df.to_parquet(tmp_path, index=False)
+    except Exception:
+        # pyarrow tidak tersedia atau kolom bertipe campuran: simpan sebagai pickle
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        path = _entry_path(digest, sheet, "pkl")
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        df.to_pickle(tmp_path)
+    os.replace(tmp_path, path)
+    with _lock:
+        _evict()
+
+def _read_parquet(path):
+    df = pd.read_parquet(path)
+    # Arrow mengembalikan null sebagai None pada kolom object; samakan dengan hasil read_csv/read_excel (NaN)
+    object_columns = df.columns[df.dtypes == object]
+    if len(object_columns):
+        df[object_columns] = df[object_columns].where(df[object_columns].notna(), np.nan)
+    return df
+
+def _read_frame(digest, sheet):
+    for ext, reader in (("parquet", _read_parquet), ("pkl", pd.read_pickle)):
+        path = _entry_path(digest, sheet, ext)
+        if os.path.exists(path):
+            try:
+                df = reader(path)
+            except Exception:
+                continue
+            _touch(path)
+            return df
+    return None
+
+def file_fingerprint(file, sheet=None):
+    """Sidik jari isi file + sheet, dipakai sebagai kunci awal pipeline cleaning."""
+    return f"{content_hash(_file_bytes(file))}:{sheet}"
+
+def sheet_names(file):
+    """Daftar sheet workbook, disimpan sebagai metadata di cache."""
+    data = _file_bytes(file)
+    digest = content_hash(data)
+    meta_path = os.path.join(CACHE_DIR, f"{digest}.sheets.json")
+    if os.path.exists(meta_path):
+        try:
+            with open(meta_path, encoding="utf-8") as f:
+                names = json.load(f)
+            _touch(meta_path)
+            return names
+        except (OSError, ValueError):
+            pass
+    names = excel_sheet_names(data)
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        with open(meta_path, "w", encoding="utf-8") as f:
+            json.dump(names, f)
+    except OSError:
+        pass
+    return names
+
+def _cache_entry(file, sheet, name):
+    data = _file_bytes(file)
+    is_excel = str(name or _file_name(file)).endswith(".xlsx")
+    if is_excel and sheet is None:
+        sheet = 0
+    return data, content_hash(data), is_excel, sheet, sheet if is_excel else "__csv__"
+
+def cached_frame(file, sheet=None, name=None):
+    """Frame dari cache tanpa parsing, atau None jika isi file + sheet belum pernah dibaca."""
+    _, digest, _, _, cache_sheet = _cache_entry(file, sheet, name)
+    return _read_frame(digest, cache_sheet)
+
+def read_cached(file, sheet=None, name=None):
+    """Baca CSV/Excel lewat cache; parsing hanya dilakukan jika isi file + sheet belum pernah dibaca.
+
+    name dipakai untuk menentukan jenis file jika file berupa bytes (tanpa atribut name).
+    """
+    data, digest, is_excel, sheet, cache_sheet = _cache_entry(file, sheet, name)
+    df = _read_frame(digest, cache_sheet)
+    if df is not None:
+        return df
+    if is_excel:
+        df = read_excel(data, sheet)
+    else:
+        df = pd.read_csv(io.BytesIO(data))
+    try:
+        _write_frame(df, digest, cache_sheet)
+    except OSError:
+        pass  # cache hanya optimasi; kegagalan tulis tidak boleh menggagalkan pembacaan
+    return df
@@ -0,0 +1,129 @@
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+from jobs import lapor
+
+# ---------------------------
+# Pencocokan Key Mirip (Fuzzy)
+# ---------------------------
+# Dijalankan setelah pencocokan key persis, hanya pada key sisa yang tidak berpasangan di
+# kedua data. Blocking memakai sorted neighbourhood: key kedua data diurutkan bersama dan hanya
+# key yang berdekatan (dalam jendela FUZZY_WINDOW) yang dibandingkan. Pengurutan dilakukan dua
+# kali, pada teks asli dan teks terbalik, agar salah ketik di awal key tetap tertangkap.
+# Kandidat diberi skor koefisien Dice bigram karakter (0-1, awal/akhir teks ikut dihitung):
+# satu salah ketik pada key 12 karakter masih bernilai sekitar 0.85. Setiap key hanya boleh
+# dipasangkan sekali; pasangan dengan skor tertinggi didahulukan.
+
+FUZZY_THRESHOLD = 0.8
+# Karakter setelah batas ini diabaikan saat menilai kemiripan
+FUZZY_MAX_CHARS = 64
+# Jumlah tetangga di setiap sisi yang dibandingkan pada urutan hasil sort
+FUZZY_WINDOW = 10
+# Jumlah kandidat per blok penilaian; membatasi memori matriks sparse sementara
+FUZZY_CHUNK_PAIRS = 500_000
+
+def _matriks_bigram(texts):
+    """Matriks sparse biner (baris = teks, kolom = bigram karakter) beserta jumlah bigram per teks."""
+    width = max(1, min(max(map(len, texts)), FUZZY_MAX_CHARS))
+    chars = np.array(texts, dtype=f"<U{width}").view(np.uint32).reshape(len(texts), width).astype(np.int64)
+    lengths = (chars > 0).sum(axis=1)
+    # 1 = batas awal/akhir teks, karakter digeser 2 agar tidak bentrok dengan 0 (padding) dan batas
+    padded = np.zeros((len(texts), width + 2), dtype=np.int64)
+    padded[:, 0] = 1
+    padded[:, 1:-1] = np.where(chars > 0, chars + 2, 0)
+    padded[np.arange(len(texts)), lengths + 1] = 1
+    present = padded[:, 1:] > 0
+    bigrams = ((padded[:, :-1] << 22) | padded[:, 1:])[present]
+    rows = np.broadcast_to(np.arange(len(texts))[:, None], present.shape)[present]
+    columns, uniques = pd.factorize(bigrams)
+    matrix = sparse.csr_matrix((np.ones(len(rows), dtype=np.float32), (rows, columns)),
+                               shape=(len(texts), len(uniques)))
+    matrix.sum_duplicates()
+    matrix.data[:] = 1.0  # himpunan bigram, bukan jumlahnya
+    return matrix, np.diff(matrix.indptr)
+
+def _tetangga_urut(texts1, texts2):
+    """(posisi texts1, posisi texts2) pasangan key beda data yang berdekatan setelah diurutkan."""
+    texts = np.concatenate([texts1, texts2])
+    side2 = np.arange(len(texts)) >= len(texts1)
+    pairs = []
+    for keys in (texts, np.array([text[::-1] for text in texts], dtype=object)):
+        order = np.argsort(keys, kind="stable")
+        for offset in range(1, FUZZY_WINDOW + 1):
+            a, b = order[:-offset], order[offset:]
+            cross = side2[a] != side2[b]
+            a, b = a[cross], b[cross]
+            first, second = np.where(side2[a], b, a), np.where(side2[a], a, b)
+            pairs.append(first.astype(np.int64) * len(texts2) + (second - len(texts1)))
+    pairs = np.sort(np.concatenate(pairs))
+    pairs = pairs[np.concatenate(([True], pairs[1:] != pairs[:-1]))]
+    return pairs // len(texts2), pairs % len(texts2)
+
+def _kandidat(texts1, texts2, threshold, progress=None):
+    """(posisi texts1, posisi texts2, skor) pasangan kandidat dengan skor >= threshold."""
+    rows, cols = _tetangga_urut(texts1, texts2)
+    matrix, sizes = _matriks_bigram(np.concatenate([texts1, texts2]))
+    rows2 = cols + len(texts1)
+    scores = np.empty(len(rows), dtype=np.float64)
+    for start in range(0, len(rows), FUZZY_CHUNK_PAIRS):
+        stop = min(start + FUZZY_CHUNK_PAIRS, len(rows))
+        a, b = rows[start:stop], rows2[start:stop]
+        shared = np.asarray(matrix[a].multiply(matrix[b]).sum(axis=1)).ravel()
+        scores[start:stop] = 2 * shared / (sizes[a] + sizes[b])
+        lapor(progress, stop / len(rows), f"menilai kandidat key mirip {stop:,}/{len(rows):,}")
+    keep = scores >= threshold
+    return rows[keep], cols[keep], scores[keep]
+
+def _pasangkan(rows, cols, scores, n_rows, n_cols):
+    """Pasangan satu-satu secara greedy: skor tertinggi dulu, seri diputus urutan key."""
+    order = np.lexsort((cols, rows, -scores))
+    match = np.full(n_rows, -1, dtype=np.intp)
+    score = np.full(n_rows, np.nan, dtype=np.float64)
+    used = np.zeros(n_cols, dtype=bool)
+    for i in order:
+        row, col = rows[i], cols[i]
+        if match[row] < 0 and not used[col]:
+            match[row] = col
+            score[row] = scores[i]
+            used[col] = True
+    return match, score
+
+def cocokkan_mirip(texts1, texts2, threshold=FUZZY_THRESHOLD, progress=None):
+    """Pasangkan teks key sisa Data 1 dengan teks key sisa Data 2 yang mirip.
+
+    Mengembalikan (posisi di texts2 atau -1 per elemen texts1, skor per elemen texts1 atau NaN,
+    mask elemen texts2 yang terpasang). Teks yang sama dianggap satu key: semua baris ber-key
+    sama ikut terpasang. Teks kosong tidak pernah dipasangkan.
+    """
+    texts1 = np.asarray(texts1, dtype=object)
+    texts2 = np.asarray(texts2, dtype=object)
+    match = np.full(len(texts1), -1, dtype=np.intp)
+    score = np.full(len(texts1), np.nan, dtype=np.float64)
+    matched2 = np.zeros(len(texts2), dtype=bool)
+    codes1, uniques1 = pd.factorize(texts1)
+    codes2, uniques2 = pd.factorize(texts2)
+    uniques1 = np.asarray(uniques1, dtype=object)
+    uniques2 = np.asarray(uniques2, dtype=object)
+    keep1 = np.flatnonzero(uniques1 != "")
+    keep2 = np.flatnonzero(uniques2 != "")
+    if not len(keep1) or not len(keep2):
+        return match, score, matched2
+
+    rows, cols, scores = _kandidat(uniques1[keep1], uniques2[keep2], threshold, progress)
+    unique_match, unique_score = _pasangkan(rows, cols, scores, len(keep1), len(keep2))
+
+    # Kembali dari key unik ke posisi: baris pertama texts2 untuk setiap key Data 2
+    first2 = np.full(len(uniques2), -1, dtype=np.intp)
+    first2[codes2[::-1]] = np.arange(len(texts2))[::-1]
+    matched_code2 = np.full(len(uniques1), -1, dtype=np.intp)
+    matched_score = np.full(len(uniques1), np.nan, dtype=np.float64)
+    paired = unique_match >= 0
+    matched_code2[keep1[paired]] = keep2[unique_match[paired]]
+    matched_score[keep1[paired]] = np.minimum(unique_score[paired], 1.0)
+    match = np.where(matched_code2[codes1] >= 0, first2[matched_code2[codes1]], -1)
+    score = matched_score[codes1]
+    used2 = np.zeros(len(uniques2), dtype=bool)
+    used2[matched_code2[matched_code2 >= 0]] = True
+    matched2 = used2[codes2]
+    return match, score, matched2
@@ -0,0 +1,177 @@
+"""Jalankan mode Gabung/Validasi tanpa Streamlit: satu file master dibandingkan dengan banyak file.
+
+Contoh:
+    python gabung_cli.py master.xlsx cabang_*.csv --mode validasi --pk1 ID --pk2 id \
+        --cmp1 Harga --cmp2 harga --output-dir hasil --workers 8
+
+    # key dua kolom, spasi dan huruf besar/kecil diabaikan
+    python gabung_cli.py master.csv cabang.csv --pk1 Kota Kode --pk2 kota kode --normalisasi trim casefold
+
+    # semua kolom bernama sama dibandingkan; selisih ditulis ke cabang_hasil_selisih.csv
+    python gabung_cli.py master.csv cabang.csv --mode diff --pk1 ID --pk2 id --toleransi-angka 0.01
+"""
+import argparse
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import pandas as pd
+
+from export import tulis_excel
+from gabung_engine import (
+    DIFF_MODE,
+    DUPLICATE_POLICIES,
+    MAX_OUTPUT_FACTOR,
+    NUMERIC_TOLERANCE,
+    VALIDATION_MODES,
+    bandingkan_semua_kolom,
+    jalankan_mode,
+    load_file,
+    urutan_kolom,
+)
+from gabung_stream import file_pendamping_diff, rekonsiliasi_streaming
+from key_index import NORMALIZATIONS
+
+MODE_ALIASES = {
+    "gabung-validasi": "Gabung & Validasi",
+    "validasi": "Validasi Saja",
+    "gabung": "Gabung Data Saja",
+    "diff": DIFF_MODE,
+}
+
+# Data master dimuat sekali per proses worker, bukan sekali per file pembanding
+_master = None
+
+def _init_worker(master_path, sheet1):
+    global _master
+    _master = load_file(master_path, sheet1)
+
+def output_paths(paths, output_dir, fmt):
+    """Nama file hasil per file pembanding; nama yang bentrok diberi nomor urut."""
+    used = set()
+    result = []
+    for path in paths:
+        stem = os.path.splitext(os.path.basename(path))[0]
+        name, counter = f"{stem}_hasil", 1
+        while name in used:
+            counter += 1
+            name = f"{stem}_hasil_{counter}"
+        used.add(name)
+        result.append(os.path.join(output_dir, f"{name}.{fmt}"))
+    return result
+
+def proses_satu_file(path, output_path, args):
+    """Bandingkan master dengan satu file dan tulis hasilnya. Mengembalikan ringkasan."""
+    if args.streaming:
+        summary = rekonsiliasi_streaming(args.master, path, args.pk1, args.pk2, args.mode, output_path,
+                                         cmp1=args.cmp1, cmp2=args.cmp2, sheet1=args.sheet1,
+                                         sheet2=args.sheet2, chunksize=args.chunksize,
+                                         normalisasi=args.normalisasi, kebijakan_duplikat=args.duplikat,
+                                         toleransi_angka=args.toleransi_angka,
+                                         toleransi_tanggal=pd.Timedelta(args.toleransi_tanggal))
+        return path, summary
+
+    df2 = load_file(path, args.sheet2)
+    if args.mode == DIFF_MODE:
+        return path, tulis_diff(df2, output_path, args)
+    result_df = jalankan_mode(args.mode, _master, df2, args.pk1, args.pk2, args.cmp1, args.cmp2,
+                              normalisasi=args.normalisasi, fuzzy_threshold=args.fuzzy,
+                              kebijakan_duplikat=args.duplikat, batas_faktor=args.batas_faktor or None)
+    result_df = result_df[urutan_kolom(result_df, _master.columns, args.mode, args.cmp1, args.cmp2)]
+    if args.format == "xlsx":
+        tulis_excel([("Sheet1", result_df)], output_path)
+    else:
+        result_df.to_csv(output_path, index=False)
+    status_counts = {}
+    if "Status" in result_df.columns:
+        status_counts = {k: int(v) for k, v in result_df["Status"].value_counts().items()}
+    return path, {"output": output_path, "rows": len(result_df), "status_counts": status_counts}
+
+def tulis_diff(df2, output_path, args):
+    """Mode Bandingkan Semua Kolom: xlsx berisi tiga sheet, CSV ditulis ke tiga file."""
+    result_df, summary, diffs = bandingkan_semua_kolom(_master, df2, args.pk1, args.pk2, args.toleransi_angka,
+                                                       pd.Timedelta(args.toleransi_tanggal),
+                                                       kebijakan_duplikat=args.duplikat,
+                                                       normalisasi=args.normalisasi)
+    if args.format == "xlsx":
+        tulis_excel([("Per Baris", result_df), ("Per Kolom", summary), ("Selisih", diffs)], output_path)
+    else:
+        summary_path, diff_path = file_pendamping_diff(output_path)
+        result_df.to_csv(output_path, index=False)
+        summary.to_csv(summary_path, index=False)
+        diffs.to_csv(diff_path, index=False)
+    status_counts = {k: int(v) for k, v in result_df["Status"].value_counts().items()}
+    return {"output": output_path, "rows": len(result_df), "status_counts": status_counts}
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Gabung & validasi data master terhadap banyak file pembanding.")
+    parser.add_argument("master", help="File Data 1 (CSV/Excel) sebagai master")
+    parser.add_argument("files", nargs="+", help="File Data 2 (CSV/Excel) yang dibandingkan dengan master")
+    parser.add_argument("--mode", choices=sorted(MODE_ALIASES), default="gabung-validasi")
+    parser.add_argument("--pk1", nargs="+", required=True, help="Kolom primary key Data 1 (boleh lebih dari satu)")
+    parser.add_argument("--pk2", nargs="+", required=True, help="Kolom primary key Data 2, urutan sama dengan --pk1")
+    parser.add_argument("--normalisasi", nargs="*", choices=sorted(NORMALIZATIONS), default=[],
+                        help="Normalisasi key sebelum dibandingkan")
+    parser.add_argument("--duplikat", choices=list(DUPLICATE_POLICIES), default="semua",
+                        help="Kebijakan key duplikat: " + "; ".join(f"{k} = {v}" for k, v in DUPLICATE_POLICIES.items()))
+    parser.add_argument("--batas-faktor", type=float, default=MAX_OUTPUT_FACTOR,
+                        help="Hentikan jika hasil diperkirakan lebih dari sekian kali jumlah baris input (0 = tanpa batas)")
+    parser.add_argument("--fuzzy", type=float, metavar="SKOR",
+                        help="Pasangkan key yang mirip (salah ketik) dengan skor minimal SKOR (0-1), mode validasi")
+    parser.add_argument("--cmp1", help="Kolom validasi Data 1")
+    parser.add_argument("--cmp2", help="Kolom validasi Data 2")
+    parser.add_argument("--toleransi-angka", type=float, default=NUMERIC_TOLERANCE,
+                        help="Mode diff: selisih angka maksimal yang masih dianggap sama")
+    parser.add_argument("--toleransi-tanggal", default="0",
+                        help="Mode diff: selisih tanggal maksimal, mis. 1D atau 12h")
+    parser.add_argument("--sheet1", help="Sheet master (Excel)")
+    parser.add_argument("--sheet2", help="Sheet file pembanding (Excel)")
+    parser.add_argument("--output-dir", default=".", help="Folder hasil")
+    parser.add_argument("--format", choices=["csv", "xlsx"], default="csv")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="Jumlah proses paralel")
+    parser.add_argument("--streaming", action="store_true",
+                        help="Gunakan mode streaming untuk file besar (output CSV; mode diff juga menulis "
+                             "file _per_kolom.csv dan _selisih.csv)")
+    parser.add_argument("--chunksize", type=int, default=100_000)
+    return parser
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    args.mode = MODE_ALIASES[args.mode]
+    if args.mode in VALIDATION_MODES and (args.cmp1 is None or args.cmp2 is None):
+        parser.error("--cmp1 dan --cmp2 wajib untuk mode validasi.")
+    if len(args.pk1) != len(args.pk2):
+        parser.error("Jumlah kolom --pk1 dan --pk2 harus sama.")
+    if args.fuzzy is not None and args.streaming:
+        parser.error("--fuzzy tidak didukung pada mode streaming (key dipartisi berdasarkan hash).")
+    if args.fuzzy is not None and not 0 < args.fuzzy <= 1:
+        parser.error("--fuzzy harus di antara 0 dan 1.")
+    try:
+        pd.Timedelta(args.toleransi_tanggal)
+    except ValueError:
+        parser.error(f"--toleransi-tanggal tidak valid: {args.toleransi_tanggal}")
+    os.makedirs(args.output_dir, exist_ok=True)
+
+    failed = 0
+    # Mode streaming membaca master sendiri per file, jadi tidak perlu dimuat di worker
+    initializer, initargs = (None, ()) if args.streaming else (_init_worker, (args.master, args.sheet1))
+    outputs = output_paths(args.files, args.output_dir, "csv" if args.streaming else args.format)
+    workers = max(1, min(args.workers or 1, len(args.files)))
+    with ProcessPoolExecutor(max_workers=workers, initializer=initializer, initargs=initargs) as pool:
+        futures = {pool.submit(proses_satu_file, path, output_path, args): path
+                   for path, output_path in zip(args.files, outputs)}
+        for future in as_completed(futures):
+            path = futures[future]
+            try:
+                _, summary = future.result()
+            except Exception as exc:
+                failed += 1
+                print(f"GAGAL {path}: {exc}", file=sys.stderr)
+                continue
+            status = ", ".join(f"{k}={v}" for k, v in summary["status_counts"].items())
+            print(f"OK {path} -> {summary['output']} ({summary['rows']} baris{'; ' + status if status else ''})")
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -3,8 +3,42 @@ st.set_page_config(page_title="Gabung & Validasi Data", layout="wide", initial_s
 
 import matplotlib.pyplot as plt
 import pandas as pd
-import re
-import io
+import os
+import uuid
+from functools import partial
+
+from gabung_engine import (
+    DATE_TOLERANCE,
+    DIFF_MODE,
+    DIFF_STATUS_LABELS,
+    DUPLICATE_POLICIES,
+    MAX_OUTPUT_FACTOR,
+    MODES,
+    NUMERIC_TOLERANCE,
+    STATUS_LABELS,
+    VALIDATION_MODES,
+    bandingkan_semua_kolom,
+    data2_tidak_ada_di_data1,
+    indeks_setelah_kebijakan,
+    jalankan_mode,
+    key_mirip,
+    kolom_nama_sama,
+    profil_key,
+    terapkan_kebijakan_duplikat,
+    urutan_kolom,
+)
+from column_profile import profil_file, sidik_jari_file
+from column_profile_ui import profil_job, tampilkan_profil_kolom
+from dtype_compaction import compact_frame, memory_summary
+from fuzzy_match import FUZZY_THRESHOLD
+from export_ui import mulai, pilih_format, tampilkan_unduhan
+from gabung_stream import DEFAULT_CHUNKSIZE, baca_header, rekonsiliasi_streaming
+from ingest import gabung_sumber, sidik_jari_sumber
+from ingest_ui import pilih_sumber
+from jobs_ui import hasil_job
+from key_index import NORMALIZATIONS, KeyIndexCache, kolom_key
+from preview import tampilkan_preview
+from profiling import Profiler, tampilkan_panel
 
 # ---------------------------
 # Custom CSS untuk Styling UI
@@ -33,247 +67,355 @@ st.markdown("""
 # ---------------------------
 # Fungsi Utility
 # ---------------------------
-def clean_column_name(name):
-    """Bersihkan nama kolom dengan menghilangkan karakter non-alfanumerik dan mengubah ke huruf kecil."""
-    return re.sub(r'[^a-zA-Z0-9]', '', name).lower()
-
 @st.cache_data(show_spinner=False)
-def load_csv(file):
-    return pd.read_csv(file)
+def load_data(sources, compact=False):
+    """Gabungan semua sumber (file, sheet) satu dataset; mengembalikan (DataFrame, laporan memori atau None)."""
+    df = gabung_sumber(sources)
+    return compact_frame(df) if compact else (df, None)
 
-@st.cache_data(show_spinner=False)
-def load_excel(file, sheet):
-    return pd.read_excel(file, sheet_name=sheet)
+def tampilkan_laporan_memori(report, label):
+    if report is None:
+        return
+    before_mb, after_mb = memory_summary(report)
+    with st.expander(f"Ringkasan memori {label}: {before_mb:.2f} MB → {after_mb:.2f} MB"):
+        st.dataframe(report, hide_index=True)
 
 # ---------------------------
-# Mode Operasi: Validasi Saja
+# Gabung & Validasi: Pilih Kolom dari Data 2
 # ---------------------------
-def validasi_saja(df1, df2, pk1, pk2, cmp1, cmp2):
-    results = []
-    for _, row1 in df1.iterrows():
-        key_val = row1[pk1]
-        val1 = row1[cmp1]
-        matching = df2[df2[pk2] == key_val]
-        if not matching.empty:
-            val2 = matching.iloc[0][cmp2]
-            status = "Valid" if val1 == val2 else "Tidak Valid"
-        else:
-            val2 = None
-            status = "Tidak Ada pada Data 2"
-        row_result = row1.to_dict()
-        row_result[f"{cmp1}_Data1"] = val1
-        row_result[f"{cmp2}_Data2"] = val2
-        row_result["Status"] = status
-        results.append(row_result)
-    return pd.DataFrame(results)
+def pilih_kolom_data2(df1, df2, pk1, pk2, keys=None, fuzzy_threshold=None, policy="semua", signature=None):
+    """Tampilkan data yang hanya ada di Data 2 dan pilih kolom yang ikut digabung.
+
+    Kebijakan duplikat dan key mirip diterapkan sama seperti jalankan_mode, sehingga baris Data 2
+    yang nanti terpasang secara mirip tidak ikut ditampilkan.
+    """
+    df1, df2, keys = terapkan_kebijakan_duplikat(df1, df2, pk1, pk2, keys, policy)
+    mirip = None
+    if fuzzy_threshold is not None:
+        # Pasangan mirip disimpan per konfigurasi agar tidak dihitung ulang setiap rerun
+        cached = st.session_state.get("preview_mirip")
+        if cached is None or cached[0] != signature:
+            cached = (signature, key_mirip(df1, df2, pk1, pk2, keys, fuzzy_threshold))
+            st.session_state.preview_mirip = cached
+        mirip = cached[1]
+    missing_rows = data2_tidak_ada_di_data1(df1, df2, pk1, pk2, keys, mirip)
+    if missing_rows.empty:
+        return None
+    st.info("Data dari Data 2 yang tidak ditemukan di Data 1:")
+    st.dataframe(missing_rows.head(), height=150)
+    auto_merge = st.checkbox("Otomatis gabungkan kolom dengan nama sama dari Data 2", value=True, key="auto_merge")
+    if auto_merge:
+        return kolom_nama_sama(df1, df2)
+    return st.multiselect("Pilih kolom dari Data 2 untuk ditambahkan", 
+                          df2.columns.tolist(), default=kolom_key(pk2), key="selected_cols")
 
 # ---------------------------
-# Mode Operasi: Gabung & Validasi
+# Konfigurasi Primary Key
 # ---------------------------
-def gabung_validasi_data(df1, df2, pk1, pk2, cmp1, cmp2):
-    results = []
-    # Proses validasi untuk Data 1
-    for _, row1 in df1.iterrows():
-        key_val = row1[pk1]
-        val1 = row1[cmp1]
-        matching = df2[df2[pk2] == key_val]
-        if not matching.empty:
-            val2 = matching.iloc[0][cmp2]
-            status = "Valid" if val1 == val2 else "Tidak Valid"
-        else:
-            val2 = None
-            status = "Tidak Ada pada Data 2"
-        row_result = row1.to_dict()
-        row_result[f"{cmp1}_Data1"] = val1
-        row_result[f"{cmp2}_Data2"] = val2
-        row_result["Status"] = status
-        results.append(row_result)
-        
-    # Proses untuk data di Data 2 yang tidak ada di Data 1
-    pk1_values = set(df1[pk1])
-    missing_rows = df2[~df2[pk2].isin(pk1_values)]
-    if not missing_rows.empty:
-        st.info("Data dari Data 2 yang tidak ditemukan di Data 1:")
-        st.dataframe(missing_rows.head(), height=150)
-        auto_merge = st.checkbox("Otomatis gabungkan kolom dengan nama sama dari Data 2", value=True, key="auto_merge")
-        if auto_merge:
-            clean_cols_df1 = {clean_column_name(col): col for col in df1.columns}
-            clean_cols_df2 = {clean_column_name(col): col for col in df2.columns}
-            selected_columns = [clean_cols_df2[col] for col in clean_cols_df2 if col in clean_cols_df1]
-        else:
-            selected_columns = st.multiselect("Pilih kolom dari Data 2 untuk ditambahkan", 
-                                              df2.columns.tolist(), default=[pk2], key="selected_cols")
-        for _, row2 in missing_rows.iterrows():
-            key_val = row2[pk2]
-            new_row = {col: None for col in df1.columns}
-            new_row[pk1] = key_val
-            for col in selected_columns:
-                col_clean = clean_column_name(col)
-                clean_cols_df1 = {clean_column_name(c): c for c in df1.columns}
-                if col_clean in clean_cols_df1:
-                    target_col = clean_cols_df1[col_clean]
-                    new_row[target_col] = row2[col]
-            new_row[f"{cmp1}_Data1"] = None
-            new_row[f"{cmp2}_Data2"] = row2[cmp2]
-            new_row["Status"] = "Tidak Ada pada Data 1"
-            results.append(new_row)
-    return pd.DataFrame(results)
+def pilih_key(columns1, columns2, prefix=""):
+    """(kolom key Data 1, kolom key Data 2, normalisasi, kebijakan duplikat); key None jika belum valid."""
+    pk1 = st.sidebar.multiselect("Pilih Primary Key dari Data 1", list(columns1), default=list(columns1)[:1],
+                                 key=f"{prefix}pk1")
+    pk2 = st.sidebar.multiselect("Pilih Primary Key dari Data 2", list(columns2), default=list(columns2)[:1],
+                                 key=f"{prefix}pk2")
+    normalisasi = st.sidebar.multiselect("Normalisasi key", list(NORMALIZATIONS), format_func=NORMALIZATIONS.get,
+                                         key=f"{prefix}key_normalization")
+    policy = st.sidebar.selectbox("Jika key berulang (duplikat)", list(DUPLICATE_POLICIES),
+                                  format_func=DUPLICATE_POLICIES.get, key=f"{prefix}duplicate_policy")
+    if not pk1 or not pk2:
+        st.error("Pilih minimal satu kolom primary key untuk Data 1 dan Data 2.")
+        return None, None, None, None
+    if len(pk1) != len(pk2):
+        st.error("Jumlah kolom primary key Data 1 dan Data 2 harus sama (dipasangkan sesuai urutan).")
+        return None, None, None, None
+    return tuple(pk1), tuple(pk2), tuple(normalisasi), policy
+
+def pilih_toleransi(prefix=""):
+    """(toleransi angka, toleransi tanggal) untuk mode Bandingkan Semua Kolom."""
+    numeric_tolerance = st.sidebar.number_input("Toleransi selisih angka", min_value=0.0, value=NUMERIC_TOLERANCE,
+                                                format="%g", key=f"{prefix}diff_numeric_tolerance")
+    date_tolerance = st.sidebar.number_input("Toleransi selisih tanggal (hari)", min_value=0.0, value=0.0,
+                                             key=f"{prefix}diff_date_tolerance")
+    return numeric_tolerance, pd.Timedelta(days=date_tolerance)
+
+def indeks_key_cache():
+    # Indeks key per dataset dipakai ulang lintas rerun dan lintas mode operasi
+    if "key_index_cache" not in st.session_state:
+        st.session_state.key_index_cache = KeyIndexCache()
+    return st.session_state.key_index_cache
+
+def tampilkan_profil_key(profile, mode, estimated_rows):
+    """Statistik key kedua data dan perkiraan jumlah baris hasil mode terpilih."""
+    labels = {"rows": "Jumlah baris", "unique_keys": "Key unik", "duplicate_keys": "Key duplikat",
+              "duplicate_rows": "Baris duplikat", "empty_keys": "Key kosong"}
+    table = pd.DataFrame({"Data 1": profile["data1"], "Data 2": profile["data2"]}).rename(index=labels)
+    has_duplicates = profile["data1"]["duplicate_keys"] or profile["data2"]["duplicate_keys"]
+    with st.expander("Profil key", expanded=bool(has_duplicates)):
+        st.dataframe(table)
+        st.caption(f"{profile['matched_keys']:,} key cocok, {profile['many_to_many_keys']:,} key berulang di "
+                   f"kedua data. Perkiraan hasil {mode}: {estimated_rows:,} baris.")
 
 # ---------------------------
-# Mode Operasi: Gabung Data Saja
+# Mode Streaming: File Besar
 # ---------------------------
-def gabung_data_saja(df1, df2, pk1, pk2):
-    # Lakukan full outer join berdasarkan primary key
-    merged_df = pd.merge(df1, df2, how="outer", left_on=pk1, right_on=pk2, suffixes=("_Data1", "_Data2"))
-    
-    # Penggabungan kolom: untuk kolom yang sama di kedua data (selain primary key)
-    # Buat mapping nama kolom yang telah dibersihkan untuk masing-masing dataframe
-    norm_df1 = {clean_column_name(col): col for col in df1.columns if col != pk1}
-    norm_df2 = {clean_column_name(col): col for col in df2.columns if col != pk2}
-    
-    # Cari kolom umum berdasarkan nama yang telah dinormalisasi
-    common_norm = set(norm_df1.keys()).intersection(set(norm_df2.keys()))
-    
-    for norm in common_norm:
-        col1 = norm_df1[norm] + "_Data1"  # kolom dari df1 setelah merge
-        col2 = norm_df2[norm] + "_Data2"  # kolom dari df2 setelah merge
-        if col1 in merged_df.columns and col2 in merged_df.columns:
-            # Gabungkan dengan prioritas nilai dari Data1 jika tidak null
-            merged_df[norm_df1[norm]] = merged_df[col1].combine_first(merged_df[col2])
-            # Hapus kolom yang terpisah karena sudah digabungkan
-            merged_df = merged_df.drop(columns=[col1, col2])
-    
-    # Jangan menghilangkan kolom primary key, sehingga baik pk1 maupun pk2 (jika ada) tetap tampil
-    return merged_df
+def streaming_page(profiler):
+    st.header("Mode Streaming untuk File Besar")
+    st.caption("File dibaca per chunk dari path di server, dipartisi ke disk, dan hasil ditulis bertahap ke CSV.")
+    path1 = st.sidebar.text_input("Path File Data 1 (CSV/Excel) di server", key="stream_path1")
+    path2 = st.sidebar.text_input("Path File Data 2 (CSV/Excel) di server", key="stream_path2")
+    if not path1 or not path2:
+        st.info("Masukkan path kedua file untuk memulai.")
+        return
+    if not os.path.exists(path1) or not os.path.exists(path2):
+        st.error("File tidak ditemukan di server.")
+        return
+
+    cols1, cols2 = baca_header(path1), baca_header(path2)
+    mode = st.sidebar.radio("Pilih Mode Operasi", list(MODES), key="stream_mode")
+    pk1, pk2, normalisasi, policy = pilih_key(cols1, cols2, prefix="stream_")
+    if pk1 is None:
+        return
+    cmp1 = cmp2 = None
+    if mode in VALIDATION_MODES:
+        cmp1 = st.sidebar.selectbox("Pilih Kolom Validasi dari Data 1", cols1, key="stream_cmp1")
+        cmp2 = st.sidebar.selectbox("Pilih Kolom Validasi dari Data 2", cols2, key="stream_cmp2")
+    tolerance = pilih_toleransi("stream_") if mode == DIFF_MODE else (NUMERIC_TOLERANCE, DATE_TOLERANCE)
+    chunksize = st.sidebar.number_input("Jumlah baris per chunk", min_value=1_000, value=DEFAULT_CHUNKSIZE, step=10_000)
+    output_path = st.text_input("Path file output (CSV)", value="hasil_rekonsiliasi.csv")
+
+    if st.checkbox("Profil kolom kedua file (dibaca per chunk)", key="stream_profile"):
+        for i, path in enumerate((path1, path2), start=1):
+            st.subheader(f"Profil Data {i}")
+            profile = profil_job(f"stream_profile_job{i}", sidik_jari_file(path),
+                                 partial(profil_file, path, chunksize=int(chunksize)), label=f"Profil Data {i}")
+            if profile is not None:
+                tampilkan_profil_kolom(profile, f"stream_profile{i}")
+
+    # Job hanya dimulai lewat tombol; setelah itu hasilnya dipakai ulang selama konfigurasi sama
+    stream_signature = (path1, path2, os.path.getmtime(path1), os.path.getmtime(path2), mode,
+                        pk1, pk2, normalisasi, policy, cmp1, cmp2, tolerance, int(chunksize), output_path)
+    if st.button("Jalankan Streaming"):
+        st.session_state.pop("stream_job", None)
+        st.session_state.stream_signature = stream_signature
+    if st.session_state.get("stream_signature") == stream_signature:
+        with profiler.stage(f"streaming: {mode}") as record:
+            summary = hasil_job("stream_job", stream_signature, rekonsiliasi_streaming, path1, path2, pk1, pk2,
+                                mode, output_path, cmp1=cmp1, cmp2=cmp2, chunksize=int(chunksize),
+                                normalisasi=normalisasi, kebijakan_duplikat=policy, toleransi_angka=tolerance[0],
+                                toleransi_tanggal=tolerance[1], label="Memproses file per partisi")
+            record["rows_out"] = None if summary is None else summary["rows"]
+        if summary is None:
+            return
+        st.success(f"Selesai: {summary['rows']} baris ditulis ke {summary['output']} "
+                   f"({summary['partitions']} partisi).")
+        if summary["status_counts"]:
+            st.subheader("Ringkasan Statistik")
+            st.dataframe(pd.Series(summary["status_counts"], name="Jumlah").rename_axis("Status").reset_index())
+        if mode == DIFF_MODE:
+            st.subheader("Jumlah Beda per Kolom")
+            st.dataframe(pd.read_csv(summary["summary_output"]), hide_index=True)
+            st.caption(f"Daftar selisih per sel ditulis ke {summary['diff_output']}.")
+        st.subheader("Preview Hasil")
+        st.dataframe(pd.read_csv(output_path, nrows=100), height=300)
 
 
 # ---------------------------
 # Sidebar: Unggah Data
 # ---------------------------
+if "profile_session" not in st.session_state:
+    st.session_state.profile_session = uuid.uuid4().hex
+profiler = Profiler("gabung_data", st.sidebar.checkbox("Profiling (waktu & memori per tahap)", key="profiling"),
+                    st.session_state.profile_session)
+profile_panel = st.sidebar.container()
+
 st.sidebar.header("Langkah 1: Unggah Data")
-file1 = st.sidebar.file_uploader("Unggah File Data 1 (CSV/Excel)", type=["csv", "xlsx"], key="file1")
-file2 = st.sidebar.file_uploader("Unggah File Data 2 (CSV/Excel)", type=["csv", "xlsx"], key="file2")
+if st.sidebar.checkbox("Mode file besar (streaming dari path server)", key="streaming_mode"):
+    streaming_page(profiler)
+    tampilkan_panel(profiler, profile_panel)
+    st.stop()
+files1 = st.sidebar.file_uploader("Unggah File Data 1 (CSV/Excel, boleh lebih dari satu)", type=["csv", "xlsx"],
+                                  accept_multiple_files=True, key="file1")
+files2 = st.sidebar.file_uploader("Unggah File Data 2 (CSV/Excel, boleh lebih dari satu)", type=["csv", "xlsx"],
+                                  accept_multiple_files=True, key="file2")
+compact = st.sidebar.checkbox("Mode hemat memori (perkecil tipe data kolom)", key="compact_mode")
 
 with st.expander("Instruksi Proses Operasi", expanded=True):
     st.markdown(
         """
         **Panduan:**
-        1. **Upload Data:** Unggah kedua file data (CSV atau Excel).
-        2. **Konfigurasi:** Pilih primary key (dan kolom validasi jika diperlukan).
+        1. **Upload Data:** Unggah kedua data (CSV atau Excel). Beberapa file atau sheet untuk satu data
+           digabung menjadi satu, dengan kolom **Sumber** berisi asal setiap baris.
+        2. **Konfigurasi:** Pilih primary key, boleh lebih dari satu kolom (dan kolom validasi jika diperlukan).
         3. **Operasi:** Pilih mode operasi:
             - **Gabung & Validasi:** Validasi data dan gabungkan data yang hanya ada di Data 2.
             - **Validasi Saja:** Hanya validasi data.
             - **Gabung Data Saja:** Gabungkan kedua data dan gabungkan kolom dengan nama sama.
+            - **Bandingkan Semua Kolom:** Bandingkan setiap kolom bernama sama dan tampilkan semua selisihnya.
         4. **Hasil & Unduh:** Lihat hasil operasi dan unduh sebagai Excel jika diinginkan.
         """
     )
 
 df1, df2 = None, None
-if file1:
-    if file1.name.endswith(".xlsx"):
-        sheets1 = pd.ExcelFile(file1).sheet_names
-        sheet1 = st.sidebar.selectbox("Pilih Sheet untuk Data 1", sheets1, key="sheet1")
-        df1 = load_excel(file1, sheet1)
-    else:
-        df1 = load_csv(file1)
-    st.sidebar.success("Data 1 berhasil diunggah.")
+sources1 = pilih_sumber(files1 or [], "sheet1", "Pilih Sheet untuk Data 1", st.sidebar)
+sources2 = pilih_sumber(files2 or [], "sheet2", "Pilih Sheet untuk Data 2", st.sidebar)
+if sources1:
+    with profiler.stage("load: data 1") as record:
+        df1, report1 = load_data(sources1, compact)
+    record["rows_out"] = len(df1)
+    st.sidebar.success(f"Data 1 berhasil diunggah ({len(sources1)} sumber)." if len(sources1) > 1
+                       else "Data 1 berhasil diunggah.")
     st.subheader("Preview Data 1")
     st.dataframe(df1.head(), height=150)
+    tampilkan_laporan_memori(report1, "Data 1")
     
-if file2:
-    if file2.name.endswith(".xlsx"):
-        sheets2 = pd.ExcelFile(file2).sheet_names
-        sheet2 = st.sidebar.selectbox("Pilih Sheet untuk Data 2", sheets2, key="sheet2")
-        df2 = load_excel(file2, sheet2)
-    else:
-        df2 = load_csv(file2)
-    st.sidebar.success("Data 2 berhasil diunggah.")
+if sources2:
+    with profiler.stage("load: data 2") as record:
+        df2, report2 = load_data(sources2, compact)
+    record["rows_out"] = len(df2)
+    st.sidebar.success(f"Data 2 berhasil diunggah ({len(sources2)} sumber)." if len(sources2) > 1
+                       else "Data 2 berhasil diunggah.")
     st.subheader("Preview Data 2")
     st.dataframe(df2.head(), height=150)
+    tampilkan_laporan_memori(report2, "Data 2")
 
 # ---------------------------
 # Sidebar: Konfigurasi & Pilih Mode Operasi
 # ---------------------------
 if df1 is not None and df2 is not None:
     st.sidebar.header("Langkah 2: Konfigurasi Data")
-    mode = st.sidebar.radio("Pilih Mode Operasi", ["Gabung & Validasi", "Validasi Saja", "Gabung Data Saja"])
-    pk1 = st.sidebar.selectbox("Pilih Primary Key dari Data 1", df1.columns, key="pk1")
-    pk2 = st.sidebar.selectbox("Pilih Primary Key dari Data 2", df2.columns, key="pk2")
+    mode = st.sidebar.radio("Pilih Mode Operasi", list(MODES))
+    pk1, pk2, normalisasi, policy = pilih_key(df1.columns, df2.columns)
+    if pk1 is None:
+        tampilkan_panel(profiler, profile_panel)
+        st.stop()
     
-    if mode in ["Gabung & Validasi", "Validasi Saja"]:
+    cmp1 = cmp2 = None
+    if mode in VALIDATION_MODES:
         cmp1 = st.sidebar.selectbox("Pilih Kolom Validasi dari Data 1", df1.columns, key="cmp1")
         cmp2 = st.sidebar.selectbox("Pilih Kolom Validasi dari Data 2", df2.columns, key="cmp2")
+    fuzzy_threshold = None
+    if mode in VALIDATION_MODES and st.sidebar.checkbox("Pasangkan key yang mirip (salah ketik)", key="fuzzy_match"):
+        fuzzy_threshold = st.sidebar.slider("Skor kemiripan minimal", 0.5, 1.0, FUZZY_THRESHOLD, 0.01,
+                                            key="fuzzy_threshold")
+    tolerance = pilih_toleransi() if mode == DIFF_MODE else None
     
     # ---------------------------
     # Proses Operasi Berdasarkan Mode
     # ---------------------------
     st.header("Langkah 3: Hasil Operasi")
-    if mode == "Validasi Saja":
-        result_df = validasi_saja(df1, df2, pk1, pk2, cmp1, cmp2)
-    elif mode == "Gabung & Validasi":
-        result_df = gabung_validasi_data(df1, df2, pk1, pk2, cmp1, cmp2)
-    elif mode == "Gabung Data Saja":
-        result_df = gabung_data_saja(df1, df2, pk1, pk2)
-    
+    fp1, fp2 = sidik_jari_sumber(sources1), sidik_jari_sumber(sources2)
+    cache = indeks_key_cache()
+    with profiler.stage("key index", rows_in=len(df1) + len(df2)):
+        keys = (cache.ambil((fp1, compact), df1, pk1, normalisasi),
+                cache.ambil((fp2, compact), df2, pk2, normalisasi))
+        profile = profil_key(keys)
+        estimated_rows = profil_key(indeks_setelah_kebijakan(keys, policy))["rows_per_mode"][mode]
+    tampilkan_profil_key(profile, mode, estimated_rows)
+    if policy == "tolak" and (profile["data1"]["duplicate_keys"] or profile["data2"]["duplicate_keys"]):
+        st.error("Key duplikat ditemukan dan kebijakan duplikat adalah 'tolak'. Lihat Profil key.")
+        tampilkan_panel(profiler, profile_panel)
+        st.stop()
+    # Penjaga join many-to-many: hasil yang berlipat harus dikonfirmasi dulu
+    max_factor = MAX_OUTPUT_FACTOR
+    if estimated_rows > MAX_OUTPUT_FACTOR * (len(df1) + len(df2)):
+        st.error(f"Hasil diperkirakan {estimated_rows:,} baris (lebih dari {MAX_OUTPUT_FACTOR}x jumlah baris input) "
+                 "karena key berulang di kedua data. Pilih kebijakan key duplikat lain.")
+        if not st.checkbox("Tetap jalankan tanpa batas", key="allow_large_result"):
+            tampilkan_panel(profiler, profile_panel)
+            st.stop()
+        max_factor = None
+    selected_columns = None
+    if mode == "Gabung & Validasi":
+        selected_columns = pilih_kolom_data2(df1, df2, pk1, pk2, keys, fuzzy_threshold, policy,
+                                             (fp1, fp2, compact, pk1, pk2, normalisasi, policy, fuzzy_threshold))
+    # Hasil mode disimpan di session_state per konfigurasi: mengubah filter status atau tampilan
+    # tidak menjalankan ulang mode, dan job yang masih berjalan tidak diulang dari awal
+    result_key = (fp1, fp2, compact, mode, pk1, pk2, normalisasi, policy, max_factor, cmp1, cmp2, fuzzy_threshold,
+                  tolerance, repr(selected_columns))
+    with profiler.stage(f"mode: {mode}", rows_in=len(df1) + len(df2)) as record:
+        if mode == DIFF_MODE:
+            result = hasil_job("gabung_job", result_key, bandingkan_semua_kolom, df1, df2, pk1, pk2, *tolerance,
+                               keys=keys, kebijakan_duplikat=policy, label=f"Mode {mode}")
+        else:
+            result = hasil_job("gabung_job", result_key, jalankan_mode, mode, df1, df2, pk1, pk2,
+                               cmp1, cmp2, selected_columns, normalisasi=normalisasi, keys=keys,
+                               fuzzy_threshold=fuzzy_threshold, kebijakan_duplikat=policy, batas_faktor=max_factor,
+                               label=f"Mode {mode}")
+        record["rows_out"] = None if result is None else len(result[0] if mode == DIFF_MODE else result)
+    if result is None:
+        tampilkan_panel(profiler, profile_panel)
+        st.stop()
+    result_df, diff_summary, diff_list = result if mode == DIFF_MODE else (result, None, None)
+
     # Atur urutan kolom untuk mode validasi
-    if mode in ["Validasi Saja", "Gabung & Validasi"]:
-        base_cols = list(df1.columns)
-        if cmp1 in base_cols:
-            insert_index = base_cols.index(cmp1) + 1
-            base_cols.insert(insert_index, f"{cmp1}_Data1")
-            base_cols.insert(insert_index + 1, f"{cmp2}_Data2")
-            base_cols.insert(insert_index + 2, "Status")
-        if cmp1 in base_cols:
-            base_cols.remove(cmp1)
-        final_cols = [col for col in base_cols if col in result_df.columns]
-    else:
-        final_cols = result_df.columns.tolist()
+    final_cols = urutan_kolom(result_df, df1.columns, mode, cmp1, cmp2)
     
-    if mode in ["Validasi Saja", "Gabung & Validasi"]:
+    has_status = mode in VALIDATION_MODES or mode == DIFF_MODE
+    if has_status:
+        status_labels = DIFF_STATUS_LABELS if mode == DIFF_MODE else STATUS_LABELS
         selected_status = st.multiselect("Pilih status yang ingin ditampilkan", 
-                                         ['Valid', 'Tidak Valid', 'Tidak Ada pada Data 2', 'Tidak Ada pada Data 1'],
-                                         default=['Valid', 'Tidak Valid', 'Tidak Ada pada Data 2', 'Tidak Ada pada Data 1'])
+                                         status_labels, default=status_labels)
         if selected_status:
-            result_df = result_df[result_df["Status"].isin(selected_status)]
+            with profiler.stage("filter status", rows_in=len(result_df)) as record:
+                result_df = result_df[result_df["Status"].isin(selected_status)]
+                record["rows_out"] = len(result_df)
         else:
             st.warning("Pilih setidaknya satu status untuk ditampilkan.")
     
     st.subheader(f"Hasil Operasi ({mode})")
-    st.dataframe(result_df[final_cols], height=300)
+    with profiler.stage("render: hasil", rows_in=len(result_df)):
+        # Kunci cache halaman: konfigurasi hasil mode + filter status
+        preview_key = result_key + (tuple(selected_status) if has_status else None,)
+        tampilkan_preview(result_df[final_cols], "preview_hasil", preview_key, height=300)
     
     # ---------------------------
     # Fitur Tambahan: Visualisasi Status Validasi
     # ---------------------------
-    if mode in ["Validasi Saja", "Gabung & Validasi"]:
+    if has_status:
         st.header("Statistik Hasil Validasi")
-        # Hitung jumlah masing-masing status validasi
-        status_counts = result_df["Status"].value_counts()
+        with profiler.stage("chart: status", rows_in=len(result_df)):
+            # Hitung jumlah masing-masing status validasi
+            status_counts = result_df["Status"].value_counts()
 
-        # Buat pie chart dengan ukuran yang lebih kecil
-        fig, ax = plt.subplots(figsize=(4, 4))  # Atur ukuran figure sesuai kebutuhan
-        fig.patch.set_facecolor('black')  # Set background color to black
-        ax.pie(status_counts, labels=status_counts.index, autopct='%1.1f%%', startangle=90, textprops={'color':"w"})
-        ax.axis('equal')  # Pastikan pie chart berbentuk lingkaran sempurna
-        st.pyplot(fig)
+            # Buat pie chart dengan ukuran yang lebih kecil
+            fig, ax = plt.subplots(figsize=(4, 4))  # Atur ukuran figure sesuai kebutuhan
+            fig.patch.set_facecolor('black')  # Set background color to black
+            ax.pie(status_counts, labels=status_counts.index, autopct='%1.1f%%', startangle=90, textprops={'color':"w"})
+            ax.axis('equal')  # Pastikan pie chart berbentuk lingkaran sempurna
+            st.pyplot(fig)
 
         # Tampilkan juga ringkasan statistik dalam bentuk tabel
         st.subheader("Ringkasan Statistik")
         st.dataframe(status_counts.to_frame().reset_index().rename(columns={'index': 'Status', 'Status': 'Jumlah'}))
 
+    if mode == DIFF_MODE:
+        st.subheader("Jumlah Beda per Kolom")
+        if diff_summary.empty:
+            st.warning("Tidak ada kolom bernama sama (selain primary key) yang bisa dibandingkan.")
+        else:
+            st.dataframe(diff_summary, hide_index=True)
+        st.subheader("Daftar Selisih")
+        if diff_list.empty:
+            st.success("Tidak ada selisih pada kolom yang dibandingkan.")
+        else:
+            with profiler.stage("render: selisih", rows_in=len(diff_list)):
+                tampilkan_preview(diff_list, "preview_selisih", result_key + ("selisih",), height=300)
+
     # ---------------------------
     # Unduh Hasil
     # ---------------------------
     st.header("Langkah 4: Unduh Hasil")
-    if st.checkbox("Unduh hasil sebagai file Excel?"):
+    # Hasil yang sudah diekspor hanya ditawarkan selama konfigurasi dan data tidak berubah
+    export_signature = (fp1, fp2, mode, pk1, pk2, normalisasi, policy, cmp1, cmp2, fuzzy_threshold,
+                        tolerance, tuple(final_cols), len(result_df))
+    if st.checkbox("Unduh hasil sebagai file?"):
         output_file_name = st.text_input("Masukkan nama file output (tanpa ekstensi)")
-        if st.button("Download Excel"):
-            output = io.BytesIO()
-            with pd.ExcelWriter(output, engine='xlsxwriter') as writer:
-                result_df[final_cols].to_excel(writer, index=False)
-            output.seek(0)
-            st.download_button(
-                label="Download Excel",
-                data=output,
-                file_name=f"{output_file_name}.xlsx",
-                mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
-            )
+        export_format = pilih_format("export_format")
+        if st.button("Buat File"):
+            sheets = [("Sheet1", result_df[final_cols])]
+            if mode == DIFF_MODE:
+                sheets = [("Per Baris", result_df[final_cols]), ("Per Kolom", diff_summary), ("Selisih", diff_list)]
+            mulai("export_job", sheets, export_format, output_file_name, export_signature, rows=len(result_df))
+        tampilkan_unduhan("export_job", export_signature, profiler)
+
+tampilkan_panel(profiler, profile_panel)
@@ -0,0 +1,653 @@
+import numpy as np
+import pandas as pd
+import re
+import warnings
+
+from excel_reader import read_excel
+from fuzzy_match import cocokkan_mirip
+from jobs import bagian, lapor
+from key_index import KeyIndex, kolom_key, teks_kunci
+
+DIFF_MODE = "Bandingkan Semua Kolom"
+MODES = ("Gabung & Validasi", "Validasi Saja", "Gabung Data Saja", DIFF_MODE)
+VALIDATION_MODES = ("Gabung & Validasi", "Validasi Saja")
+STATUS_LABELS = ['Valid', 'Tidak Valid', 'Mirip', 'Tidak Ada pada Data 2', 'Tidak Ada pada Data 1']
+# Kolom tambahan hasil validasi jika pencocokan key mirip diaktifkan
+SCORE_COLUMN = "Skor Kemiripan"
+SIMILAR_KEY_COLUMN = "Key Mirip Data 2"
+DIFF_STATUS_LABELS = ['Sama', 'Beda', 'Tidak Ada pada Data 2', 'Tidak Ada pada Data 1']
+# Toleransi bawaan mode Bandingkan Semua Kolom: selisih angka sekecil ini dianggap sama
+# (pembulatan float), tanggal harus persis sama
+NUMERIC_TOLERANCE = 1e-9
+DATE_TOLERANCE = pd.Timedelta(0)
+# Jumlah nilai teks yang dicoba dibaca sebagai angka/tanggal sebelum seluruh kolom dikonversi
+TYPE_SAMPLE_SIZE = 1_000
+DUPLICATE_POLICIES = {
+    "semua": "Pertahankan semua baris",
+    "pertama": "Pakai baris pertama per key",
+    "terakhir": "Pakai baris terakhir per key",
+    "agregasi": "Agregasi (jumlahkan kolom angka, nilai pertama untuk kolom lain)",
+    "tolak": "Tolak jika ada key duplikat",
+}
+# Gabung Data Saja dihentikan jika hasil diperkirakan lebih dari sekian kali jumlah baris input
+# (key duplikat di kedua data membuat hasil join berlipat)
+MAX_OUTPUT_FACTOR = 10
+# Baris Data 1 per chunk validasi; progress dilaporkan (dan pembatalan dicek) tiap chunk
+VALIDATION_CHUNK_ROWS = 250_000
+
+# ---------------------------
+# Fungsi Utility
+# ---------------------------
+def clean_column_name(name):
+    """Bersihkan nama kolom dengan menghilangkan karakter non-alfanumerik dan mengubah ke huruf kecil."""
+    return re.sub(r'[^a-zA-Z0-9]', '', name).lower()
+
+def load_file(path, sheet=None):
+    """Baca file CSV/Excel dari path (sheet pertama jika sheet tidak dipilih)."""
+    if str(path).endswith(".xlsx"):
+        return read_excel(path, sheet if sheet is not None else 0)
+    return pd.read_csv(path)
+
+def kolom_objek(s):
+    """Kolom category/string (mis. hasil kompaksi) sebagai kolom object, dengan pd.NA menjadi NaN.
+
+    Perbandingan nilai lalu berperilaku sama seperti pada data yang belum dikompaksi: pd.NA tidak
+    bisa dipakai sebagai boolean, sedangkan NaN selalu tidak sama dengan nilai apa pun.
+    """
+    if isinstance(s.dtype, (pd.CategoricalDtype, pd.StringDtype)):
+        return pd.Series(s.to_numpy(dtype=object, na_value=np.nan), index=s.index, name=s.name)
+    return s
+
+def indeks_key(df1, df2, pk1, pk2, normalisasi=()):
+    """KeyIndex Data 1 dan Data 2. pk boleh satu kolom atau list kolom dengan jumlah yang sama."""
+    if len(kolom_key(pk1)) != len(kolom_key(pk2)):
+        raise ValueError("Jumlah kolom key Data 1 dan Data 2 harus sama.")
+    return KeyIndex(df1, pk1, normalisasi), KeyIndex(df2, pk2, normalisasi)
+
+def kolom_nama_sama(df1, df2):
+    """Kolom Data 2 yang namanya (setelah dibersihkan) juga ada di Data 1."""
+    clean_cols_df1 = {clean_column_name(col): col for col in df1.columns}
+    clean_cols_df2 = {clean_column_name(col): col for col in df2.columns}
+    return [clean_cols_df2[col] for col in clean_cols_df2 if col in clean_cols_df1]
+
+# ---------------------------
+# Key Duplikat: Profil & Kebijakan
+# ---------------------------
+def _statistik_key(index):
+    _, counts, valid = index.jumlah_per_key()
+    duplicated = valid & (counts > 1)
+    return {
+        "rows": len(index),
+        "unique_keys": int(valid.sum()),
+        "duplicate_keys": int(duplicated.sum()),
+        "duplicate_rows": int((counts[duplicated] - 1).sum()),
+        "empty_keys": int((~index.valid).sum()),
+    }
+
+def profil_key(keys):
+    """Ringkasan key kedua data sebelum digabung, dihitung dari hash di indeks key.
+
+    Berisi statistik per data ("data1"/"data2"), jumlah key yang cocok, key yang berulang di
+    kedua data (many-to-many), dan perkiraan jumlah baris hasil setiap mode ("rows_per_mode").
+    """
+    index1, index2 = keys
+    hashes1, counts1, valid1 = index1.jumlah_per_key()
+    hashes2, counts2, valid2 = index2.jumlah_per_key()
+    pos = hashes2.get_indexer(hashes1)
+    shared = pos >= 0
+    matched = shared & valid1
+    pos_matched = pos[matched]
+    # Outer join menyamakan key kosong seperti pd.merge; mode validasi tidak
+    outer_rows = int((counts1[shared] * counts2[pos[shared]]).sum() + counts1[~shared].sum()
+                     + counts2.sum() - counts2[pos[shared]].sum())
+    only2_rows = int(counts2.sum() - counts2[pos[shared]].sum())
+    only2_valid_rows = int(counts2.sum() - counts2[pos_matched].sum())
+    return {
+        "data1": _statistik_key(index1),
+        "data2": _statistik_key(index2),
+        "matched_keys": int(matched.sum()),
+        "many_to_many_keys": int(((counts1[matched] > 1) & (counts2[pos_matched] > 1)).sum()),
+        "rows_per_mode": {
+            "Validasi Saja": len(index1),
+            "Gabung & Validasi": len(index1) + only2_rows,
+            "Gabung Data Saja": outer_rows,
+            DIFF_MODE: len(index1) + only2_valid_rows,
+        },
+    }
+
+def _posisi_kebijakan(index, kebijakan):
+    """Posisi baris yang dipertahankan kebijakan duplikat; baris ber-key kosong selalu dipertahankan."""
+    duplicated = pd.Series(index.hashes).duplicated(keep="last" if kebijakan == "terakhir" else "first")
+    return np.flatnonzero(~duplicated.to_numpy() | ~index.valid)
+
+def _agregasi_duplikat(df, index, pk):
+    """Satu baris per key: kolom angka dijumlahkan, kolom lain memakai nilai pertama yang tidak kosong."""
+    codes, _ = pd.factorize(index.hashes)
+    # Baris ber-key kosong tidak digabung satu sama lain
+    codes = np.where(index.valid, codes, len(codes) + np.arange(len(codes)))
+    grouped = df.reset_index(drop=True).groupby(codes, sort=False)
+    keys = set(kolom_key(pk))
+    numeric = [col for col in df.columns if col not in keys and pd.api.types.is_numeric_dtype(df[col].dtype)
+               and not pd.api.types.is_bool_dtype(df[col].dtype)]
+    others = [col for col in df.columns if col not in numeric]
+    result = pd.concat([grouped[numeric].sum(min_count=1), grouped[others].first()], axis=1)
+    return result[df.columns].reset_index(drop=True)
+
+def terapkan_kebijakan_duplikat(df1, df2, pk1, pk2, keys, kebijakan):
+    """(df1, df2, keys) setelah kebijakan key duplikat (lihat DUPLICATE_POLICIES) diterapkan.
+
+    "tolak" melempar ValueError jika salah satu data memiliki key duplikat. Indeks key tidak
+    dihitung ulang: indeks hasil diambil dari posisi baris yang dipertahankan.
+    """
+    if kebijakan not in DUPLICATE_POLICIES:
+        raise ValueError(f"Kebijakan key duplikat tidak dikenal: {kebijakan}")
+    if kebijakan == "semua":
+        return df1, df2, keys
+    if kebijakan == "tolak":
+        profile = profil_key(keys)
+        dup1, dup2 = profile["data1"]["duplicate_keys"], profile["data2"]["duplicate_keys"]
+        if dup1 or dup2:
+            raise ValueError(f"Key duplikat ditemukan: {dup1:,} key di Data 1 dan {dup2:,} key di Data 2.")
+        return df1, df2, keys
+    result = []
+    for df, index, pk in ((df1, keys[0], pk1), (df2, keys[1], pk2)):
+        positions = _posisi_kebijakan(index, kebijakan)
+        if len(positions) < len(df):
+            if kebijakan == "agregasi":
+                df = _agregasi_duplikat(df, index, pk)
+            else:
+                df = df.iloc[positions].reset_index(drop=True)
+            index = index.ambil(positions)
+        result.append((df, index))
+    (df1, index1), (df2, index2) = result
+    return df1, df2, (index1, index2)
+
+def indeks_setelah_kebijakan(keys, kebijakan):
+    """Indeks key setelah kebijakan duplikat tanpa menyentuh data, untuk perkiraan ukuran hasil."""
+    if kebijakan in ("semua", "tolak"):
+        return keys
+    return tuple(index.ambil(_posisi_kebijakan(index, kebijakan)) for index in keys)
+
+def cek_ukuran_hasil(df1, df2, keys, mode, batas_faktor=MAX_OUTPUT_FACTOR):
+    """Lempar ValueError jika hasil mode diperkirakan lebih dari batas_faktor x jumlah baris input."""
+    if batas_faktor is None:
+        return
+    profile = profil_key(keys)
+    estimated = profile["rows_per_mode"][mode]
+    limit = batas_faktor * max(len(df1) + len(df2), 1)
+    if estimated > limit:
+        raise ValueError(
+            f"Penggabungan dihentikan: hasil diperkirakan {estimated:,} baris, lebih dari {batas_faktor}x "
+            f"jumlah baris input, karena {profile['many_to_many_keys']:,} key berulang di kedua data. "
+            "Pilih kebijakan key duplikat lain atau naikkan batas."
+        )
+
+# ---------------------------
+# Pencocokan Key Mirip
+# ---------------------------
+def key_mirip(df1, df2, pk1, pk2, keys, threshold, progress=None):
+    """Pasangkan key sisa (tidak cocok persis) Data 1 dan Data 2 yang mirip, lihat fuzzy_match.py.
+
+    Mengembalikan (posisi baris Data 2 per baris Data 1 atau -1, skor per baris Data 1 atau NaN,
+    mask baris Data 2 yang terpasang). Teks key memakai normalisasi yang sama dengan indeks key.
+    """
+    index1, index2 = keys
+    left1 = np.flatnonzero(index1.valid & (index2.cari(index1.hashes, index1.valid) < 0))
+    left2 = np.flatnonzero(index2.valid & ~index2.ada_di(index1))
+    texts1 = teks_kunci(df1.iloc[left1], pk1, index1.normalisasi)
+    texts2 = teks_kunci(df2.iloc[left2], pk2, index2.normalisasi)
+    match, score, matched2 = cocokkan_mirip(texts1, texts2, threshold, progress)
+    pos2 = np.full(len(df1), -1, dtype=np.intp)
+    pos2[left1] = np.where(match >= 0, left2[np.maximum(match, 0)], -1)
+    scores = np.full(len(df1), np.nan)
+    scores[left1] = score
+    mask2 = np.zeros(len(df2), dtype=bool)
+    mask2[left2] = matched2
+    return pos2, scores, mask2
+
+# ---------------------------
+# Mode Operasi: Validasi Saja
+# ---------------------------
+def validasi_saja(df1, df2, pk1, pk2, cmp1, cmp2, progress=None, keys=None, mirip=None):
+    """Validasi setiap baris Data 1 terhadap Data 2 lewat indeks key Data 2.
+
+    Untuk key yang berulang di Data 2 hanya baris pertama yang dipakai, sama seperti
+    perilaku lama (matching.iloc[0]). Key kosong (NaN) tidak pernah dianggap cocok.
+    keys: pasangan KeyIndex (Data 1, Data 2) yang sudah dibangun, agar tidak dihitung ulang.
+    mirip: hasil key_mirip; baris yang hanya cocok secara mirip berstatus "Mirip" dan hasil
+    memiliki kolom skor serta key Data 2 pasangannya.
+    """
+    index1, index2 = keys or indeks_key(df1, df2, pk1, pk2)
+    values2 = kolom_objek(df2[cmp2]).to_numpy(dtype=object)
+    val1 = kolom_objek(df1[cmp1]).to_numpy(dtype=object)
+    val2 = np.full(len(df1), None, dtype=object)
+    status = np.empty(len(df1), dtype=object)
+
+    for start in range(0, len(df1), VALIDATION_CHUNK_ROWS):
+        stop = min(start + VALIDATION_CHUNK_ROWS, len(df1))
+        pos = index2.cari(index1.hashes[start:stop], index1.valid[start:stop])
+        found = pos >= 0
+        chunk2 = val2[start:stop]
+        chunk2[found] = values2[pos[found]]
+        status[start:stop] = np.where(
+            found,
+            np.where(pd.Series(val1[start:stop] == chunk2).eq(True), "Valid", "Tidak Valid"),
+            "Tidak Ada pada Data 2",
+        )
+        lapor(progress, stop / len(df1), f"validasi {stop:,}/{len(df1):,} baris")
+
+    if mirip is not None:
+        pos2, scores, _ = mirip
+        similar = pos2 >= 0
+        val2[similar] = values2[pos2[similar]]
+        status[similar] = "Mirip"
+
+    result = df1.copy()
+    result[f"{cmp1}_Data1"] = df1[cmp1].to_numpy()
+    result[f"{cmp2}_Data2"] = pd.Series(val2, index=df1.index).infer_objects()
+    result["Status"] = status
+    if mirip is not None:
+        similar_keys = np.full(len(df1), None, dtype=object)
+        similar_keys[similar] = teks_kunci(df2.iloc[pos2[similar]], pk2)
+        result[SCORE_COLUMN] = np.round(scores, 3)
+        result[SIMILAR_KEY_COLUMN] = similar_keys
+    return result.reset_index(drop=True)
+
+# ---------------------------
+# Mode Operasi: Gabung & Validasi
+# ---------------------------
+def data2_tidak_ada_di_data1(df1, df2, pk1, pk2, keys=None, mirip=None):
+    """Baris Data 2 yang key-nya tidak ditemukan di Data 1 (dan tidak terpasang secara mirip)."""
+    index1, index2 = keys or indeks_key(df1, df2, pk1, pk2)
+    missing = ~index2.ada_di(index1)
+    if mirip is not None:
+        missing &= ~mirip[2]
+    return df2[missing]
+
+def baris_tidak_ada_data1(df1, missing_rows, pk1, pk2, cmp1, cmp2, selected_columns):
+    """Bangun semua baris "Tidak Ada pada Data 1" sekaligus dengan kolom milik Data 1."""
+    clean_cols_df1 = {clean_column_name(col): col for col in df1.columns}
+    new_rows = pd.DataFrame({col: None for col in df1.columns}, index=missing_rows.index)
+    for col1, col2 in zip(kolom_key(pk1), kolom_key(pk2)):
+        new_rows[col1] = missing_rows[col2]
+    for col in selected_columns:
+        target_col = clean_cols_df1.get(clean_column_name(col))
+        if target_col is not None:
+            new_rows[target_col] = missing_rows[col]
+    new_rows[f"{cmp1}_Data1"] = None
+    new_rows[f"{cmp2}_Data2"] = missing_rows[cmp2]
+    new_rows["Status"] = "Tidak Ada pada Data 1"
+    return new_rows
+
+def gabung_validasi_data(df1, df2, pk1, pk2, cmp1, cmp2, selected_columns=None, progress=None, keys=None,
+                         mirip=None):
+    """Validasi Data 1 lalu tambahkan baris Data 2 yang tidak ada di Data 1.
+
+    Jika selected_columns None, kolom dengan nama sama digabung otomatis. Baris Data 2 yang
+    sudah terpasang lewat mirip tidak ditambahkan lagi.
+    """
+    keys = keys or indeks_key(df1, df2, pk1, pk2)
+    result = validasi_saja(df1, df2, pk1, pk2, cmp1, cmp2, progress=bagian(progress, 0.0, 0.8), keys=keys,
+                           mirip=mirip)
+    lapor(progress, 0.8, "mencari baris Data 2 yang tidak ada di Data 1")
+    missing_rows = data2_tidak_ada_di_data1(df1, df2, pk1, pk2, keys, mirip)
+    if missing_rows.empty:
+        return result
+    if selected_columns is None:
+        selected_columns = kolom_nama_sama(df1, df2)
+    new_rows = baris_tidak_ada_data1(df1, missing_rows, pk1, pk2, cmp1, cmp2, selected_columns)
+    if result.empty:
+        return new_rows.reindex(columns=result.columns).reset_index(drop=True)
+    # Kolom yang seluruhnya kosong di baris baru tidak ikut menentukan dtype: concat mengisinya
+    # dengan NaN sesuai dtype kolom hasil validasi (int menjadi float, tanggal tetap tanggal)
+    new_rows = new_rows.loc[:, new_rows.notna().any().to_numpy()]
+    return pd.concat([result, new_rows], ignore_index=True)
+
+# ---------------------------
+# Mode Operasi: Gabung Data Saja
+# ---------------------------
+def _posisi_outer_join(index1, index2):
+    """Posisi baris (Data 1, Data 2) hasil full outer join pada hash key, plus kode key per pasangan.
+
+    Setiap baris Data 1 dipasangkan dengan semua baris Data 2 ber-key sama (atau -1 jika tidak
+    ada), lalu baris Data 2 yang key-nya tidak ada di Data 1 ditambahkan dengan posisi Data 1 = -1.
+    """
+    n1 = len(index1)
+    codes, uniques = pd.factorize(np.concatenate([index1.hashes, index2.hashes]))
+    codes1, codes2 = codes[:n1], codes[n1:]
+    counts2 = np.bincount(codes2, minlength=len(uniques))
+    order2 = np.argsort(codes2, kind="stable")
+    offsets2 = np.concatenate([[0], np.cumsum(counts2)])
+
+    matches = counts2[codes1]
+    repeats = np.maximum(matches, 1)
+    left_pos = np.repeat(np.arange(n1), repeats)
+    within = np.arange(len(left_pos)) - np.repeat(np.cumsum(repeats) - repeats, repeats)
+    has_match = np.repeat(matches, repeats) > 0
+    right_pos = np.full(len(left_pos), -1, dtype=np.intp)
+    right_pos[has_match] = order2[np.repeat(offsets2[codes1], repeats)[has_match] + within[has_match]]
+
+    only2 = np.flatnonzero(np.bincount(codes1, minlength=len(uniques))[codes2] == 0)
+    left_pos = np.concatenate([left_pos, np.full(len(only2), -1, dtype=np.intp)])
+    right_pos = np.concatenate([right_pos, only2])
+    pair_codes = np.concatenate([np.repeat(codes1, repeats), codes2[only2]])
+    return left_pos, right_pos, pair_codes, codes
+
+def _ambil_kolom(s1, s2, left_pos, right_pos):
+    """Nilai dari Data 1 jika baris punya pasangan di Data 1, selain itu dari Data 2."""
+    if not len(s1) or not len(s2):
+        # Hanya satu sisi yang punya baris; concat dengan Series kosong bisa mengubah dtype
+        s, positions = (s2, right_pos) if not len(s1) else (s1, left_pos)
+        return s.iloc[positions].reset_index(drop=True)
+    combined = pd.concat([s1, s2], ignore_index=True)
+    positions = np.where(left_pos >= 0, left_pos, len(s1) + right_pos)
+    return combined.iloc[positions].reset_index(drop=True)
+
+def _nilai_urut(s):
+    """Nilai pengurutan key seperti pd.merge: tanggal/waktu memakai nilai int64 (NaT paling kecil)."""
+    asi8 = getattr(s.array, "asi8", None)
+    return s if asi8 is None else pd.Series(asi8, index=s.index)
+
+def _peringkat_key(df1, df2, keys1, keys2, codes):
+    """Peringkat urutan setiap kode key berdasarkan nilai key kemunculan pertamanya."""
+    # pd.factorize memberi kode sesuai urutan kemunculan, jadi kemunculan pertama kode ke-i
+    # adalah posisi ke-i tempat nilai maksimum kumulatif kode bertambah
+    running_max = np.maximum.accumulate(codes)
+    first = np.flatnonzero(np.concatenate([[True], running_max[1:] > running_max[:-1]])) if len(codes) else codes
+    in1 = first < len(df1)
+    first1, first2 = np.where(in1, first, -1), np.where(in1, -1, first - len(df1))
+    values = pd.DataFrame({i: _nilai_urut(_ambil_kolom(df1[col1], df2[col2], first1, first2))
+                           for i, (col1, col2) in enumerate(zip(keys1, keys2))})
+    try:
+        order = values.sort_values(list(values.columns), kind="stable", na_position="last").index
+    except TypeError:
+        # Key bertipe campuran diurutkan sebagai teks
+        values = values.apply(lambda s: s.where(s.isna(), s.astype(str)))
+        order = values.sort_values(list(values.columns), kind="stable", na_position="last").index
+    rank = np.empty(len(order), dtype=np.intp)
+    rank[order.to_numpy()] = np.arange(len(order))
+    return rank
+
+def outer_join_key(df1, df2, pk1, pk2, keys=None, progress=None):
+    """Full outer join seperti pd.merge(left_on=pk1, right_on=pk2, suffixes=("_Data1", "_Data2")).
+
+    Pencocokan memakai indeks key (mendukung key beberapa kolom dan normalisasi). Kolom key
+    dengan nama sama di kedua data digabung menjadi satu kolom. Urutan hasil sama dengan outer
+    join pandas: berdasarkan nilai key (key kosong di akhir, kecuali NaT pada key tanggal/waktu
+    yang di awal), lalu urutan baris Data 1, lalu urutan baris Data 2. Key kategori (hasil mode
+    hemat memori) diurutkan menurut nilainya seperti sebelum dipadatkan, bukan menurut kode.
+    progress dipanggil setelah pencocokan key dan per kolom hasil (lihat jobs.py).
+    """
+    lapor(progress, 0.0, "mencocokkan key")
+    index1, index2 = keys or indeks_key(df1, df2, pk1, pk2)
+    keys1, keys2 = kolom_key(pk1), kolom_key(pk2)
+    left_pos, right_pos, pair_codes, codes = _posisi_outer_join(index1, index2)
+    lapor(progress, 0.1, "mengurutkan hasil join")
+    rank = _peringkat_key(df1, df2, keys1, keys2, codes)
+    # Di dalam satu key, pasangan sudah urut menurut baris Data 1 lalu baris Data 2
+    order = np.argsort(rank[pair_codes], kind="stable")
+    left_pos, right_pos = left_pos[order], right_pos[order]
+
+    shared = {col1 for col1, col2 in zip(keys1, keys2) if col1 == col2}
+    overlap = (set(df1.columns) & set(df2.columns)) - shared
+    # Kolom hasil diambil satu per satu agar progress dan pembatalan bisa dicek di antaranya
+    parts = [(col, j, df1, left_pos, "_Data1") for j, col in enumerate(df1.columns)]
+    parts += [(col, j, df2, right_pos, "_Data2") for j, col in enumerate(df2.columns) if col not in shared]
+    values = []
+    for i, (col, j, df, positions, suffix) in enumerate(parts):
+        lapor(progress, 0.2 + 0.8 * i / len(parts), f"menyusun kolom {col}")
+        if col in shared:
+            values.append(_ambil_kolom(df1[col], df2[col], left_pos, right_pos))
+        else:
+            values.append(df.iloc[:, j].reset_index(drop=True).reindex(positions).reset_index(drop=True))
+    lapor(progress, 1.0)
+    result = pd.concat(values, axis=1) if values else pd.DataFrame(index=pd.RangeIndex(len(left_pos)))
+    result.columns = [f"{col}{suffix}" if col in overlap else col for col, _, _, _, suffix in parts]
+    return result
+
+def _isi_kosong(s1, s2):
+    """s1.combine_first(s2) untuk dua kolom ber-index sama, tanpa concat dengan bagian kosong.
+
+    dtype hasil hanya ditentukan oleh kolom yang nilainya dipakai, seperti combine_first selama ini.
+    """
+    missing = s1.isna()
+    if not missing.any():
+        return s1.copy()
+    if missing.all():
+        return pd.to_datetime(s2) if s1.dtype.kind == "M" and s2.dtype.kind != "M" else s2.copy()
+    return s1.combine_first(s2)
+
+def gabung_data_saja(df1, df2, pk1, pk2, progress=None, keys=None):
+    # Lakukan full outer join berdasarkan primary key
+    merged_df = outer_join_key(df1, df2, pk1, pk2, keys, bagian(progress, 0.0, 0.7))
+    keys1, keys2 = kolom_key(pk1), kolom_key(pk2)
+
+    # Penggabungan kolom: untuk kolom yang sama di kedua data (selain primary key)
+    # Buat mapping nama kolom yang telah dibersihkan untuk masing-masing dataframe
+    norm_df1 = {clean_column_name(col): col for col in df1.columns if col not in keys1}
+    norm_df2 = {clean_column_name(col): col for col in df2.columns if col not in keys2}
+
+    # Cari kolom umum berdasarkan nama yang telah dinormalisasi
+    common_norm = set(norm_df1.keys()).intersection(set(norm_df2.keys()))
+
+    for i, norm in enumerate(common_norm):
+        lapor(progress, 0.7 + 0.3 * i / len(common_norm), "menggabungkan kolom dengan nama sama")
+        col1 = norm_df1[norm] + "_Data1"  # kolom dari df1 setelah merge
+        col2 = norm_df2[norm] + "_Data2"  # kolom dari df2 setelah merge
+        if col1 in merged_df.columns and col2 in merged_df.columns:
+            # Gabungkan dengan prioritas nilai dari Data1 jika tidak null
+            merged_df[norm_df1[norm]] = _isi_kosong(merged_df[col1], merged_df[col2])
+            # Hapus kolom yang terpisah karena sudah digabungkan
+            merged_df = merged_df.drop(columns=[col1, col2])
+
+    # Jangan menghilangkan kolom primary key, sehingga baik pk1 maupun pk2 (jika ada) tetap tampil
+    return merged_df
+
+# ---------------------------
+# Mode Operasi: Bandingkan Semua Kolom
+# ---------------------------
+def pasangan_kolom(df1, df2, pk1, pk2):
+    """Pasangan (kolom Data 1, kolom Data 2) selain key yang namanya sama setelah clean_column_name."""
+    keys1, keys2 = kolom_key(pk1), kolom_key(pk2)
+    norm_df2 = {clean_column_name(col): col for col in df2.columns if col not in keys2}
+    return [(col, norm_df2[clean_column_name(col)]) for col in df1.columns
+            if col not in keys1 and clean_column_name(col) in norm_df2]
+
+def _sebagai_angka(s):
+    """Kolom sebagai float, atau None jika ada nilai (tidak kosong) yang bukan angka."""
+    if pd.api.types.is_bool_dtype(s.dtype):
+        return None
+    if pd.api.types.is_numeric_dtype(s.dtype):
+        return s.to_numpy(dtype=np.float64, na_value=np.nan)
+    if s.dtype != object:
+        return None
+    # Kolom teks biasa cepat ditolak dari sampel, tanpa mengonversi seluruh kolom
+    sample = s.dropna().head(TYPE_SAMPLE_SIZE)
+    # Kolom bool yang menjadi object (mis. setelah reindex dengan baris kosong) tetap bukan angka
+    if pd.api.types.infer_dtype(sample, skipna=True) == "boolean":
+        return None
+    if pd.to_numeric(sample, errors="coerce").isna().any():
+        return None
+    numbers = pd.to_numeric(s, errors="coerce")
+    if (numbers.isna() & s.notna()).any():
+        return None
+    return numbers.to_numpy(dtype=np.float64, na_value=np.nan)
+
+def _sebagai_tanggal(s):
+    if s.dtype.kind == "M":
+        dates = s
+    else:
+        # Teks tanggal di file yang lain bisa berformat campuran; setiap nilai dibaca sendiri
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", UserWarning)
+            dates = pd.to_datetime(s.astype(object), errors="coerce", format="mixed")
+    if getattr(dates.dt, "tz", None) is not None:
+        dates = dates.dt.tz_convert(None)
+    return dates.to_numpy(dtype="datetime64[ns]")
+
+def tampak_tanggal(s):
+    """True jika sampel nilai kolom teks semuanya bisa dibaca sebagai tanggal."""
+    if s.dtype.kind == "M":
+        return True
+    if s.dtype != object:
+        return False
+    sample = s.dropna().head(TYPE_SAMPLE_SIZE).astype(str)
+    if sample.empty or not sample.str.contains(r"\d").all():
+        return False
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", UserWarning)
+        return bool(pd.to_datetime(sample, errors="coerce", format="mixed").notna().all())
+
+def _bandingkan_kolom(s1, s2, toleransi_angka, toleransi_tanggal, jenis=None):
+    """(jenis perbandingan, mask nilai sama) untuk dua kolom yang sudah sejajar per baris.
+
+    Angka dibandingkan dengan toleransi selisih mutlak, tanggal dengan toleransi Timedelta,
+    selain itu nilai dibandingkan apa adanya. Teks yang berisi angka atau tanggal (mis. dari
+    CSV) dibandingkan sebagai angka/tanggal. Dua nilai kosong dianggap sama. jenis ("angka",
+    "tanggal", "teks") opsional memaksa jenis perbandingan alih-alih mendeteksinya dari kolom.
+    """
+    s1, s2 = kolom_objek(s1), kolom_objek(s2)
+    if jenis is None or jenis == "angka":
+        a, b = _sebagai_angka(s1), _sebagai_angka(s2)
+        if jenis == "angka" and (a is None or b is None):
+            a = pd.to_numeric(s1, errors="coerce").to_numpy(dtype=np.float64, na_value=np.nan)
+            b = pd.to_numeric(s2, errors="coerce").to_numpy(dtype=np.float64, na_value=np.nan)
+        if a is not None and b is not None:
+            return "angka", np.isclose(a, b, rtol=0.0, atol=toleransi_angka, equal_nan=True)
+    if jenis == "tanggal" or (jenis is None and ((s1.dtype.kind == "M" or s2.dtype.kind == "M")
+                                                 or (tampak_tanggal(s1) and tampak_tanggal(s2)))):
+        a, b = _sebagai_tanggal(s1), _sebagai_tanggal(s2)
+        missing1, missing2 = np.isnat(a), np.isnat(b)
+        close = np.abs(a - b) <= toleransi_tanggal.to_timedelta64()
+        return "tanggal", (missing1 & missing2) | (close & ~missing1 & ~missing2)
+    missing1, missing2 = s1.isna().to_numpy(), s2.isna().to_numpy()
+    equal = (s1.to_numpy(dtype=object) == s2.to_numpy(dtype=object)).astype(bool)
+    return "teks", (missing1 & missing2) | (equal & ~missing1 & ~missing2)
+
+def bandingkan_semua_kolom(df1, df2, pk1, pk2, toleransi_angka=NUMERIC_TOLERANCE, toleransi_tanggal=DATE_TOLERANCE,
+                           progress=None, keys=None, kebijakan_duplikat="semua", jenis=None, normalisasi=()):
+    """Bandingkan semua kolom yang berpasangan (lihat pasangan_kolom) untuk setiap key.
+
+    Baris dipasangkan seperti Validasi Saja: setiap baris Data 1 dengan baris pertama Data 2
+    ber-key sama (key dinormalisasi sesuai normalisasi bila keys tidak diberikan), lalu baris
+    Data 2 yang key-nya tidak ada di Data 1 ditambahkan. Mengembalikan
+    (hasil per baris, jumlah beda per kolom, daftar selisih format panjang).
+    kebijakan_duplikat diterapkan lebih dulu, seperti pada jalankan_mode. jenis opsional berisi
+    jenis perbandingan per kolom Data 1 (lihat _bandingkan_kolom), mis. yang ditentukan dari seluruh
+    file pada mode streaming.
+    """
+    keys = keys or indeks_key(df1, df2, pk1, pk2, normalisasi)
+    df1, df2, (index1, index2) = terapkan_kebijakan_duplikat(df1, df2, pk1, pk2, keys, kebijakan_duplikat)
+    keys1, keys2 = kolom_key(pk1), kolom_key(pk2)
+    pairs = pasangan_kolom(df1, df2, pk1, pk2)
+    only2 = np.flatnonzero(~(index2.ada_di(index1) & index2.valid))
+    left_pos = np.concatenate([np.arange(len(df1)), np.full(len(only2), -1)])
+    right_pos = np.concatenate([index2.cari(index1.hashes, index1.valid), only2])
+    both = (left_pos >= 0) & (right_pos >= 0)
+    left = df1.reset_index(drop=True).reindex(left_pos).reset_index(drop=True)
+    right = df2.reset_index(drop=True).reindex(right_pos).reset_index(drop=True)
+
+    result = pd.DataFrame({col1: _ambil_kolom(df1[col1], df2[col2], left_pos, right_pos)
+                           for col1, col2 in zip(keys1, keys2)})
+    mask = np.zeros((len(left_pos), len(pairs)), dtype=bool)
+    kinds = []
+    for j, (col1, col2) in enumerate(pairs):
+        lapor(progress, j / max(len(pairs), 1), f"membandingkan kolom {col1}")
+        kind, equal = _bandingkan_kolom(left[col1], right[col2], toleransi_angka, toleransi_tanggal,
+                                        (jenis or {}).get(col1))
+        kinds.append(kind)
+        mask[:, j] = both & ~equal
+        result[f"{col1}_Data1"] = left[col1]
+        result[f"{col2}_Data2"] = right[col2]
+
+    names = np.array([col1 for col1, _ in pairs], dtype=object)
+    rows, columns = np.nonzero(mask)  # urut per baris lalu urutan kolom
+    n_diff = mask.sum(axis=1)
+    labels = np.full(len(left_pos), "", dtype=object)
+    if len(rows):
+        # Nama kolom beda per baris digabung hanya untuk baris yang berbeda
+        starts = np.flatnonzero(np.concatenate([[True], rows[1:] != rows[:-1]]))
+        joined = np.add.reduceat((names + ", ")[columns], starts)
+        labels[rows[starts]] = pd.Series(joined, dtype=object).str[:-2].to_numpy(dtype=object)
+    result["Jumlah Kolom Beda"] = n_diff
+    result["Kolom Beda"] = labels
+    result["Status"] = np.select([~both & (left_pos >= 0), ~both, n_diff > 0],
+                                 ["Tidak Ada pada Data 2", "Tidak Ada pada Data 1", "Beda"], "Sama")
+
+    counts = mask.sum(axis=0)
+    summary = pd.DataFrame({
+        "Kolom Data 1": [col1 for col1, _ in pairs],
+        "Kolom Data 2": [col2 for _, col2 in pairs],
+        "Tipe": kinds,
+        "Jumlah Beda": counts,
+        "Persen Beda": np.round(100 * counts / max(int(both.sum()), 1), 2),
+    })
+
+    lapor(progress, 1.0, "menyusun daftar selisih")
+    diffs = result[keys1].iloc[rows].reset_index(drop=True)
+    diffs["Kolom"] = names[columns]
+    values1 = np.empty(len(rows), dtype=object)
+    values2 = np.empty(len(rows), dtype=object)
+    for j, (col1, col2) in enumerate(pairs):
+        in_column = columns == j
+        values1[in_column] = left[col1].iloc[rows[in_column]].to_numpy(dtype=object)
+        values2[in_column] = right[col2].iloc[rows[in_column]].to_numpy(dtype=object)
+    diffs["Nilai Data 1"] = values1
+    diffs["Nilai Data 2"] = values2
+    return result, summary, diffs
+
+# ---------------------------
+# Dispatcher Mode Operasi
+# ---------------------------
+def jalankan_mode(mode, df1, df2, pk1, pk2, cmp1=None, cmp2=None, selected_columns=None, progress=None,
+                  normalisasi=(), keys=None, fuzzy_threshold=None, kebijakan_duplikat="semua",
+                  batas_faktor=MAX_OUTPUT_FACTOR, jenis_kolom=None, toleransi_angka=NUMERIC_TOLERANCE,
+                  toleransi_tanggal=DATE_TOLERANCE):
+    """Jalankan salah satu mode operasi tanpa ketergantungan pada UI.
+
+    pk1/pk2 boleh satu kolom atau list kolom (key gabungan), dinormalisasi sesuai normalisasi
+    (lihat key_index.NORMALIZATIONS). keys opsional berisi pasangan KeyIndex yang sudah dibangun.
+    fuzzy_threshold (0-1) mengaktifkan pencocokan key mirip pada mode validasi.
+    kebijakan_duplikat (lihat DUPLICATE_POLICIES) diterapkan ke kedua data sebelum digabung, lalu
+    mode dihentikan dengan ValueError jika hasilnya diperkirakan melebihi batas_faktor x jumlah
+    baris input (None = tanpa batas).
+    jenis_kolom, toleransi_angka dan toleransi_tanggal diteruskan ke bandingkan_semua_kolom; mode
+    Bandingkan Semua Kolom mengembalikan ketiga hasilnya (per baris, per kolom, daftar selisih),
+    mode lain satu DataFrame.
+    progress(fraksi, pesan) opsional dipanggil per chunk (lihat jobs.py).
+    """
+    if mode not in MODES:
+        raise ValueError(f"Mode tidak dikenal: {mode}")
+    if mode in VALIDATION_MODES and (cmp1 is None or cmp2 is None):
+        raise ValueError("Mode validasi membutuhkan cmp1 dan cmp2.")
+    keys = keys or indeks_key(df1, df2, pk1, pk2, normalisasi)
+    df1, df2, keys = terapkan_kebijakan_duplikat(df1, df2, pk1, pk2, keys, kebijakan_duplikat)
+    cek_ukuran_hasil(df1, df2, keys, mode, batas_faktor)
+    mirip = None
+    if fuzzy_threshold is not None and mode in VALIDATION_MODES:
+        mirip = key_mirip(df1, df2, pk1, pk2, keys, fuzzy_threshold, bagian(progress, 0.0, 0.3))
+        progress = bagian(progress, 0.3, 1.0)
+    if mode == "Validasi Saja":
+        return validasi_saja(df1, df2, pk1, pk2, cmp1, cmp2, progress, keys, mirip)
+    if mode == "Gabung & Validasi":
+        return gabung_validasi_data(df1, df2, pk1, pk2, cmp1, cmp2, selected_columns, progress, keys, mirip)
+    if mode == DIFF_MODE:
+        return bandingkan_semua_kolom(df1, df2, pk1, pk2, toleransi_angka, toleransi_tanggal, progress=progress,
+                                      keys=keys, jenis=jenis_kolom)
+    return gabung_data_saja(df1, df2, pk1, pk2, progress, keys)
+
+def urutan_kolom(result_df, df1_columns, mode, cmp1=None, cmp2=None):
+    """Atur urutan kolom: kolom validasi ditaruh di posisi cmp1 pada mode validasi."""
+    if mode not in VALIDATION_MODES:
+        return result_df.columns.tolist()
+    base_cols = list(df1_columns)
+    if cmp1 in base_cols:
+        insert_index = base_cols.index(cmp1) + 1
+        base_cols.insert(insert_index, f"{cmp1}_Data1")
+        base_cols.insert(insert_index + 1, f"{cmp2}_Data2")
+        base_cols.insert(insert_index + 2, "Status")
+        base_cols.insert(insert_index + 3, SCORE_COLUMN)
+        base_cols.insert(insert_index + 4, SIMILAR_KEY_COLUMN)
+    if cmp1 in base_cols:
+        base_cols.remove(cmp1)
+    return [col for col in base_cols if col in result_df.columns]
@@ -0,0 +1,400 @@
+import math
+import os
+import shutil
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+from gabung_engine import (
+    DATE_TOLERANCE,
+    DIFF_MODE,
+    MODES,
+    NUMERIC_TOLERANCE,
+    TYPE_SAMPLE_SIZE,
+    VALIDATION_MODES,
+    jalankan_mode,
+    kolom_nama_sama,
+    pasangan_kolom,
+    tampak_tanggal,
+    urutan_kolom,
+)
+from jobs import JobCancelled, bagian, lapor
+from key_index import hash_kunci, kolom_key
+
+# ---------------------------
+# Rekonsiliasi Streaming (Out-of-Core)
+# ---------------------------
+# File besar dibaca per chunk, dipartisi dengan hash primary key ke file spill di disk,
+# lalu digabung per partisi. Baris dengan key yang sama selalu jatuh di partisi yang sama.
+# Tipe setiap kolom (bilangan bulat, desimal, boolean, tanggal, teks) ditentukan dari seluruh file
+# selama spill, seperti pandas membaca file utuh, dan setiap partisi dibaca ulang dengan tipe itu.
+# Partisi dihitung dari hash key dengan normalisasi "numerik" tambahan (lihat key_index.py), jadi
+# key yang sama nilainya ("1000.0" dan 1000) selalu satu partisi; pencocokan key sesungguhnya tetap
+# memakai normalisasi yang dipilih. Dengan begitu hasilnya sama dengan mode in-memory berapa pun
+# jumlah partisi dan ukuran chunk-nya (hanya urutan baris yang berbeda; lihat
+# tests/test_gabung_stream.py).
+
+DEFAULT_CHUNKSIZE = 100_000
+DEFAULT_PARTITION_MB = 128
+
+def baca_chunks(path, pk, chunksize=DEFAULT_CHUNKSIZE, sheet=None):
+    """Baca file CSV/Excel per chunk tanpa memuat seluruh file ke memori."""
+    if str(path).endswith(".xlsx"):
+        yield from _baca_excel_chunks(path, pk, chunksize, sheet)
+    else:
+        yield from pd.read_csv(path, dtype={col: str for col in kolom_key(pk)}, chunksize=chunksize)
+
+def _baca_excel_chunks(path, pk, chunksize, sheet):
+    import openpyxl
+
+    wb = openpyxl.load_workbook(path, read_only=True, data_only=True)
+    try:
+        ws = wb[sheet] if sheet else wb.worksheets[0]
+        rows = ws.iter_rows(values_only=True)
+        header = next(rows, None)
+        if header is None:
+            return
+        batch = []
+        for row in rows:
+            batch.append(row)
+            if len(batch) >= chunksize:
+                yield _key_sebagai_teks(pd.DataFrame(batch, columns=header), pk)
+                batch = []
+        if batch:
+            yield _key_sebagai_teks(pd.DataFrame(batch, columns=header), pk)
+    finally:
+        wb.close()
+
+def _key_sebagai_teks(chunk, pk):
+    for col in kolom_key(pk):
+        keys = chunk[col]
+        chunk[col] = keys.astype(str).astype(object).where(keys.notna(), np.nan)
+    return chunk
+
+def baca_header(path, sheet=None):
+    """Daftar kolom file tanpa membaca isinya."""
+    if str(path).endswith(".xlsx"):
+        import openpyxl
+
+        wb = openpyxl.load_workbook(path, read_only=True)
+        try:
+            ws = wb[sheet] if sheet else wb.worksheets[0]
+            return list(next(ws.iter_rows(values_only=True), ()))
+        finally:
+            wb.close()
+    return pd.read_csv(path, nrows=0).columns.tolist()
+
+def jumlah_partisi(path1, path2, partition_mb=DEFAULT_PARTITION_MB):
+    """Perkirakan jumlah partisi agar satu partisi (kedua sisi) muat di memori."""
+    total = os.path.getsize(path1) + os.path.getsize(path2)
+    return max(1, math.ceil(total / (partition_mb * 1024 * 1024)))
+
+# Urutan pelebaran tipe kolom: gabungan dua tipe adalah tipe dengan urutan lebih tinggi; boolean
+# dan tanggal yang bercampur dengan tipe lain menjadi teks
+_KIND_ORDER = {"int": 0, "float": 1, "object": 2}
+
+def _skema_kosong():
+    return {"jenis": None, "kosong": False, "sampel": pd.Series([], dtype=object)}
+
+def _jenis_chunk(s):
+    """Tipe kolom satu chunk hasil inferensi pandas: int, float, bool, tanggal, object, atau None jika kosong."""
+    if s.dtype.kind in "iu":
+        return "int"
+    if s.dtype.kind == "b":
+        return "bool"
+    if s.dtype.kind == "M":
+        return "tanggal"
+    if s.dtype.kind == "f":
+        return "float" if s.notna().any() else None
+    inferred = pd.api.types.infer_dtype(s, skipna=True)
+    if inferred == "empty":
+        return None
+    return "bool" if inferred == "boolean" else "object"
+
+def _gabung_jenis(a, b):
+    if a is None or b is None or a == b:
+        return b if a is None else a
+    if a in _KIND_ORDER and b in _KIND_ORDER:
+        return max(a, b, key=_KIND_ORDER.get)
+    return "object"
+
+def _perbarui_skema(schema, chunk):
+    """Perbarui skema per kolom dengan satu chunk: jenis, ada nilai kosong, dan sampel
+    TYPE_SAMPLE_SIZE nilai pertama (untuk deteksi kolom tanggal, seperti gabung_engine.tampak_tanggal).
+    """
+    for col in chunk.columns:
+        values = chunk[col]
+        info = schema.setdefault(col, _skema_kosong())
+        info["jenis"] = _gabung_jenis(info["jenis"], _jenis_chunk(values))
+        info["kosong"] = info["kosong"] or bool(values.isna().any())
+        if len(info["sampel"]) < TYPE_SAMPLE_SIZE and values.dtype == object:
+            present = values.dropna()
+            info["sampel"] = pd.concat([info["sampel"], present.iloc[:TYPE_SAMPLE_SIZE - len(info["sampel"])]])
+
+def _jenis_perbandingan(schema1, schema2, columns1, columns2, pk1, pk2):
+    """Jenis perbandingan mode Bandingkan Semua Kolom per kolom Data 1, ditentukan dari seluruh file.
+
+    Kolom angka menurut skema dibandingkan sebagai angka; kolom tanggal, atau kolom teks yang
+    sampel nilai awalnya di kedua file terbaca sebagai tanggal, sebagai tanggal; selain itu teks.
+    """
+    kinds = {}
+    pairs = pasangan_kolom(pd.DataFrame(columns=columns1), pd.DataFrame(columns=columns2), pk1, pk2)
+    for col1, col2 in pairs:
+        info1, info2 = schema1[col1], schema2[col2]
+        if info1["jenis"] in (None, "int", "float") and info2["jenis"] in (None, "int", "float"):
+            kinds[col1] = "angka"
+        elif "tanggal" in (info1["jenis"], info2["jenis"]) or (
+                info1["jenis"] == info2["jenis"] == "object"
+                and tampak_tanggal(info1["sampel"]) and tampak_tanggal(info2["sampel"])):
+            kinds[col1] = "tanggal"
+        else:
+            kinds[col1] = "teks"
+    return kinds
+
+def _dtype_baca(schema):
+    """dtype read_csv per kolom partisi sesuai skema seluruh file."""
+    dtypes = {}
+    for col, info in schema.items():
+        kind, missing = info["jenis"], info["kosong"]
+        if kind is None or kind == "float" or (kind == "int" and missing):
+            dtypes[col] = np.float64
+        elif kind == "int":
+            dtypes[col] = np.int64
+        elif kind == "bool" and not missing:
+            dtypes[col] = bool
+        else:
+            dtypes[col] = str
+    return dtypes
+
+def _terapkan_skema(df, schema):
+    """Kolom boolean dengan nilai kosong dan kolom tanggal yang dibaca sebagai teks diubah ke tipenya."""
+    for col, info in schema.items():
+        if col not in df.columns:
+            continue
+        if info["jenis"] == "bool" and info["kosong"]:
+            # Seperti pandas: kolom boolean dengan nilai kosong menjadi object berisi True/False/NaN
+            df[col] = df[col].map({"True": True, "False": False}).astype(object)
+        elif info["jenis"] == "tanggal":
+            df[col] = pd.to_datetime(df[col], format="ISO8601")
+    return df
+
+def skema_file(path, chunksize=DEFAULT_CHUNKSIZE, sheet=None, progress=None):
+    """Skema tipe kolom seluruh file (lihat _perbarui_skema), dibaca per chunk."""
+    schema = {}
+    for chunk_no, chunk in enumerate(baca_chunks(path, [], chunksize=chunksize, sheet=sheet), start=1):
+        lapor(progress, 0.0, f"membaca tipe kolom: chunk {chunk_no}")
+        _perbarui_skema(schema, chunk)
+    for col in baca_header(path, sheet):
+        schema.setdefault(col, _skema_kosong())
+    return schema
+
+def baca_chunks_seragam(source, schema, chunksize=DEFAULT_CHUNKSIZE, sheet=None):
+    """Baca per chunk dengan tipe kolom dari skema seluruh file (skema_file).
+
+    Setiap chunk bertipe sama seperti file dibaca sekaligus, mis. kolom bilangan bulat yang
+    kosong di chunk lain tetap float di semua chunk.
+    """
+    dtypes = _dtype_baca(schema)
+    if not str(getattr(source, "name", source)).endswith(".xlsx"):
+        for chunk in pd.read_csv(source, dtype=dtypes, chunksize=chunksize):
+            yield _terapkan_skema(chunk, schema)
+        return
+    for chunk in _baca_excel_chunks(source, [], chunksize, sheet):
+        # Nilai sel Excel sudah bertipe; cukup samakan kolom angka, boolean dan tanggal
+        for col in chunk.columns:
+            if dtypes.get(col) is not str:
+                chunk[col] = chunk[col].astype(dtypes[col])
+            elif schema[col]["jenis"] == "tanggal":
+                chunk[col] = pd.to_datetime(chunk[col])
+        yield chunk
+
+def _partisi(chunk, pk, normalisasi, n_partitions):
+    hashes, _ = hash_kunci(chunk, pk, tuple(normalisasi) + ("numerik",))
+    return hashes % n_partitions
+
+def _spill(path, pk, spill_dir, prefix, n_partitions, chunksize, sheet, normalisasi=(), progress=None):
+    """Tulis setiap chunk ke file partisi berdasarkan hash key.
+
+    Mengembalikan (header kolom, skema tipe kolom seluruh file). Progress CSV diambil dari posisi
+    baca file; untuk Excel hanya nomor chunk yang dilaporkan.
+    """
+    schema = {}
+    is_excel = str(path).endswith(".xlsx")
+    file_size = max(os.path.getsize(path), 1)
+    with open(path, "rb") as handle:
+        source = path if is_excel else handle
+        for chunk_no, chunk in enumerate(baca_chunks(source, [], chunksize=chunksize, sheet=sheet), start=1):
+            fraction = 0.0 if is_excel else handle.tell() / file_size
+            lapor(progress, fraction, f"{prefix}: chunk {chunk_no}")
+            _perbarui_skema(schema, chunk)
+            _spill_chunk(chunk, pk, spill_dir, prefix, n_partitions, normalisasi)
+    columns = baca_header(path, sheet)
+    for col in columns:
+        schema.setdefault(col, _skema_kosong())
+    return columns, schema
+
+def _spill_chunk(chunk, pk, spill_dir, prefix, n_partitions, normalisasi):
+    part_ids = _partisi(chunk, pk, normalisasi, n_partitions)
+    for part, sub in chunk.groupby(part_ids, sort=False):
+        part_path = os.path.join(spill_dir, f"{prefix}_{part}.csv")
+        write_header = not os.path.exists(part_path)
+        sub.to_csv(part_path, mode="a", header=write_header, index=False)
+
+def _baca_partisi(spill_dir, prefix, part, columns, schema):
+    part_path = os.path.join(spill_dir, f"{prefix}_{part}.csv")
+    dtypes = _dtype_baca(schema)
+    if not os.path.exists(part_path):
+        df = pd.DataFrame({col: pd.Series(dtype=dtypes[col] if dtypes[col] is not str else object) for col in columns})
+        return _terapkan_skema(df, schema)
+    return _terapkan_skema(pd.read_csv(part_path, dtype=dtypes), schema)
+
+def _jenis_angka(s):
+    """"f" jika kolom hasil berisi desimal (selain NaN), "i" jika berisi bilangan bulat, selain itu None."""
+    if s.dtype.kind in "iu":
+        return "i"
+    if s.dtype.kind == "f":
+        return "f"
+    if s.dtype != object or pd.api.types.infer_dtype(s, skipna=True) in ("string", "boolean", "empty"):
+        return None
+    values = s.dropna()
+    if values.map(lambda v: isinstance(v, (float, np.floating))).any():
+        return "f"
+    if values.map(lambda v: isinstance(v, (int, np.integer)) and not isinstance(v, bool)).any():
+        return "i"
+    return None
+
+def _sebagai_desimal(s):
+    if s.dtype != object:
+        return s.astype(np.float64)
+    return s.map(lambda v: float(v) if isinstance(v, (int, np.integer)) and not isinstance(v, bool) else v)
+
+class HasilBertahap:
+    """Kumpulkan frame hasil per partisi/chunk (pickle di work_dir) lalu tulis sebagai satu CSV.
+
+    Jika dihitung sekaligus, kolom bilangan bulat menjadi desimal begitu satu baris mana pun berisi
+    desimal atau kosong; frame yang kolomnya hanya berisi bilangan bulat diubah sama saat ditulis.
+    """
+
+    def __init__(self, work_dir):
+        self.work_dir = work_dir
+        self.written = []  # (file pickle, kolom berisi bilangan bulat di frame itu)
+        self.float_columns = set()
+
+    def tambah(self, frame):
+        path = os.path.join(self.work_dir, f"hasil_{len(self.written)}.pkl")
+        frame.to_pickle(path)
+        kinds = {col: _jenis_angka(frame[col]) for col in frame.columns}
+        self.written.append((path, {col for col, kind in kinds.items() if kind == "i"}))
+        self.float_columns.update(col for col, kind in kinds.items() if kind == "f")
+
+    def tulis(self, output_path):
+        with open(output_path, "w", newline="", encoding="utf-8") as output:
+            for i, (path, int_columns) in enumerate(self.written):
+                frame = pd.read_pickle(path)
+                for col in int_columns & self.float_columns:
+                    frame[col] = _sebagai_desimal(frame[col])
+                frame.to_csv(output, header=i == 0, index=False)
+
+def file_pendamping_diff(output_path):
+    """File CSV pendamping mode Bandingkan Semua Kolom: (jumlah beda per kolom, daftar selisih)."""
+    base = os.path.splitext(output_path)[0]
+    return f"{base}_per_kolom.csv", f"{base}_selisih.csv"
+
+def rekonsiliasi_streaming(path1, path2, pk1, pk2, mode, output_path, cmp1=None, cmp2=None,
+                           selected_columns=None, sheet1=None, sheet2=None,
+                           chunksize=DEFAULT_CHUNKSIZE, n_partitions=None, spill_dir=None, normalisasi=(),
+                           kebijakan_duplikat="semua", toleransi_angka=NUMERIC_TOLERANCE,
+                           toleransi_tanggal=DATE_TOLERANCE, progress=None):
+    """Jalankan salah satu mode operasi pada file besar dan tulis hasilnya ke CSV secara bertahap.
+
+    Memori puncak dibatasi oleh ukuran satu partisi, bukan ukuran file. Urutan baris hasil
+    mengikuti partisi, bukan urutan Data 1. Mengembalikan ringkasan jumlah baris dan status.
+    pk1/pk2, normalisasi, kebijakan_duplikat dan toleransi (mode Bandingkan Semua Kolom) sama seperti
+    gabung_engine.jalankan_mode; semua baris satu key ada di partisi yang sama, jadi kebijakan
+    duplikat berlaku seperti di memori (batas ukuran hasil diperiksa per partisi). Mode Bandingkan
+    Semua Kolom juga menulis jumlah beda per kolom dan daftar selisih ke file_pendamping_diff.
+    Jika dibatalkan lewat progress (JobCancelled), file output yang belum lengkap dihapus.
+    """
+    if mode not in MODES:
+        raise ValueError(f"Mode tidak dikenal: {mode}")
+    if mode in VALIDATION_MODES and (cmp1 is None or cmp2 is None):
+        raise ValueError("Mode validasi membutuhkan cmp1 dan cmp2.")
+    if n_partitions is None:
+        n_partitions = jumlah_partisi(path1, path2)
+
+    outputs = [output_path]
+    work_dir = tempfile.mkdtemp(prefix="rekonsiliasi_", dir=spill_dir)
+    try:
+        if len(kolom_key(pk1)) != len(kolom_key(pk2)):
+            raise ValueError("Jumlah kolom key Data 1 dan Data 2 harus sama.")
+        columns1, schema1 = _spill(path1, pk1, work_dir, "data1", n_partitions, chunksize, sheet1, normalisasi,
+                          bagian(progress, 0.0, 0.3))
+        columns2, schema2 = _spill(path2, pk2, work_dir, "data2", n_partitions, chunksize, sheet2, normalisasi,
+                          bagian(progress, 0.3, 0.6))
+        jenis = _jenis_perbandingan(schema1, schema2, columns1, columns2, pk1, pk2) if mode == DIFF_MODE else None
+        if mode == "Gabung & Validasi" and selected_columns is None:
+            selected_columns = kolom_nama_sama(pd.DataFrame(columns=columns1), pd.DataFrame(columns=columns2))
+
+        output_columns = None
+        total_rows = 0
+        status_counts = {}
+        results = HasilBertahap(work_dir)
+        if mode == DIFF_MODE:
+            # Jumlah beda per kolom dijumlahkan lintas partisi; persentase dihitung di akhir
+            pairs = pasangan_kolom(pd.DataFrame(columns=columns1), pd.DataFrame(columns=columns2), pk1, pk2)
+            diff_summary = pd.DataFrame({"Kolom Data 1": [col1 for col1, _ in pairs],
+                                         "Kolom Data 2": [col2 for _, col2 in pairs],
+                                         "Tipe": [jenis[col1] for col1, _ in pairs],
+                                         "Jumlah Beda": np.zeros(len(pairs), dtype=np.int64)})
+            matched_rows = 0
+            diffs = HasilBertahap(tempfile.mkdtemp(prefix="selisih_", dir=work_dir))
+            outputs += file_pendamping_diff(output_path)
+        for path in outputs:
+            if os.path.exists(path):
+                os.remove(path)
+        for part in range(n_partitions):
+            lapor(progress, 0.6 + 0.4 * part / n_partitions, f"partisi {part + 1}/{n_partitions}")
+            p1 = _baca_partisi(work_dir, "data1", part, columns1, schema1)
+            p2 = _baca_partisi(work_dir, "data2", part, columns2, schema2)
+            if p1.empty and p2.empty:
+                continue
+            result = jalankan_mode(mode, p1, p2, pk1, pk2, cmp1, cmp2, selected_columns, normalisasi=normalisasi,
+                                   kebijakan_duplikat=kebijakan_duplikat, jenis_kolom=jenis,
+                                   toleransi_angka=toleransi_angka, toleransi_tanggal=toleransi_tanggal)
+            if mode == DIFF_MODE:
+                result, part_summary, part_diffs = result
+                diff_summary["Jumlah Beda"] += part_summary["Jumlah Beda"].to_numpy()
+                matched_rows += int(result["Status"].isin(["Beda", "Sama"]).sum())
+                if not part_diffs.empty:
+                    diffs.tambah(part_diffs)
+            if result.empty:
+                continue
+            if output_columns is None:
+                output_columns = urutan_kolom(result, columns1, mode, cmp1, cmp2)
+            result = result.reindex(columns=output_columns)
+            results.tambah(result)
+            total_rows += len(result)
+            if "Status" in result.columns:
+                for status, count in result["Status"].value_counts().items():
+                    status_counts[status] = status_counts.get(status, 0) + int(count)
+        results.tulis(output_path)
+        summary = {"output": output_path, "rows": total_rows, "status_counts": status_counts,
+                   "partitions": n_partitions}
+        if mode == DIFF_MODE:
+            diff_summary["Persen Beda"] = np.round(100 * diff_summary["Jumlah Beda"] / max(matched_rows, 1), 2)
+            diff_summary.to_csv(outputs[1], index=False)
+            if diffs.written:
+                diffs.tulis(outputs[2])
+            else:
+                pd.DataFrame(columns=kolom_key(pk1) + ["Kolom", "Nilai Data 1", "Nilai Data 2"]).to_csv(
+                    outputs[2], index=False)
+            summary.update(summary_output=outputs[1], diff_output=outputs[2])
+        return summary
+    except JobCancelled:
+        for path in outputs:
+            if os.path.exists(path):
+                os.remove(path)
+        raise
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
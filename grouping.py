@@ -0,0 +1,65 @@
+import numpy as np
+import pandas as pd
+
+# ---------------------------
+# Group By Berbasis Indeks Baris
+# ---------------------------
+# Kelompok disimpan sebagai posisi baris (hasil argsort kode faktorisasi), bukan salinan
+# DataFrame. Data satu kelompok baru diambil dengan df.iloc[posisi] saat ditampilkan atau
+# ditulis ke file.
+
+GROUP_AGGREGATES = ["sum", "mean", "min", "max"]
+
+class GroupIndex:
+    """Posisi baris per nilai kelompok. Nilai kosong (NaN) tidak masuk kelompok mana pun, seperti groupby."""
+
+    def __init__(self, values, base_positions=None):
+        try:
+            codes, uniques = pd.factorize(values, sort=True)
+        except TypeError:
+            codes, uniques = pd.factorize(values)  # tipe campuran tidak bisa diurutkan
+        counts = np.bincount(codes[codes >= 0], minlength=len(uniques))
+        order = np.argsort(codes, kind="stable")[len(codes) - counts.sum():]
+        self.keys = list(uniques)
+        self.codes = codes
+        self.offsets = np.concatenate([[0], np.cumsum(counts)])
+        # Untuk kelompok tingkat kedua, posisi dipetakan kembali ke posisi baris frame asal
+        self.order = order if base_positions is None else np.asarray(base_positions)[order]
+
+    def __len__(self):
+        return len(self.keys)
+
+    def sizes(self):
+        return np.diff(self.offsets)
+
+    def positions(self, i):
+        return self.order[self.offsets[i]:self.offsets[i + 1]]
+
+    def frame(self, df, i):
+        return df.iloc[self.positions(i)]
+
+    def sub_index(self, df, i, column):
+        """Kelompok tingkat kedua di dalam kelompok ke-i berdasarkan kolom lain."""
+        positions = self.positions(i)
+        return GroupIndex(df[column].to_numpy()[positions], base_positions=positions)
+
+def jumlah_halaman(index, per_page):
+    """Jumlah halaman tampilan kelompok; minimal satu walau tidak ada kelompok."""
+    return max(1, -(-len(index) // per_page))
+
+def kelompok_halaman(index, page, per_page):
+    """Nomor kelompok pada halaman page (dimulai dari 1); halaman di luar rentang dibatasi."""
+    page = min(max(int(page), 1), jumlah_halaman(index, per_page))
+    return range((page - 1) * per_page, min(page * per_page, len(index)))
+
+def ringkasan_kelompok(df, column, index):
+    """Tabel ringkasan: jumlah baris dan agregat kolom numerik per kelompok."""
+    summary = pd.DataFrame({column: index.keys, "Jumlah Baris": index.sizes()})
+    numeric = df.select_dtypes(include="number").drop(columns=[column], errors="ignore")
+    if len(numeric.columns) and len(index):
+        codes = np.where(index.codes >= 0, index.codes, np.nan)
+        aggregated = numeric.groupby(codes).agg(GROUP_AGGREGATES)
+        aggregated = aggregated.reindex(np.arange(len(index)))
+        aggregated.columns = [f"{col} ({agg})" for col, agg in aggregated.columns]
+        summary = pd.concat([summary, aggregated.reset_index(drop=True)], axis=1)
+    return summary
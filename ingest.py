@@ -0,0 +1,132 @@
+import hashlib
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+import pandas as pd
+
+from file_cache import cached_frame, file_fingerprint, read_cached
+from gabung_engine import clean_column_name
+from jobs import bagian, lapor
+
+# ---------------------------
+# Gabung Banyak Sheet / File (Ingestion)
+# ---------------------------
+# Satu dataset boleh berasal dari beberapa sumber: beberapa sheet satu workbook (mis. satu sheet
+# per bulan) atau beberapa file CSV/Excel (mis. satu file per hari). Sumber = pasangan (file, sheet);
+# sheet None untuk CSV. Sumber yang belum ada di cache file diparse paralel di process pool
+# (parsing xlsx/CSV tertahan GIL, jadi thread tidak membantu). Kolom disamakan dengan
+# clean_column_name ("Kode Pos" = "kode_pos"), lalu semua sumber digabung dengan kolom SOURCE_COLUMN
+# berisi asal setiap baris. Dataset dengan satu sumber dikembalikan apa adanya, tanpa kolom sumber.
+
+SOURCE_COLUMN = "Sumber"
+INGEST_WORKERS = min(4, os.cpu_count() or 1)
+
+def _nama_file(file):
+    return os.path.basename(str(getattr(file, "name", file)))
+
+def _isi_file(file):
+    """Isi file yang bisa dikirim ke proses lain: bytes untuk upload Streamlit, path apa adanya."""
+    return file.getvalue() if hasattr(file, "getvalue") else file
+
+def label_sumber(file, sheet=None):
+    name = _nama_file(file)
+    return name if sheet is None else f"{name} [{sheet}]"
+
+def sidik_jari_sumber(sources):
+    """Sidik jari isi semua sumber; untuk satu sumber sama dengan file_fingerprint(file, sheet)."""
+    fingerprints = [file_fingerprint(file, sheet) for file, sheet in sources]
+    if len(fingerprints) == 1:
+        return fingerprints[0]
+    return hashlib.blake2b("|".join(fingerprints).encode("utf-8"), digest_size=20).hexdigest()
+
+def _baca_satu(data, name, sheet):
+    return read_cached(data, sheet, name=name)
+
+def baca_sumber(sources, workers=INGEST_WORKERS, progress=None):
+    """DataFrame per sumber (file, sheet), sesuai urutan sources."""
+    frames = [cached_frame(file, sheet, _nama_file(file)) for file, sheet in sources]
+    missing = [i for i, df in enumerate(frames) if df is None]
+    if len(missing) <= 1 or workers <= 1:
+        for done, i in enumerate(missing, 1):
+            file, sheet = sources[i]
+            frames[i] = read_cached(file, sheet, name=_nama_file(file))
+            lapor(progress, done / len(missing), f"membaca {label_sumber(file, sheet)}")
+        return frames
+
+    # spawn, bukan fork: proses Streamlit punya banyak thread yang tidak aman untuk di-fork
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=min(workers, len(missing)), mp_context=context) as pool:
+        futures = {pool.submit(_baca_satu, _isi_file(sources[i][0]), _nama_file(sources[i][0]), sources[i][1]): i
+                   for i in missing}
+        try:
+            for done, future in enumerate(as_completed(futures), 1):
+                i = futures[future]
+                frames[i] = future.result()
+                lapor(progress, done / len(missing), f"membaca {label_sumber(*sources[i])}")
+        except BaseException:
+            for future in futures:
+                future.cancel()
+            raise
+    return frames
+
+def _kunci_kolom(columns):
+    """Kunci penyelarasan per kolom: nama bersih, atau nama asli jika nama bersih kosong/bentrok."""
+    keys, seen = [], set()
+    for col in columns:
+        key = clean_column_name(str(col))
+        if not key or key in seen:
+            key = ("", col)
+        seen.add(key)
+        keys.append(key)
+    return keys
+
+def selaraskan_kolom(frames):
+    """Samakan nama kolom semua frame; kolom dengan nama bersih sama dianggap satu kolom.
+
+    Nama yang dipakai adalah nama di frame pertama yang memiliki kolom tersebut. Mengembalikan
+    (frame yang sudah diganti nama, daftar kolom gabungan sesuai urutan kemunculan pertama).
+    """
+    canonical = {}
+    renamed = []
+    for df in frames:
+        mapping = {col: canonical.setdefault(key, col) for col, key in zip(df.columns, _kunci_kolom(df.columns))}
+        changed = {col: new for col, new in mapping.items() if col != new}
+        renamed.append(df.rename(columns=changed) if changed else df)
+    return renamed, list(canonical.values())
+
+def _label_unik(labels):
+    used, result = set(), []
+    for label in labels:
+        name, counter = label, 1
+        while name in used:
+            counter += 1
+            name = f"{label} ({counter})"
+        used.add(name)
+        result.append(name)
+    return result
+
+def gabung_sumber(sources, workers=INGEST_WORKERS, source_column=SOURCE_COLUMN, progress=None):
+    """Baca semua sumber lalu gabungkan menjadi satu DataFrame dengan kolom asal baris di akhir.
+
+    Kolom yang tidak ada di suatu sumber diisi NaN. Jika nama source_column sudah dipakai data,
+    nama kolom sumber diberi akhiran angka.
+    """
+    sources = list(sources)
+    if not sources:
+        raise ValueError("Pilih minimal satu file atau sheet.")
+    frames = baca_sumber(sources, workers, bagian(progress, 0.0, 0.9))
+    if len(frames) == 1:
+        return frames[0]
+    lapor(progress, 0.9, "menyamakan kolom dan menggabungkan sumber")
+    frames, columns = selaraskan_kolom(frames)
+    result = pd.concat(frames, ignore_index=True, sort=False).reindex(columns=columns)
+    name, counter = source_column, 1
+    while name in result.columns:
+        counter += 1
+        name = f"{source_column}_{counter}"
+    labels = np.array(_label_unik([label_sumber(file, sheet) for file, sheet in sources]), dtype=object)
+    result[name] = np.repeat(labels, [len(df) for df in frames])
+    lapor(progress, 1.0)
+    return result
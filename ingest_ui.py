@@ -0,0 +1,23 @@
+import streamlit as st
+
+from file_cache import sheet_names
+
+# ---------------------------
+# Pilih Sheet / File: Komponen Streamlit
+# ---------------------------
+# Pasangan file_uploader(accept_multiple_files=True): setiap workbook mendapat multiselect sheet
+# (bawaan sheet pertama), CSV selalu dipakai utuh. Hasilnya daftar sumber (file, sheet) untuk
+# ingest.gabung_sumber.
+
+def pilih_sumber(files, key, label="Pilih sheet", container=st):
+    """Daftar sumber (file, sheet) dari file yang diunggah; sheet None untuk CSV."""
+    sources = []
+    for i, file in enumerate(files):
+        if not file.name.endswith(".xlsx"):
+            sources.append((file, None))
+            continue
+        sheets = sheet_names(file)
+        text = label if len(files) == 1 else f"{label} ({file.name})"
+        chosen = container.multiselect(text, sheets, default=sheets[:1], key=f"{key}_{i}_{file.name}")
+        sources.extend((file, sheet) for sheet in chosen)
+    return sources
@@ -0,0 +1,99 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+
+# ---------------------------
+# Job Latar Belakang
+# ---------------------------
+# Operasi panjang (mode gabung, langkah cleaning, ekspor) dijalankan di thread pool agar
+# script Streamlit tidak tertahan. Fungsi yang dijalankan menerima argumen progress dan
+# memanggil progress(fraksi, pesan) di setiap batas chunk; pembatalan bersifat kooperatif:
+# panggilan progress berikutnya setelah job dibatalkan melempar JobCancelled.
+# Thread dipakai (bukan proses) agar DataFrame besar tidak perlu di-pickle bolak-balik.
+# Aplikasi Streamlit memberi setiap sesi pool sendiri (buat_pool) agar job satu pengguna tidak
+# mengantre di belakang job pengguna lain; pool bersama hanya dipakai jika pool tidak diberikan.
+
+MAX_WORKERS = 4
+
+_executor = ThreadPoolExecutor(max_workers=MAX_WORKERS, thread_name_prefix="job")
+
+def buat_pool(max_workers=MAX_WORKERS):
+    """Thread pool baru untuk satu sesi; thread-nya berhenti setelah pool tidak dipakai lagi."""
+    return ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="job")
+
+class JobCancelled(Exception):
+    """Dilempar di dalam job yang dibatalkan, pada pemanggilan progress berikutnya."""
+
+def lapor(progress, fraction, message=None):
+    """Panggil progress jika ada; dipakai modul lain agar progress tetap opsional."""
+    if progress is not None:
+        progress(fraction, message)
+
+def bagian(progress, start, end):
+    """Callback progress untuk sub-tahap yang menempati rentang [start, end] dari progress induk."""
+    if progress is None:
+        return None
+    return lambda fraction, message=None: progress(start + (end - start) * fraction, message)
+
+class Job:
+    """Satu pemanggilan fungsi di thread pool beserta progress dan status pembatalannya."""
+
+    def __init__(self, fn, *args, pool=None, **kwargs):
+        self.progress = 0.0
+        self.message = None
+        self.started = None
+        self.seconds = None
+        self._cancel = threading.Event()
+        self.future = (pool or _executor).submit(self._jalankan, fn, args, kwargs)
+
+    def _jalankan(self, fn, args, kwargs):
+        self.started = time.time()
+        start = time.perf_counter()
+        try:
+            self._lapor(0.0)
+            return fn(*args, progress=self._lapor, **kwargs)
+        finally:
+            self.seconds = time.perf_counter() - start
+
+    def _lapor(self, fraction, message=None):
+        if self._cancel.is_set():
+            raise JobCancelled()
+        self.progress = min(max(float(fraction), 0.0), 1.0)
+        if message is not None:
+            self.message = message
+
+    def batalkan(self):
+        """Minta job berhenti; job yang belum mulai langsung dibatalkan."""
+        self._cancel.set()
+        self.future.cancel()
+
+    def done(self):
+        return self.future.done()
+
+    def menunggu(self):
+        """True selama job masih mengantre karena semua thread pool sedang dipakai."""
+        return self.started is None and not self.done()
+
+    def tunggu(self, timeout=None):
+        """Tunggu job selesai paling lama timeout detik; True jika sudah selesai."""
+        return bool(wait([self.future], timeout=timeout).done)
+
+    def cancelled(self):
+        """True jika job dibatalkan, baik sebelum maupun sesudah mulai berjalan."""
+        return self.future.cancelled() or (self.done() and isinstance(self.future.exception(), JobCancelled))
+
+    def exception(self):
+        """Error job yang selesai dengan gagal (bukan karena dibatalkan), atau None."""
+        if self.cancelled():
+            return None
+        return self.future.exception()
+
+    def result(self):
+        return self.future.result()
+
+    def add_done_callback(self, fn):
+        self.future.add_done_callback(lambda future: fn(self))
+
+def jalankan(fn, *args, pool=None, **kwargs):
+    """Mulai fn(*args, progress=..., **kwargs) di thread pool (default: pool bersama) dan kembalikan Job-nya."""
+    return Job(fn, *args, pool=pool, **kwargs)
@@ -0,0 +1,71 @@
+import streamlit as st
+
+from jobs import buat_pool, jalankan
+
+# ---------------------------
+# Job Latar Belakang: Komponen Streamlit
+# ---------------------------
+# Setiap job disimpan di st.session_state[job_key] bersama signature konfigurasinya. Selama
+# signature sama, hasil job dipakai ulang pada setiap rerun (mis. saat filter tampilan diubah),
+# dan job yang masih berjalan dilanjutkan, bukan diulang dari awal. Progress diperbarui oleh
+# fragment kecil tanpa menjalankan ulang seluruh script.
+
+# Job cepat ditunggu sebentar agar hasilnya langsung tampil tanpa progress bar yang berkedip
+JOB_INLINE_SECONDS = 0.5
+JOB_POLL_SECONDS = 0.5
+
+def pool_sesi():
+    """Thread pool milik sesi ini, dibuat saat job pertama dijalankan."""
+    if "job_pool" not in st.session_state:
+        st.session_state.job_pool = buat_pool()
+    return st.session_state.job_pool
+
+def batalkan(job_key):
+    job = st.session_state.pop(job_key, {}).get("job")
+    if job is not None:
+        job.batalkan()
+
+@st.fragment(run_every=JOB_POLL_SECONDS)
+def tampilkan_progress(job_key, label):
+    """Progress bar dan tombol Batalkan untuk job di st.session_state[job_key]["job"]."""
+    entry = st.session_state.get(job_key)
+    if entry is None or entry["job"].done():
+        st.rerun()
+    job = entry["job"]
+    if job.menunggu():
+        text = f"{label}: menunggu job lain selesai"
+    else:
+        text = f"{label}: {job.progress:.0%}" + (f" ({job.message})" if job.message else "")
+    st.progress(job.progress, text=text)
+    if st.button("Batalkan", key=f"{job_key}_cancel"):
+        job.batalkan()
+        st.rerun()
+
+def hasil_job(job_key, signature, fn, *args, label="Memproses", **kwargs):
+    """Hasil fn(*args, **kwargs) untuk signature ini, atau None jika belum tersedia.
+
+    Job baru dimulai jika belum ada job dengan signature yang sama; job lama dengan signature
+    berbeda dibatalkan. Selama job berjalan, progress dan tombol Batalkan ditampilkan. Error
+    dari fn dilempar ulang seperti saat fn dipanggil langsung.
+    """
+    entry = st.session_state.get(job_key)
+    if entry is not None and entry["signature"] != signature:
+        batalkan(job_key)
+        entry = None
+    if entry is None:
+        entry = {"job": jalankan(fn, *args, pool=pool_sesi(), **kwargs), "signature": signature}
+        st.session_state[job_key] = entry
+    job = entry["job"]
+    if not job.tunggu(JOB_INLINE_SECONDS):
+        tampilkan_progress(job_key, label)
+        return None
+    if job.cancelled():
+        st.warning(f"{label} dibatalkan.")
+        if st.button("Jalankan ulang", key=f"{job_key}_restart"):
+            st.session_state.pop(job_key, None)
+            st.rerun()
+        return None
+    if job.exception() is not None:
+        st.session_state.pop(job_key, None)
+        raise job.exception()
+    return job.result()
@@ -0,0 +1,200 @@
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+# ---------------------------
+# Indeks Key (Primary Key Gabungan & Dinormalisasi)
+# ---------------------------
+# Key satu baris = satu atau beberapa kolom setelah dinormalisasi. Setiap bagian key di-hash
+# ke uint64 lalu digabung, sehingga key beberapa kolom cukup dibandingkan sebagai satu array
+# angka. Indeks dibangun sekali per dataset dan konfigurasi key, lalu dipakai semua mode.
+# Angka dibandingkan berdasarkan nilainya (1 = 1.0), teks tidak pernah sama dengan angka kecuali
+# normalisasi "numerik" dipakai. Peluang dua key berbeda mendapat hash 64 bit yang sama
+# dapat diabaikan untuk ukuran data di sini.
+
+NORMALIZATIONS = {
+    "trim": "Hapus spasi di awal/akhir",
+    "casefold": "Abaikan huruf besar/kecil",
+    "nol_depan": "Hapus nol di depan angka (00123 = 123)",
+    "numerik": "Teks angka sama dengan angka (\"12.0\" = 12)",
+}
+KEY_INDEX_CACHE_ENTRIES = 8
+
+_MISSING_HASH = np.uint64(0x9E3779B97F4A7C15)
+_FLOAT_SALT = np.uint64(0x5851F42D4C957F2D)
+_STRING_SALT = np.uint64(0x14057B7EF767814F)
+_OTHER_SALT = np.uint64(0x2545F4914F6CDD1D)
+_COMBINE_PRIME = np.uint64(1099511628211)
+
+def kolom_key(pk):
+    """Daftar kolom key; pk boleh satu nama kolom atau list/tuple nama kolom."""
+    return list(pk) if isinstance(pk, (list, tuple)) else [pk]
+
+def _hash_angka(values):
+    values = np.asarray(values)
+    if values.dtype.kind in "iu":
+        return pd.util.hash_array(values.astype(np.int64, copy=False))
+    floats = values.astype(np.float64)
+    with np.errstate(invalid="ignore"):
+        integral = np.isfinite(floats) & (np.floor(floats) == floats) & (np.abs(floats) < 2.0 ** 63)
+    hashes = np.empty(len(floats), dtype=np.uint64)
+    hashes[integral] = pd.util.hash_array(floats[integral].astype(np.int64))
+    hashes[~integral] = pd.util.hash_array(floats[~integral]) ^ _FLOAT_SALT
+    return hashes
+
+def _normalisasi_teks(texts, normalisasi):
+    texts = pd.Series(texts, dtype=object)
+    if "trim" in normalisasi:
+        texts = texts.str.strip()
+    if "casefold" in normalisasi:
+        texts = texts.str.casefold()
+    if "nol_depan" in normalisasi:
+        texts = texts.str.replace(r"^0+(?=\d)", "", regex=True)
+    return texts.to_numpy(dtype=object)
+
+def hash_kolom(s, normalisasi=()):
+    """(hash uint64, mask kosong) untuk satu kolom key setelah dinormalisasi."""
+    if isinstance(s.dtype, pd.CategoricalDtype):
+        s = s.astype(object)
+    missing = s.isna().to_numpy()
+    if pd.api.types.is_numeric_dtype(s.dtype):
+        if s.dtype.kind in "iu" and not missing.any():
+            return _hash_angka(s.to_numpy()), missing
+        return _hash_angka(s.to_numpy(dtype=np.float64, na_value=np.nan)), missing
+    if s.dtype.kind in "mM":
+        return pd.util.hash_array(s.to_numpy()) ^ _OTHER_SALT, missing
+
+    values = s.to_numpy(dtype=object)
+    hashes = np.full(len(values), _MISSING_HASH, dtype=np.uint64)
+    kind = pd.api.types.infer_dtype(values, skipna=True)
+    if kind == "string":
+        is_text, is_number = ~missing, np.zeros(len(values), dtype=bool)
+    else:
+        is_text = np.fromiter((isinstance(v, str) for v in values), dtype=bool, count=len(values))
+        is_number = np.fromiter((isinstance(v, (int, float, np.number)) for v in values), dtype=bool,
+                                count=len(values)) & ~missing
+    if is_text.any():
+        texts = _normalisasi_teks(values[is_text], normalisasi)
+        text_hashes = pd.util.hash_array(texts) ^ _STRING_SALT
+        if "numerik" in normalisasi:
+            numbers = pd.to_numeric(pd.Series(texts), errors="coerce").to_numpy(dtype=np.float64)
+            parsed = ~np.isnan(numbers)
+            text_hashes[parsed] = _hash_angka(numbers[parsed])
+        hashes[is_text] = text_hashes
+    if is_number.any():
+        hashes[is_number] = _hash_angka(values[is_number].astype(np.float64))
+    other = ~(is_text | is_number | missing)
+    if other.any():
+        hashes[other] = pd.util.hash_array(values[other].astype(str).astype(object)) ^ _OTHER_SALT
+    return hashes, missing
+
+def hash_kunci(df, columns, normalisasi=()):
+    """(hash uint64 per baris, mask key valid) untuk key satu atau beberapa kolom.
+
+    Key dengan salah satu bagian kosong tidak valid, tetapi tetap punya hash sendiri agar
+    operasi yang menyamakan key kosong (isin, outer join) tetap konsisten dengan pandas.
+    """
+    hashes = None
+    valid = np.ones(len(df), dtype=bool)
+    for col in kolom_key(columns):
+        part, missing = hash_kolom(df[col], normalisasi)
+        part = np.where(missing, _MISSING_HASH, part)
+        valid &= ~missing
+        hashes = part if hashes is None else (hashes * _COMBINE_PRIME) ^ part
+    if hashes is None:
+        raise ValueError("Key harus terdiri dari minimal satu kolom.")
+    return hashes, valid
+
+def _teks_kolom(s):
+    if isinstance(s.dtype, pd.CategoricalDtype):
+        s = s.astype(object)
+    texts = s.astype(str).to_numpy(dtype=object)
+    if pd.api.types.is_float_dtype(s.dtype):
+        # 12.0 ditulis "12" agar sama dengan key bilangan bulat di data lain
+        values = s.to_numpy(dtype=np.float64, na_value=np.nan)
+        with np.errstate(invalid="ignore"):
+            integral = np.isfinite(values) & (np.floor(values) == values) & (np.abs(values) < 2.0 ** 63)
+        texts[integral] = values[integral].astype(np.int64).astype(str).astype(object)
+    texts[s.isna().to_numpy()] = ""
+    return texts
+
+def teks_kunci(df, columns, normalisasi=()):
+    """Teks key per baris setelah dinormalisasi, bagian key dipisah spasi (untuk pencocokan mirip)."""
+    parts = [_normalisasi_teks(_teks_kolom(df[col]), normalisasi) for col in kolom_key(columns)]
+    if len(parts) == 1:
+        return parts[0]
+    return pd.Series(parts[0]).str.cat(parts[1:], sep=" ").to_numpy(dtype=object)
+
+class KeyIndex:
+    """Hash key semua baris satu dataset, plus posisi baris pertama per key untuk pencarian."""
+
+    def __init__(self, df, columns, normalisasi=()):
+        self.columns = kolom_key(columns)
+        self.normalisasi = tuple(normalisasi)
+        self.hashes, self.valid = hash_kunci(df, self.columns, self.normalisasi)
+        self._first = None
+        self._counts = None
+
+    def __len__(self):
+        return len(self.hashes)
+
+    def ambil(self, positions):
+        """KeyIndex untuk baris pada positions saja, tanpa menghitung ulang hash."""
+        index = KeyIndex.__new__(KeyIndex)
+        index.columns, index.normalisasi = self.columns, self.normalisasi
+        index.hashes, index.valid = self.hashes[positions], self.valid[positions]
+        index._first = index._counts = None
+        return index
+
+    def jumlah_per_key(self):
+        """(Index hash unik, jumlah baris, mask key valid) untuk semua hash, termasuk key kosong."""
+        if self._counts is None:
+            codes, uniques = pd.factorize(self.hashes)
+            valid = np.zeros(len(uniques), dtype=bool)
+            valid[codes[self.valid]] = True
+            self._counts = (pd.Index(uniques), np.bincount(codes, minlength=len(uniques)), valid)
+        return self._counts
+
+    def posisi_pertama(self):
+        """(Index hash unik, posisi baris pertama) untuk key yang valid."""
+        if self._first is None:
+            valid_positions = np.flatnonzero(self.valid)
+            unique, first = np.unique(self.hashes[valid_positions], return_index=True)
+            self._first = (pd.Index(unique), valid_positions[first])
+        return self._first
+
+    def cari(self, hashes, valid):
+        """Posisi baris pertama di indeks ini untuk setiap hash; -1 jika tidak ada atau key tidak valid."""
+        index, first = self.posisi_pertama()
+        if not len(index):
+            return np.full(len(hashes), -1, dtype=np.intp)
+        pos = index.get_indexer(hashes)
+        return np.where((pos >= 0) & valid, first[pos], -1)
+
+    def ada_di(self, other):
+        """Mask baris yang key-nya juga ada di other; key kosong sama dengan key kosong seperti Series.isin."""
+        return pd.Series(self.hashes).isin(other.hashes).to_numpy()
+
+class KeyIndexCache:
+    """Cache LRU KeyIndex per (kunci dataset, kolom key, normalisasi); aman dipakai dari beberapa thread."""
+
+    def __init__(self, max_entries=KEY_INDEX_CACHE_ENTRIES):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def ambil(self, dataset_key, df, columns, normalisasi=()):
+        cache_key = (dataset_key, tuple(kolom_key(columns)), tuple(normalisasi))
+        with self._lock:
+            index = self._entries.get(cache_key)
+            if index is not None:
+                self._entries.move_to_end(cache_key)
+                return index
+        index = KeyIndex(df, columns, normalisasi)
+        with self._lock:
+            self._entries[cache_key] = index
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return index
@@ -0,0 +1,119 @@
+from collections import OrderedDict
+
+import numpy as np
+import pyarrow as pa
+import streamlit as st
+
+from grouping import GroupIndex
+
+# ---------------------------
+# Preview Data Berhalaman
+# ---------------------------
+# Hanya jendela baris yang terlihat yang dikirim ke browser. Pengurutan, paging, dan sampel
+# dihitung di server; urutan hasil sort dan halaman yang sudah dikonversi ke Arrow disimpan
+# di session_state sehingga rerun dengan tampilan yang sama tidak menghitung ulang.
+
+PAGE_SIZES = [100, 500, 1000, 5000]
+SAMPLE_SIZE = 500
+PREVIEW_CACHE_ENTRIES = 32
+VIEWS = ["Halaman", "Sampel acak", "Sampel terstratifikasi"]
+ORIGINAL_ORDER = "(urutan asli)"
+
+def _cache():
+    if "preview_cache" not in st.session_state:
+        st.session_state.preview_cache = OrderedDict()
+    return st.session_state.preview_cache
+
+def _cached(key, compute):
+    cache = _cache()
+    if key in cache:
+        cache.move_to_end(key)
+        return cache[key]
+    value = compute()
+    cache[key] = value
+    while len(cache) > PREVIEW_CACHE_ENTRIES:
+        cache.popitem(last=False)
+    return value
+
+def urutan_sort(df, column, ascending):
+    """Posisi baris setelah diurutkan (stabil, kosong di akhir); kolom bertipe campuran diurutkan sebagai teks."""
+    s = df[column].reset_index(drop=True)
+    try:
+        order = s.sort_values(ascending=ascending, kind="stable", na_position="last")
+    except TypeError:
+        order = s.where(s.isna(), s.astype(str)).sort_values(ascending=ascending, kind="stable", na_position="last")
+    return order.index.to_numpy()
+
+def sampel_acak(n_rows, size, seed):
+    rng = np.random.default_rng(seed)
+    return np.sort(rng.choice(n_rows, size=min(size, n_rows), replace=False))
+
+def sampel_terstratifikasi(df, column, size, seed):
+    """Sampel proporsional per nilai kolom; setiap nilai mendapat minimal satu baris."""
+    rng = np.random.default_rng(seed)
+    index = GroupIndex(df[column].to_numpy())
+    sizes = index.sizes()
+    if not len(index):
+        return np.empty(0, dtype=np.int64)
+    quota = np.minimum(sizes, np.maximum(1, np.round(size * sizes / sizes.sum()).astype(int)))
+    picked = [rng.choice(index.positions(i), size=quota[i], replace=False) for i in range(len(index))]
+    return np.sort(np.concatenate(picked))
+
+def _to_arrow(page):
+    # Halaman disimpan sebagai tabel Arrow agar konversi pandas -> Arrow tidak diulang tiap rerun
+    try:
+        return pa.Table.from_pandas(page, preserve_index=True)
+    except (pa.ArrowInvalid, pa.ArrowTypeError, ValueError):
+        return page  # kolom bertipe campuran: biarkan Streamlit yang mengonversi
+
+def tampilkan_preview(df, key, frame_key, height="auto"):
+    """Tampilkan df per halaman atau sebagai sampel.
+
+    frame_key harus berubah setiap kali isi df berubah (mis. kunci Pipeline), karena dipakai
+    sebagai kunci cache halaman.
+    """
+    n_rows = len(df)
+    if n_rows <= PAGE_SIZES[0]:
+        st.dataframe(df, height=height)
+        return
+
+    view = st.radio("Tampilan", VIEWS, horizontal=True, key=f"{key}_view")
+    if view == "Halaman":
+        col1, col2, col3, col4 = st.columns(4)
+        page_size = col1.selectbox("Baris per halaman", PAGE_SIZES, key=f"{key}_page_size")
+        n_pages = -(-n_rows // page_size)
+        page_key = f"{key}_page"
+        if st.session_state.get(page_key, 1) > n_pages:
+            st.session_state[page_key] = n_pages  # jumlah baris berkurang, mis. setelah filter
+        page = col2.number_input(f"Halaman (1-{n_pages})", min_value=1, max_value=n_pages, step=1, key=page_key)
+        sort_column = col3.selectbox("Urutkan", [ORIGINAL_ORDER] + df.columns.tolist(), key=f"{key}_sort")
+        ascending = col4.checkbox("Naik", value=True, key=f"{key}_ascending")
+        start = (int(page) - 1) * page_size
+        stop = min(start + page_size, n_rows)
+
+        def compute_page():
+            if sort_column == ORIGINAL_ORDER:
+                return _to_arrow(df.iloc[start:stop])
+            order = _cached((frame_key, "sort", sort_column, ascending),
+                            lambda: urutan_sort(df, sort_column, ascending))
+            return _to_arrow(df.iloc[order[start:stop]])
+
+        data = _cached((frame_key, "page", page_size, int(page), sort_column, ascending), compute_page)
+        st.caption(f"Baris {start + 1:,}-{stop:,} dari {n_rows:,}")
+    else:
+        col1, col2, col3 = st.columns([1, 1, 2])
+        size = col1.number_input("Ukuran sampel", min_value=1, max_value=n_rows,
+                                 value=min(SAMPLE_SIZE, n_rows), key=f"{key}_sample_size")
+        seed_key = f"{key}_seed"
+        if col2.button("Ambil ulang sampel", key=f"{key}_resample"):
+            st.session_state[seed_key] = st.session_state.get(seed_key, 0) + 1
+        seed = st.session_state.get(seed_key, 0)
+        if view == "Sampel acak":
+            data = _cached((frame_key, "random", int(size), seed),
+                           lambda: _to_arrow(df.iloc[sampel_acak(n_rows, int(size), seed)]))
+        else:
+            strata = col3.selectbox("Kolom strata", df.columns.tolist(), key=f"{key}_strata")
+            data = _cached((frame_key, "stratified", strata, int(size), seed),
+                           lambda: _to_arrow(df.iloc[sampel_terstratifikasi(df, strata, int(size), seed)]))
+        st.caption(f"{len(data):,} baris sampel dari {n_rows:,}")
+    st.dataframe(data, height=height)
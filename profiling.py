@@ -0,0 +1,101 @@
+import contextlib
+import datetime
+import json
+import os
+import sys
+import time
+
+import pandas as pd
+
+try:
+    import resource
+except ImportError:  # Windows tidak punya modul resource
+    resource = None
+
+# ---------------------------
+# Profiling per Tahap
+# ---------------------------
+# Mencatat waktu, kenaikan puncak RSS, dan jumlah baris masuk/keluar untuk setiap tahap
+# (load, langkah cleaning, mode gabung, filter, chart, render, ekspor) dalam satu kali jalan script.
+# Jika DATA_CLEANING_PROFILE_LOG diisi, setiap jalan ditambahkan ke file tersebut sebagai satu baris JSON.
+
+PROFILE_LOG = os.environ.get("DATA_CLEANING_PROFILE_LOG")
+
+def peak_rss_mb():
+    """Puncak RSS proses sejauh ini dalam MB, atau None jika tidak tersedia."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux melaporkan ru_maxrss dalam KB, macOS dalam byte
+    return peak / 1024 ** 2 if sys.platform == "darwin" else peak / 1024
+
+class Profiler:
+    """Kumpulkan catatan tahap; saat tidak aktif, stage() tidak mengukur apa pun."""
+
+    def __init__(self, app, enabled=False, session_id=None):
+        self.app = app
+        self.enabled = enabled
+        self.session_id = session_id
+        self.records = []
+
+    @contextlib.contextmanager
+    def stage(self, name, rows_in=None):
+        """Ukur satu tahap. Isi record["rows_out"] di dalam blok jika jumlah baris keluar diketahui."""
+        record = {"stage": name, "rows_in": rows_in, "rows_out": None}
+        if not self.enabled:
+            yield record
+            return
+        rss_before = peak_rss_mb()
+        start = time.perf_counter()
+        try:
+            yield record
+        finally:
+            record["seconds"] = time.perf_counter() - start
+            rss_after = peak_rss_mb()
+            record["peak_rss_delta_mb"] = None if rss_before is None else rss_after - rss_before
+            self.records.append(record)
+
+    def catat(self, name, seconds, rows_in=None, rows_out=None):
+        """Catat tahap yang diukur di tempat lain (mis. ekspor yang berjalan di thread latar belakang)."""
+        if self.enabled:
+            self.records.append({"stage": name, "rows_in": rows_in, "rows_out": rows_out,
+                                 "seconds": seconds, "peak_rss_delta_mb": None})
+
+    def frame(self):
+        columns = ["stage", "seconds", "peak_rss_delta_mb", "rows_in", "rows_out"]
+        df = pd.DataFrame(self.records)
+        df = df.reindex(columns=columns + [c for c in df.columns if c not in columns])
+        df[["rows_in", "rows_out"]] = df[["rows_in", "rows_out"]].astype("Int64")
+        return df
+
+    def write_log(self, path=PROFILE_LOG):
+        """Tambahkan catatan jalan ini ke file log JSON lines."""
+        if not path or not self.records:
+            return
+        entry = {
+            "app": self.app,
+            "session": self.session_id,
+            "timestamp": datetime.datetime.now().isoformat(timespec="seconds"),
+            "peak_rss_mb": peak_rss_mb(),
+            "stages": self.records,
+        }
+        try:
+            with open(path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(entry, default=str) + "\n")
+        except OSError:
+            pass  # log hanya alat bantu; kegagalan tulis tidak boleh menghentikan app
+
+def tampilkan_panel(profiler, container):
+    """Tampilkan tabel tahap di container sidebar yang dibuat di awal script, lalu tulis log."""
+    if not profiler.enabled:
+        return
+    panel = container.expander("Profiling", expanded=True)
+    if not profiler.records:
+        panel.caption("Belum ada tahap yang tercatat.")
+    else:
+        df = profiler.frame()
+        panel.write(f"Total: {df['seconds'].sum():.3f} s")
+        panel.dataframe(df, hide_index=True)
+    if PROFILE_LOG:
+        panel.caption(f"Log JSON: {PROFILE_LOG}")
+    profiler.write_log()
@@ -1,24 +1,97 @@
 import streamlit as st
 import pandas as pd
-import numpy as np
-import re
-import io
-from sklearn.preprocessing import LabelEncoder
+import uuid
+
+from cleaning_pipeline import Pipeline, StepCache
+from cleaning_recipe import NON_RECIPE_STEPS, baca_resep, buat_resep, kosakata_label, resep_json
+from column_profile_ui import profil_data, tampilkan_profil_kolom
+from dtype_compaction import memory_summary
+from export_ui import mulai, pilih_format, tampilkan_unduhan
+from grouping import GroupIndex, jumlah_halaman, kelompok_halaman, ringkasan_kelompok
+from ingest import gabung_sumber, sidik_jari_sumber
+from ingest_ui import pilih_sumber
+from jobs_ui import hasil_job
+from preview import tampilkan_preview
+from profiling import Profiler, tampilkan_panel
+from value_mapping import (
+    baca_mapping_csv,
+    daftar_mapping,
+    muat_mapping,
+    rapikan_tabel,
+    rules_dari_tabel,
+    simpan_mapping,
+    tabel_kosong,
+)
 
 st.title("Data Cleaning & Preprocessing by NdreasX")
 
-uploaded_file = st.file_uploader("Upload file CSV atau Excel", type=["csv", "xlsx"])
+GROUPS_PER_PAGE = 10
+MAPPING_PREFILL_MAX = 1000
 
-if uploaded_file is not None:
-    if uploaded_file.name.endswith(".csv"):
-        df = pd.read_csv(uploaded_file)
-    else:
-        excel_file = pd.ExcelFile(uploaded_file)
-        sheet_name = st.selectbox("Pilih sheet yang ingin digunakan", excel_file.sheet_names)
-        df = pd.read_excel(uploaded_file, sheet_name=sheet_name)
+if "profile_session" not in st.session_state:
+    st.session_state.profile_session = uuid.uuid4().hex
+profiler = Profiler("data_clean", st.sidebar.checkbox("Profiling (waktu & memori per tahap)", key="profiling"),
+                    st.session_state.profile_session)
+profile_panel = st.sidebar.container()
+
+def muat_sumber(sources):
+    """(DataFrame gabungan, sidik jari) sumber terpilih.
+
+    Disimpan di session_state selama unggahan dan sheet sama, sehingga rerun tidak meng-hash
+    ulang isi file dan tidak membaca ulang cache parquet.
+    """
+    upload_key = tuple((getattr(file, "file_id", id(file)), sheet) for file, sheet in sources)
+    loaded = st.session_state.get("loaded_sources")
+    if loaded is None or loaded[0] != upload_key:
+        loaded = (upload_key, gabung_sumber(sources), sidik_jari_sumber(sources))
+        st.session_state.loaded_sources = loaded
+    return loaded[1], loaded[2]
+
+# Kosakata label encoding dari resep yang dimuat dipakai ulang agar kode kategori sama antar file
+recipe_vocabularies = {}
+recipe_file = st.sidebar.file_uploader("Muat resep cleaning (JSON, opsional)", type=["json"])
+if recipe_file is not None:
+    try:
+        recipe_vocabularies = kosakata_label(baca_resep(recipe_file))
+        st.sidebar.caption(f"Kosakata label dari resep: {', '.join(map(str, recipe_vocabularies)) or '-'}")
+    except ValueError as e:
+        st.sidebar.error(str(e))
+
+uploaded_files = st.file_uploader("Upload file CSV atau Excel (beberapa file/sheet digabung menjadi satu)",
+                                  type=["csv", "xlsx"], accept_multiple_files=True)
+sources = pilih_sumber(uploaded_files or [], "sheet", "Pilih sheet yang ingin digunakan")
+
+if sources:
+    with profiler.stage("load") as record:
+        df, source_key = muat_sumber(sources)
+        record["rows_out"] = len(df)
+
+    # Hasil setiap langkah di-cache per (sidik jari input, konfigurasi langkah)
+    if "step_cache" not in st.session_state:
+        st.session_state.step_cache = StepCache()
+
+    def jalankan_di_latar(key, name, compute):
+        # Langkah yang belum di-cache dijalankan sebagai job; selama belum selesai script berhenti di sini
+        df = hasil_job(f"cleaning_job_{name}", key, compute, label=f"Langkah {name}")
+        if df is None:
+            tampilkan_panel(profiler, profile_panel)
+            st.stop()
+        return df
+
+    pipeline = Pipeline(df, source_key, st.session_state.step_cache, profiler,
+                        runner=jalankan_di_latar)
+
+    if st.checkbox("Hemat memori (perkecil tipe data kolom)"):
+        df = pipeline.run("compact")
+        memory_report = pd.DataFrame(df.attrs["memory_report"])
+        with st.expander("Ringkasan memori per kolom"):
+            before_mb, after_mb = memory_summary(memory_report)
+            st.write(f"Total: {before_mb:.2f} MB → {after_mb:.2f} MB")
+            st.dataframe(memory_report, hide_index=True)
     
     st.write("### Data Awal:")
-    st.dataframe(df)
+    with profiler.stage("render: data awal", rows_in=len(df)):
+        tampilkan_preview(df, "preview_awal", pipeline.key)
     
     if "selected_columns" not in st.session_state:
         st.session_state.selected_columns = []
@@ -41,7 +114,7 @@ if uploaded_file is not None:
         st.session_state.selected_columns = selected_columns
     
     if selected_columns:
-        df = df[selected_columns]
+        df = pipeline.run("select_columns", columns=selected_columns)
         
         if st.checkbox("Ingin melakukan rename kolom?"):
             rename_dict = {}
@@ -52,85 +125,69 @@ if uploaded_file is not None:
                 if new_name:
                     rename_dict[col] = new_name
             
-            df.rename(columns=rename_dict, inplace=True)
+            df = pipeline.run("rename", rename_dict=rename_dict)
         
-        engine_size_variants = {'engine size', 'engine_size', 'enginesize', 'engine size2', 'engine_size2', 'enginesize2'}
-        df.columns = df.columns.str.lower()
-        
-        matching_column = next((col for col in df.columns if col in engine_size_variants), None)
-        if matching_column:
-            def convert_to_cc(value):
-                try:
-                    num = float(value)
-                    if num < 10:
-                        return int(num * 1000)
-                    return int(num)
-                except ValueError:
-                    return np.nan
-            
-            df['engine size'] = df[matching_column].apply(convert_to_cc)
-            df.drop(columns=[matching_column], inplace=True)
+        df = pipeline.run("engine_size")
         
         if st.checkbox("Ingin melakukan konversi kolom kategorikal?"):
-            categorical_columns = st.multiselect("Pilih kolom kategorikal untuk dikonversi", df.select_dtypes(include=['object']).columns.tolist())
+            categorical_columns = st.multiselect("Pilih kolom kategorikal untuk dikonversi", df.select_dtypes(include=['object', 'category', 'string']).columns.tolist())
             if categorical_columns:
-                le = LabelEncoder()
-                for col in categorical_columns:
-                    df[col] = le.fit_transform(df[col].astype(str))
+                vocabularies = {col: recipe_vocabularies[col] for col in categorical_columns if col in recipe_vocabularies}
+                if vocabularies:
+                    df = pipeline.run("label_encode", columns=categorical_columns, vocabularies=vocabularies)
+                    unknown = {col: n for col, n in df.attrs.get("label_unknown", {}).items() if n}
+                    if unknown:
+                        st.warning("Nilai yang tidak ada di kosakata resep diberi kode -1: "
+                                   + ", ".join(f"{col} ({n} baris)" for col, n in unknown.items()))
+                else:
+                    df = pipeline.run("label_encode", columns=categorical_columns)
         
         if st.checkbox("Ingin membersihkan data numerik?"):
-            def clean_numeric(value):
-                if isinstance(value, str):
-                    value = value.replace(',', '').strip()
-                    value = re.sub(r'[^0-9.]', '', value)
-
-                try:
-                    return "{:.0f}".format(float(value))
-                except (ValueError, TypeError):
-                    return ""
-                except Exception:
-                    return value
-
-            def clean_date(value):
-                try:
-                    return pd.to_datetime(value, errors="coerce").strftime("%d-%m-%Y")
-                except Exception:
-                    return np.nan
-            
             numeric_columns = st.multiselect(
                 "Pilih kolom yang ingin dibersihkan sebagai numerik", 
-                df.select_dtypes(exclude=['object']).columns.tolist()
+                df.select_dtypes(exclude=['object', 'category', 'string']).columns.tolist()
             )
-            for col in numeric_columns:
-                df[col] = df[col].apply(clean_numeric)
+            if numeric_columns:
+                df = pipeline.run("clean_numeric", columns=numeric_columns)
 
             if st.checkbox("Ingin mengoreksi data tanggal?"):
                 date_columns = st.multiselect(
                     "Pilih kolom yang ingin dikonversi ke format tanggal (DD-MM-YYYY)",
                     df.columns.tolist()
                 )
-                for col in date_columns:
-                    df[col] = df[col].apply(clean_date)
+                date_order = st.selectbox(
+                    "Urutan hari/bulan pada tanggal ambigu (mis. 05/02/2021)",
+                    ["Otomatis", "Hari dulu (DD/MM)", "Bulan dulu (MM/DD)"]
+                )
+                dayfirst = {"Otomatis": None, "Hari dulu (DD/MM)": True, "Bulan dulu (MM/DD)": False}[date_order]
+                if date_columns:
+                    df = pipeline.run("clean_date", columns=date_columns, dayfirst=dayfirst)
+                    date_report = pd.DataFrame([
+                        {
+                            "Kolom": col,
+                            "Nilai Terisi": report["values"],
+                            "Nilai Unik": report["unique"],
+                            "Format Terdeteksi": ", ".join(report["formats"]) or "-",
+                            "Diparse Satu per Satu": report["fallback"],
+                            "Menjadi NaT": report["nat"],
+                        }
+                        for col, report in df.attrs.get("date_report", {}).items()
+                    ])
+                    st.write("Ringkasan konversi tanggal:")
+                    st.dataframe(date_report, hide_index=True)
             
             
             if st.checkbox("Ingin membersihkan teks dari duplikasi?"):
-                def clean_text(value):
-                    if isinstance(value, str):
-                        words = [word.strip() for word in value.split(";") if word.strip()]
-                        unique_words = list(dict.fromkeys(words))
-                        return "; ".join(unique_words)
-                    return value
-                
                 text_columns = st.multiselect(
                     "Pilih kolom teks yang ingin dibersihkan",
-                    df.select_dtypes(include=['object']).columns.tolist()
+                    df.select_dtypes(include=['object', 'category', 'string']).columns.tolist()
                 )
-                for col in text_columns:
-                    df[col] = df[col].apply(clean_text)
+                if text_columns:
+                    df = pipeline.run("clean_text", columns=text_columns)
         
         
         if st.checkbox("Hapus missing values"):
-            df.dropna(inplace=True)
+            df = pipeline.run("dropna")
         
         if st.checkbox("Ingin menukar value antara dua kolom?"):
             row_index = st.number_input("Masukkan nomor baris untuk ditukar (index mulai dari 0)", min_value=0, max_value=len(df)-1, step=1)
@@ -140,10 +197,10 @@ if uploaded_file is not None:
             
             if st.button("Tukar value"):
                 if col1 in df.columns and col2 in df.columns:
-                    df.at[row_index, col1], df.at[row_index, col2] = df.at[row_index, col2], df.at[row_index, col1]
+                    df = pipeline.run("swap_values", row_index=row_index, column1=col1, column2=col2)
                     st.success(f"Berhasil menukar value pada baris {row_index} dari kolom '{col1}' ke '{col2}'!")
                     st.write("### Data Setelah Pertukaran:")
-                    st.dataframe(df)
+                    st.dataframe(df.iloc[max(0, row_index - 5):row_index + 6])
                 else:
                     st.error("Kolom yang dipilih tidak valid.")
         
@@ -157,13 +214,7 @@ if uploaded_file is not None:
             elif col1 not in df.columns or col2 not in df.columns:
                 st.error("Kolom yang dipilih tidak valid.")
             else:
-                if direction == "Kanan":
-                    cols = df.columns.tolist()
-                    cols.insert(cols.index(col2), cols.pop(cols.index(col1)))
-                elif direction == "Kiri":
-                    cols = df.columns.tolist()
-                    cols.insert(cols.index(col2), cols.pop(cols.index(col1)))
-                df = df[cols]
+                df = pipeline.run("move_column", column=col1, reference=col2, direction=direction)
                 st.success(f"Berhasil memindahkan kolom '{col1}' ke {direction.lower()} dari kolom '{col2}'!")
                 # st.write("### Data Setelah Pemindahan:")
                 # st.write(df.head())
@@ -172,105 +223,157 @@ if uploaded_file is not None:
             replace_column = st.multiselect("Pilih kolom yang ingin diubah nilainya", df.columns.tolist())
             
             if replace_column:
-                replace_dict = {}
-                for col in replace_column:
-                    unique_values = df[col].unique()
-                    for value in unique_values:
-                        new_value = st.text_input(f"Ubah '{value}' pada '{col.upper()}' menjadi:", key=f"replace_{col}_{value}")
-                        if new_value:
-                            replace_dict[value] = new_value.lower()
-                    df[col] = df[col].replace(replace_dict)
-                
-        target_addreas = ['address', 'alamat']
-        df.columns = df.columns.str.lower()
-        target_column = next((col for col in df.columns if col in target_addreas), None)
+                # Tabel mapping: satu baris per aturan, diterapkan ke nilai unik kolom lalu dipetakan ke semua baris
+                if "mapping_table" not in st.session_state:
+                    st.session_state.mapping_table = tabel_kosong()
+                    st.session_state.mapping_version = 0
+
+                def ganti_tabel(table):
+                    st.session_state.mapping_table = table
+                    st.session_state.mapping_version += 1  # key editor baru agar grid memuat tabel ini
+                    st.rerun()
+
+                source = st.radio("Sumber mapping", ["Isi tabel", "Upload CSV", "Mapping tersimpan"],
+                                  horizontal=True, key="mapping_source")
+                if source == "Upload CSV":
+                    mapping_file = st.file_uploader(
+                        "Upload CSV mapping (kolom: Kolom, Nilai Lama, Nilai Baru, Regex, Abaikan Kapital)",
+                        type=["csv"], key="mapping_file"
+                    )
+                    if mapping_file is not None and st.button("Pakai CSV ini"):
+                        try:
+                            ganti_tabel(baca_mapping_csv(mapping_file))
+                        except ValueError as e:
+                            st.error(str(e))
+                elif source == "Mapping tersimpan":
+                    saved = daftar_mapping()
+                    if saved:
+                        saved_name = st.selectbox("Pilih mapping", saved, key="mapping_saved")
+                        if st.button("Muat mapping"):
+                            ganti_tabel(muat_mapping(saved_name))
+                    else:
+                        st.info("Belum ada mapping tersimpan.")
+
+                st.caption("Kolom kosong = berlaku untuk semua kolom terpilih. Baris dengan Nilai Baru kosong diabaikan, kecuali regex.")
+                edited_mapping = st.data_editor(
+                    st.session_state.mapping_table,
+                    num_rows="dynamic",
+                    hide_index=True,
+                    key=f"mapping_editor_{st.session_state.mapping_version}",
+                    column_config={
+                        "Kolom": st.column_config.SelectboxColumn("Kolom", options=[""] + replace_column),
+                        "Regex": st.column_config.CheckboxColumn("Regex", default=False),
+                        "Abaikan Kapital": st.column_config.CheckboxColumn("Abaikan Kapital", default=False),
+                    },
+                )
 
+                col1, col2, col3 = st.columns([2, 2, 1])
+                if col1.button("Isi dengan nilai unik kolom terpilih"):
+                    table = rapikan_tabel(edited_mapping)
+                    rows = []
+                    for col in replace_column:
+                        existing = set(table.loc[table["Kolom"] == col, "Nilai Lama"])
+                        top_values = df[col].value_counts().index[:MAPPING_PREFILL_MAX].astype(str)
+                        rows += [{"Kolom": col, "Nilai Lama": value} for value in top_values if value not in existing]
+                    ganti_tabel(rapikan_tabel(pd.concat([table, pd.DataFrame(rows)], ignore_index=True)))
+                mapping_name = col2.text_input("Nama mapping", key="mapping_name", label_visibility="collapsed",
+                                               placeholder="Nama mapping untuk disimpan")
+                if col3.button("Simpan mapping"):
+                    try:
+                        simpan_mapping(mapping_name, edited_mapping)
+                        st.success(f"Mapping '{mapping_name}' disimpan.")
+                    except (ValueError, OSError) as e:
+                        st.error(f"Gagal menyimpan mapping: {e}")
+
+                try:
+                    rules = rules_dari_tabel(edited_mapping)
+                except ValueError as e:
+                    st.error(str(e))
+                    rules = ()
+                df = pipeline.run("replace", columns=replace_column, rules=rules)
+                st.caption(f"{len(rules)} aturan diterapkan.")
+                
         if st.checkbox("Ingin membersihkan kolom alamat?"):
-            def clean_address(value):
-                if pd.isna(value) or pd.isnull(value):
-                    return value
-                if isinstance(value, str):
-                    value = value.strip()
-                    if len(value) <= 1 or len(value) < 3:
-                        return ""
-                    return value.strip()
-                return value
-            df[target_column] = df[target_column].apply(clean_address)
+            df = pipeline.run("clean_address")
         
-        selected_columns = df.columns.tolist()
         st.write("### Data Setelah Preprocessing:")
-        st.dataframe(df)
+        with profiler.stage("render: hasil preprocessing", rows_in=len(df)):
+            tampilkan_preview(df, "preview_hasil", pipeline.key)
 
-        if st.checkbox("Cek Unique Values"):
-            check_unique_column = st.selectbox("Pilih kolom untuk melihat Unique Values", selected_columns)
-            if check_unique_column:
-                unique_values = df[check_unique_column].unique()
-                Total_Uniques = len(unique_values)
-                st.write(f"Total Uniques: {Total_Uniques}")
-                st.write(f"### Unique Values dari kolom '{check_unique_column}':")
-                st.write(unique_values)
+        if st.checkbox("Simpan resep cleaning (untuk dijalankan ulang pada file lain)"):
+            recipe = buat_resep(pipeline.steps)
+            st.dataframe(pd.DataFrame({"Langkah": [step["nama"] for step in recipe["langkah"]]}), hide_index=True)
+            skipped = sorted({name for name, _ in pipeline.steps if name in NON_RECIPE_STEPS})
+            if skipped:
+                st.caption(f"Tidak disimpan di resep: {', '.join(skipped)}.")
+            st.download_button("Unduh resep (JSON)", resep_json(recipe), file_name="resep_cleaning.json",
+                               mime="application/json")
+            st.caption("Jalankan resep pada banyak file tanpa aplikasi: "
+                       "`python cleaning_cli.py resep_cleaning.json data/*.csv --output-dir bersih`")
+
+        if st.checkbox("Profil Kolom (nilai kosong, unik, terbanyak, statistik)"):
+            with profiler.stage("profil kolom", rows_in=len(df)):
+                column_profile = profil_data(df, pipeline.key)
+            if column_profile is not None:
+                tampilkan_profil_kolom(column_profile, "column_profile")
 
         if st.checkbox("Group By"):
             group_by_column = st.selectbox("Pilih kolom untuk Group By", df.columns.tolist())
+            second_group_by_column = st.selectbox(
+                "Pilih kolom kedua untuk Group By (opsional)",
+                ["(Tidak ada)"] + [col for col in df.columns if col != group_by_column],
+                key="second_group_column"
+            )
+            if second_group_by_column == "(Tidak ada)":
+                second_group_by_column = None
 
             if group_by_column:
-                grouped_data = {name: pd.DataFrame(group) for name, group in df.groupby(group_by_column)} # Dictionary untuk Group By pertama
-                unique_values = df[group_by_column].dropna().unique()
-
-                second_grouped_data = {} # Dictionary untuk Group By kedua
-
-                st.write(f"### Data Grouped by {group_by_column}:")
-                for value in unique_values:
-                    if value in grouped_data:
-                        st.write(f"#### {group_by_column}: {value}")
-                        st.dataframe(grouped_data[value])
-
-                        add_second_group_by = st.checkbox(f"Tambahkan Group By kedua untuk '{value}'?", key=f"group2_{value}")
-
-                        if add_second_group_by:
-                            second_group_by_column = st.selectbox(
-                                f"Pilih kolom kedua untuk Group By pada {value}", 
-                                df.columns.tolist(), 
-                                key=f"second_group_{value}"
-                            )
-
-                            if second_group_by_column:
-                                second_grouped_data[value] = {
-                                    f"{value} ~ {second_value}": pd.DataFrame(group) 
-                                    for second_value, group in grouped_data[value].groupby(second_group_by_column)
-                                }
-
-                                st.write(f"### Data Grouped by {second_group_by_column} within {value}:")
-                                for second_key, data in second_grouped_data[value].items():
-                                    st.write(f"##### {second_key}")
-                                    st.dataframe(data)
-
-            def download_excel_file(groupby_choice, grouped_data, second_grouped_data):
-                output = io.BytesIO()
-                with pd.ExcelWriter(output, engine="xlsxwriter") as writer:
-                    df.to_excel(writer, sheet_name="Complete Data", index=False)
-            
-                    if groupby_choice == "Group By 1":
-                        for key, data in grouped_data.items():
-                            data.to_excel(writer, sheet_name=str(key)[:31], index=False)
-                    else:
-                        for group1, group2_dict in second_grouped_data.items():
-                            for key, data in group2_dict.items():
-                                data.to_excel(writer, sheet_name=key[:31], index=False)
-                output.seek(0)
-                return output
-            
-            if grouped_data or second_grouped_data:
-                if st.checkbox("Download hasil Group By sebagai file Excel?"):
+                # Kelompok disimpan sebagai posisi baris; data kelompok hanya diambil saat ditampilkan
+                with profiler.stage("group by", rows_in=len(df)) as record:
+                    group_index = GroupIndex(df[group_by_column].to_numpy())
+                    summary = ringkasan_kelompok(df, group_by_column, group_index)
+                    record["rows_out"] = len(group_index)
+
+                st.write(f"### Ringkasan Group By {group_by_column} ({len(group_index)} kelompok):")
+                st.dataframe(summary, hide_index=True)
+
+                sizes = group_index.sizes()
+                n_pages = jumlah_halaman(group_index, GROUPS_PER_PAGE)
+                page = st.number_input(f"Halaman kelompok (1-{n_pages})", min_value=1, max_value=n_pages, step=1)
+                for i in kelompok_halaman(group_index, page, GROUPS_PER_PAGE):
+                    value = group_index.keys[i]
+                    with st.expander(f"{group_by_column}: {value} ({sizes[i]} baris)"):
+                        st.dataframe(group_index.frame(df, i))
+                        if second_group_by_column:
+                            sub_index = group_index.sub_index(df, i, second_group_by_column)
+                            st.write(f"Data Grouped by {second_group_by_column} within {value}:")
+                            for j, second_value in enumerate(sub_index.keys):
+                                st.write(f"##### {value} ~ {second_value}")
+                                st.dataframe(sub_index.frame(df, j))
+
+                def group_by_sheets(groupby_choice):
+                    # Generator: setiap sheet baru diiris dari df saat giliran ditulis
+                    yield "Complete Data", df
+                    for i, value in enumerate(group_index.keys):
+                        if groupby_choice == "Group By 1":
+                            yield str(value), group_index.frame(df, i)
+                        else:
+                            sub_index = group_index.sub_index(df, i, second_group_by_column)
+                            for j, second_value in enumerate(sub_index.keys):
+                                yield f"{value} ~ {second_value}", sub_index.frame(df, j)
+
+                if len(group_index) and st.checkbox("Download hasil Group By sebagai file?"):
                     output_file_name = st.text_input("Masukkan nama file output (tanpa ekstensi)", value="cleaned_data")
-                    groupby_choice = st.radio("Pilih hasil Group By yang ingin didownload", ("Group By 1", "Group By 2"))
-            
-                    if st.button("Buat File Excel"):
-                        output_excel = download_excel_file(groupby_choice, grouped_data, second_grouped_data)
-            
-                        st.download_button(
-                            label="Klik di sini untuk Download Excel",
-                            data=output_excel,
-                            file_name=f"{output_file_name}.xlsx",
-                            mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
-                        )
+                    choices = ("Group By 1", "Group By 2") if second_group_by_column else ("Group By 1",)
+                    groupby_choice = st.radio("Pilih hasil Group By yang ingin didownload", choices)
+                    export_format = pilih_format("group_export_format")
+                    if export_format != "xlsx":
+                        st.caption("CSV/Parquet hanya berisi sheet Complete Data; kelompok dapat dipilah lewat kolom Group By.")
+                    export_signature = (pipeline.key, group_by_column, second_group_by_column, groupby_choice)
+
+                    if st.button("Buat File"):
+                        mulai("group_export_job", group_by_sheets(groupby_choice),
+                              export_format, output_file_name, export_signature, rows=len(df))
+                    tampilkan_unduhan("group_export_job", export_signature, profiler)
+
+tampilkan_panel(profiler, profile_panel)
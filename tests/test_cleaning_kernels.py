@@ -0,0 +1,146 @@
+import math
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from cleaning_kernels import (
+    clean_address,
+    clean_address_series,
+    clean_date,
+    clean_date_series,
+    clean_numeric,
+    clean_numeric_series,
+    clean_text,
+    clean_text_series,
+    convert_to_cc,
+    convert_to_cc_series,
+)
+
+# Kernel vektor dibandingkan dengan fungsi per sel (Series.map) pada kolom acak
+
+SEEDS = range(40)
+WORDS = ["", " ", "a", "b", " a ", "Jl. Mawar", "x;y", "ok", "Ä", "ß", "  jalan  ", "12", "1,200", "-3.5"]
+
+def _sama(a, b):
+    if isinstance(a, float) and isinstance(b, float) and math.isnan(a) and math.isnan(b):
+        return True
+    if a is None or b is None or (isinstance(a, float) and math.isnan(a)) or (isinstance(b, float) and math.isnan(b)):
+        return pd.isna(a) and pd.isna(b)
+    return type(a) is type(b) and a == b or (isinstance(a, (int, float, np.number)) and a == b)
+
+def _cek(result, expected, s):
+    assert result.index.equals(s.index)
+    assert result.name == s.name
+    mismatch = [(v, r, e) for v, r, e in zip(s, result, expected) if not _sama(r, e)]
+    assert not mismatch, mismatch[:5]
+
+def _teks_acak(rng, n):
+    """Teks campuran: kata dengan ";" dan spasi, angka dengan koma/titik, simbol, unicode."""
+    values = []
+    for _ in range(n):
+        k = rng.integers(0, 5)
+        if k == 0:
+            values.append(";".join(rng.choice(WORDS, rng.integers(1, 5))))
+        elif k == 1:
+            values.append(f"{rng.choice(['', 'Rp ', '$'])}{rng.integers(0, 10**7):,}{rng.choice(['', '.5', '.49', ' cc'])}")
+        elif k == 2:
+            values.append(str(rng.choice(WORDS)) * int(rng.integers(1, 3)))
+        elif k == 3:
+            values.append(f"{rng.normal(0, 1000):.{rng.integers(0, 4)}f}")
+        else:
+            values.append("".join(rng.choice(list("0123456789.,-+ eE_xy"), rng.integers(0, 8))))
+    return values
+
+def _kolom_acak(rng, n=200):
+    """Kolom object campuran teks, angka, None/NaN, dan bool; kadang kolom angka murni/category."""
+    kind = rng.integers(0, 5)
+    index = pd.Index(rng.permutation(n) + 10, name="idx")
+    if kind == 0:
+        return pd.Series(rng.normal(0, 50, n).round(rng.integers(0, 3)), index=index, name="angka")
+    if kind == 1:
+        return pd.Series(rng.integers(-20, 20000, n), index=index, name="bulat")
+    values = np.array(_teks_acak(rng, n), dtype=object)
+    extra = rng.random(n)
+    values[extra < 0.1] = np.nan
+    values[(extra >= 0.1) & (extra < 0.15)] = None
+    numbers = (extra >= 0.15) & (extra < 0.25)
+    values[numbers] = rng.normal(5, 10, numbers.sum()).round(1)
+    values[(extra >= 0.25) & (extra < 0.27)] = True
+    s = pd.Series(values, index=index, name="campuran", dtype=object)
+    return s.astype("category") if kind == 4 and s.map(type).eq(str).all() else s
+
+def _cc_referensi(value):
+    # Versi per sel error pada None/inf; versi vektor sengaja mengembalikan NaN
+    try:
+        return convert_to_cc(value)
+    except (TypeError, OverflowError):
+        return np.nan
+
+@pytest.mark.parametrize("seed", SEEDS)
+def test_convert_to_cc_series(seed):
+    s = _kolom_acak(np.random.default_rng(seed))
+    expected = s.astype(object).map(_cc_referensi)
+    result = convert_to_cc_series(s)
+    _cek(result.astype(float), expected.astype(float), s)
+
+@pytest.mark.parametrize("seed", SEEDS)
+def test_clean_numeric_series(seed):
+    s = _kolom_acak(np.random.default_rng(seed))
+    _cek(clean_numeric_series(s), s.astype(object).map(clean_numeric), s)
+
+@pytest.mark.parametrize("seed", SEEDS)
+def test_clean_text_series(seed):
+    s = _kolom_acak(np.random.default_rng(seed))
+    _cek(clean_text_series(s), s.astype(object).map(clean_text, na_action=None), s)
+
+@pytest.mark.parametrize("seed", SEEDS)
+def test_clean_address_series(seed):
+    s = _kolom_acak(np.random.default_rng(seed))
+    _cek(clean_address_series(s), s.astype(object).map(clean_address), s)
+
+def _tanggal_acak(rng, n=150):
+    """Kolom tanggal dengan satu keluarga format, agar pemilihan format per kolom (clean_date_series)
+    dan pd.to_datetime per sel memang harus memberi hasil yang sama."""
+    family = rng.integers(0, 5)
+    dates = pd.Timestamp("1995-01-01") + pd.to_timedelta(rng.integers(0, 12000, n), unit="D")
+    if family == 0:
+        values = [d.strftime(rng.choice(["%Y-%m-%d", "%Y-%m-%d %H:%M:%S", "%Y/%m/%d"])) for d in dates]
+    elif family == 1:
+        # Bulan-dulu, termasuk tanggal ambigu (05/02/2021 dibaca 2 Mei seperti pd.to_datetime)
+        values = [d.strftime("%m/%d/%Y") for d in dates]
+    elif family == 2:
+        # Hari-dulu yang tidak ambigu (hari > 12)
+        values = [d.replace(day=max(d.day, 13)).strftime("%d/%m/%Y") for d in dates]
+    elif family == 3:
+        values = [d.strftime(rng.choice(["%d %B %Y", "%B %d, %Y"])) for d in dates]
+    else:
+        values = list(dates)
+    values = np.array(values, dtype=object)
+    extra = rng.random(n)
+    values[extra < 0.1] = np.nan
+    values[(extra >= 0.1) & (extra < 0.15)] = rng.choice(["bukan tanggal", "32/13/2020", "", "2021-02-30"])
+    values[(extra >= 0.15) & (extra < 0.18)] = 12345
+    return pd.Series(values, index=pd.RangeIndex(5, 5 + n), name="tanggal", dtype=object)
+
+@pytest.mark.parametrize("seed", SEEDS)
+def test_clean_date_series(seed):
+    s = _tanggal_acak(np.random.default_rng(seed))
+    # Angka 12345 hanya sebagian kecil kolom, jadi deteksi otomatis tidak membacanya sebagai serial Excel
+    _cek(clean_date_series(s), s.map(clean_date), s)
+
+def test_serial_excel_otomatis():
+    serials = pd.Series([44197, 44198.5, "44199", np.nan, 44200, 44201], dtype=object)
+    report = {}
+    result = clean_date_series(serials, report=report)
+    assert result.tolist()[:3] == ["01-01-2021", "02-01-2021", "03-01-2021"]
+    assert report["formats"] == {"excel serial": 5}
+    # Tahun atau kode angka biasa tidak menjadi tanggal tahun 1905
+    years = pd.Series([2021, 2022, 2023], name="tahun")
+    _cek(clean_date_series(years), years.map(clean_date), years)
+    assert clean_date_series(years, excel_serial=True).tolist() == ["13-07-1905", "14-07-1905", "15-07-1905"]
+    # Serial yang hanya sebagian kecil kolom dibiarkan seperti pd.to_datetime kecuali dipaksa
+    mixed = pd.Series(["2021-01-05", "2021-02-05", "2021-03-05", "2021-04-05", 44197], dtype=object)
+    _cek(clean_date_series(mixed), mixed.map(clean_date), mixed)
+    assert clean_date_series(mixed, excel_serial=True).tolist()[-1] == "01-01-2021"
+    _cek(clean_date_series(serials, excel_serial=False), serials.map(clean_date), serials)
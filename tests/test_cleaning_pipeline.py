@@ -0,0 +1,74 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from cleaning_pipeline import Pipeline, StepCache, frame_bytes
+
+def _frame(rows, value=0):
+    return pd.DataFrame({"a": np.full(rows, value, dtype=np.int64)})
+
+def test_frame_bytes_mendekati_memory_usage_deep():
+    rng = np.random.default_rng(0)
+    n = 20_000
+    df = pd.DataFrame({
+        "angka": rng.integers(0, 9, n),
+        "teks": rng.choice(["Jakarta", "Bandung Barat", "x", None], n).astype(object),
+        "kategori": pd.Categorical(rng.choice(["a", "b"], n)),
+    })
+    # Kolom angka dihitung persis; isi teks kolom object diperkirakan dari sampel baris
+    assert frame_bytes(df[["angka"]]) == df[["angka"]].memory_usage(deep=True, index=True).sum()
+    assert frame_bytes(df) == pytest.approx(df.memory_usage(deep=True, index=True).sum(), rel=0.05)
+    assert frame_bytes(df.iloc[:0]) == df.iloc[:0].memory_usage(deep=False, index=True).sum()
+
+def test_step_cache_lru_dengan_batas_memori():
+    size = frame_bytes(_frame(100))
+    cache = StepCache(max_bytes=2 * size)
+    cache.put("satu", _frame(100, 1))
+    cache.put("dua", _frame(100, 2))
+    assert cache.total_bytes == 2 * size
+    # "satu" baru dipakai, jadi "dua" yang paling lama tidak dipakai dan dikeluarkan
+    assert cache.get("satu")["a"].iloc[0] == 1
+    cache.put("tiga", _frame(100, 3))
+    assert cache.get("dua") is None
+    assert [cache.get(key)["a"].iloc[0] for key in ("satu", "tiga")] == [1, 3]
+    assert cache.total_bytes == 2 * size
+    # Menyimpan ulang kunci yang sama tidak menghitung ukurannya dua kali
+    cache.put("tiga", _frame(100, 4))
+    assert cache.total_bytes == 2 * size and cache.get("tiga")["a"].iloc[0] == 4
+    # Frame yang lebih besar dari batas tidak disimpan dan tidak mengeluarkan isi cache
+    cache.put("besar", _frame(1_000))
+    assert cache.get("besar") is None and cache.total_bytes == 2 * size
+    # Frame yang hanya muat sendirian mengeluarkan semua entri lama
+    cache.put("penuh", _frame(150))
+    assert [cache.get(key) is None for key in ("satu", "tiga")] == [True, True]
+    assert cache.total_bytes == frame_bytes(_frame(150))
+
+def _jalankan(df, cache, harga_columns, source_key="sumber"):
+    computed = []
+    def runner(key, name, compute):
+        computed.append(name)
+        return compute()
+    pipeline = Pipeline(df, source_key, cache, runner=runner)
+    pipeline.run("select_columns", columns=["harga", "kota", "catatan"])
+    pipeline.run("clean_numeric", columns=harga_columns)
+    pipeline.run("clean_text", columns=["catatan"])
+    pipeline.run("dropna")
+    return pipeline, computed
+
+def test_mengubah_satu_langkah_hanya_menghitung_ulang_langkah_sesudahnya():
+    df = pd.DataFrame({"harga": ["1,000", "2.5", None], "kota": ["a", "b", "c"], "catatan": [" x ", "y;y", "z"],
+                       "lain": [1, 2, 3]})
+    cache = StepCache()
+    first, computed = _jalankan(df, cache, ["harga"])
+    assert computed == ["select_columns", "clean_numeric", "clean_text", "dropna"]
+    # Konfigurasi sama: semua langkah diambil dari cache
+    again, computed = _jalankan(df, cache, ["harga"])
+    assert computed == [] and again.key == first.key
+    pd.testing.assert_frame_equal(again.df, first.df)
+    # Langkah kedua berubah: langkah pertama tetap dari cache, langkah kedua dan sesudahnya dihitung ulang
+    changed, computed = _jalankan(df, cache, ["harga", "kota"])
+    assert computed == ["clean_numeric", "clean_text", "dropna"]
+    assert changed.key != first.key
+    # Sumber lain: semua langkah dihitung ulang walau konfigurasinya sama
+    _, computed = _jalankan(df, cache, ["harga"], source_key="sumber lain")
+    assert computed == ["select_columns", "clean_numeric", "clean_text", "dropna"]
@@ -0,0 +1,44 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from cleaning_pipeline import Pipeline, StepCache
+from cleaning_recipe import baca_resep, buat_resep, jalankan_resep_file, resep_json
+
+def _tulis_data(tmp_path):
+    """File yang tipe dan format tanggalnya baru terlihat di chunk belakang."""
+    n = 60
+    rng = np.random.default_rng(5)
+    df = pd.DataFrame({
+        "id": np.arange(n),
+        # Kosong hanya di baris terakhir: seluruh file float, chunk awal bilangan bulat
+        "Engine Size": np.append(rng.choice([1.5, 2.0, 1200.0], n - 1), np.nan),
+        "stok": pd.array(list(rng.integers(0, 9, n - 1)) + [None], dtype="Int64"),
+        # Teks hanya di chunk terakhir: seluruh kolom object
+        "harga": [str(v) for v in rng.integers(1, 99, n - 1)] + ["Rp 1,500"],
+        "kota": rng.choice(["Jakarta", "Bandung", "Medan", None], n),
+        # Chunk awal hanya tanggal ambigu; tanggal hari-dulu (> 12) baru muncul di belakang, bersama
+        # satu tanggal bulan-dulu berformat lain sehingga urutan hari/bulan tidak bisa dipatok
+        "tanggal": [f"{1 + i % 12:02d}/{1 + i % 11:02d}/2021" for i in range(n - 20)]
+                   + [f"{13 + i % 15}/{1 + i % 12:02d}/2022" for i in range(19)] + ["12-25-2022"],
+        "catatan": rng.choice(["a;b;a", " x ", None, "ok"], n),
+    })
+    path = tmp_path / "data.csv"
+    df.to_csv(path, index=False)
+    return path
+
+@pytest.mark.parametrize("chunksize", [7, 25, 1000])
+def test_resep_per_chunk_sama_dengan_sekaligus(tmp_path, chunksize):
+    path = _tulis_data(tmp_path)
+    pipeline = Pipeline(pd.read_csv(path), "sumber", StepCache())
+    pipeline.run("engine_size")
+    pipeline.run("label_encode", columns=["kota"])
+    pipeline.run("clean_numeric", columns=["harga"])
+    pipeline.run("clean_date", columns=["tanggal"], dayfirst=None)
+    pipeline.run("clean_text", columns=["catatan"])
+    recipe = baca_resep(resep_json(buat_resep(pipeline.steps)))
+
+    output = tmp_path / "hasil.csv"
+    summary = jalankan_resep_file(recipe, str(path), str(output), chunksize=chunksize)
+    assert summary["rows"] == summary["rows_in"] == len(pipeline.df)
+    assert output.read_text(encoding="utf-8") == pipeline.df.to_csv(index=False)
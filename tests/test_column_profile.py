@@ -0,0 +1,75 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from column_profile import (
+    EXACT_DISTINCT_LIMIT,
+    HLL_PRECISION,
+    TOP_K_CAPACITY,
+    ColumnSketch,
+    HyperLogLog,
+    profil_frame,
+)
+
+# Galat relatif baku HyperLogLog 1.04 / sqrt(2^presisi) (~0.4%); batas uji sekitar 5 kali galat baku
+HLL_TOLERANCE = 5 * 1.04 / np.sqrt(2 ** HLL_PRECISION)
+
+@pytest.mark.parametrize("cardinality", [1_000, 50_000, 1_000_000])
+def test_hyperloglog_dalam_batas_galat(cardinality):
+    rng = np.random.default_rng(cardinality)
+    hashes = rng.integers(0, 2 ** 63, cardinality, dtype=np.uint64) * np.uint64(2) + np.uint64(1)
+    hll = HyperLogLog()
+    # Hash yang sama ditambahkan berulang tidak mengubah perkiraan
+    for part in np.array_split(np.concatenate([hashes, hashes[: cardinality // 2]]), 7):
+        hll.tambah(part)
+    assert abs(hll.perkiraan() - cardinality) <= HLL_TOLERANCE * cardinality
+
+def test_unik_persis_lalu_perkiraan():
+    sketch = ColumnSketch()
+    sketch.tambah(pd.Series(np.arange(1_000) % 300))
+    assert sketch.unik() == (300, False)
+    n = EXACT_DISTINCT_LIMIT * 2
+    for start in range(0, n, 50_000):
+        sketch.tambah(pd.Series(np.arange(start, start + 50_000)))
+    distinct, approximate = sketch.unik()
+    assert approximate
+    assert abs(distinct - n) <= HLL_TOLERANCE * n
+
+def _aliran_berat(rng, n_light):
+    """Lima nilai berat (masing-masing 5% baris) di antara banyak nilai ringan yang muncul sekali."""
+    heavy = np.repeat([f"berat{i}" for i in range(5)], n_light // 19)
+    values = np.concatenate([heavy, [f"ringan{i}" for i in range(n_light)]]).astype(object)
+    return pd.Series(rng.permutation(values))
+
+def test_misra_gries_mempertahankan_nilai_terbanyak():
+    s = _aliran_berat(np.random.default_rng(0), 100_000)
+    sketch = ColumnSketch()
+    for start in range(0, len(s), 9_000):
+        sketch.tambah(s.iloc[start:start + 9_000])
+    assert not sketch.counts_exact
+    top = sketch.terbanyak(5)
+    expected = s.value_counts()
+    assert sorted(top["Nilai"]) == sorted(expected.index[:5])
+    # Jumlah Misra-Gries tidak pernah melebihi jumlah sebenarnya dan kurang paling banyak N / (kapasitas + 1)
+    true_counts = expected[top["Nilai"]].to_numpy()
+    assert (top["Jumlah"].to_numpy() <= true_counts).all()
+    assert (true_counts - top["Jumlah"].to_numpy() <= len(s) / (TOP_K_CAPACITY + 1)).all()
+
+@pytest.mark.parametrize("chunksize", [7, 1_000, 10_000])
+def test_top_exact_hanya_jika_jumlah_persis(chunksize):
+    rng = np.random.default_rng(1)
+    n = 3_000
+    df = pd.DataFrame({
+        "kota": rng.choice(["Jakarta", "Bandung", "Medan", None], n),
+        # Tepat sebanyak kapasitas: semua nilai masih dihitung persis
+        "kode": rng.permutation(np.arange(n) % TOP_K_CAPACITY),
+        # Lebih dari kapasitas: jumlah menjadi perkiraan Misra-Gries
+        "id": np.arange(n) % (TOP_K_CAPACITY + 1),
+    })
+    result = profil_frame(df, chunksize=chunksize)
+    assert result["top_exact"] == {"kota": True, "kode": True, "id": False}
+    for col in ("kota", "kode"):
+        top = result["top_values"][col]
+        expected = df[col].value_counts()
+        assert dict(zip(top["Nilai"], top["Jumlah"])) == expected[top["Nilai"]].to_dict()
+        assert sorted(top["Jumlah"], reverse=True) == expected.to_numpy()[:len(top)].tolist()
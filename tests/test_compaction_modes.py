@@ -0,0 +1,41 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from dtype_compaction import compact_frame
+from gabung_engine import DIFF_MODE, MODES, jalankan_mode
+
+def _data():
+    rng = np.random.default_rng(8)
+    n = 400
+    ids = [f"K{i:04d}" for i in range(n)]
+    df1 = pd.DataFrame({
+        "id": ids,
+        "nama": [f"nama {i}" if i % 7 else np.nan for i in range(n)],
+        "kota": rng.choice(["Jakarta", "Bandung", np.nan], n),
+        "harga": rng.integers(0, 1000, n).astype(float),
+    })
+    df2 = df1.sample(frac=0.9, random_state=1).reset_index(drop=True)
+    df2.loc[::11, "nama"] = "berubah"
+    df2.loc[::13, "kota"] = np.nan
+    extra = pd.DataFrame({"id": ["X1", "X2"], "nama": [np.nan, "baru"], "kota": ["Bogor", np.nan], "harga": [1.0, 2.0]})
+    return df1, pd.concat([df2, extra], ignore_index=True)
+
+def _hasil(mode, df1, df2, cmp):
+    result = jalankan_mode(mode, df1, df2, "id", "id", cmp, cmp)
+    # Mode Bandingkan Semua Kolom: hasil per baris, per kolom, dan daftar selisih
+    frames = result if mode == DIFF_MODE else (result,)
+    return [frame.astype(object).where(frame.notna(), None) for frame in frames]
+
+@pytest.mark.parametrize("mode", MODES)
+@pytest.mark.parametrize("cmp", ["nama", "kota"])
+def test_mode_pada_data_terkompaksi_sama_dengan_data_asli(mode, cmp):
+    df1, df2 = _data()
+    compact1, _ = compact_frame(df1)
+    compact2, _ = compact_frame(df2)
+    assert {str(compact1["nama"].dtype), str(compact1["kota"].dtype)} == {"string", "category"}
+    expected = _hasil(mode, df1, df2, cmp)
+    result = _hasil(mode, compact1, compact2, cmp)
+    assert len(result) == len(expected)
+    for frame, expected_frame in zip(result, expected):
+        pd.testing.assert_frame_equal(frame, expected_frame, check_dtype=False)
@@ -0,0 +1,79 @@
+import gzip
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import export
+from export import tulis, tulis_csv_gz, tulis_excel, tulis_parquet
+
+def _data(n=10):
+    rng = np.random.default_rng(0)
+    return pd.DataFrame({
+        "id": np.arange(n),
+        "harga": np.where(rng.random(n) < 0.3, np.nan, rng.normal(100, 10, n).round(2)),
+        "stok": pd.array(rng.integers(0, 9, n), dtype="Int64"),
+        "kota": rng.choice(['Jakarta, "Pusat"', "Bandung\nBaru", "Medan", None], n),
+        "tanggal": pd.date_range("2024-01-01", periods=n, freq="36h"),
+    })
+
+@pytest.mark.parametrize("max_rows,expected_sizes", [(4, [3, 3, 3, 1]), (6, [5, 5]), (11, [10]), (12, [10])])
+def test_excel_dipecah_per_batas_baris(tmp_path, monkeypatch, max_rows, expected_sizes):
+    monkeypatch.setattr(export, "EXCEL_MAX_ROWS", max_rows)
+    monkeypatch.setattr(export, "WRITE_BATCH_ROWS", 2)
+    df = _data()
+    path = tmp_path / "hasil.xlsx"
+    tulis_excel(iter([("data", df), ("kosong", df.iloc[:0])]), path)
+    sheets = pd.read_excel(path, sheet_name=None)
+    names = ["data"] + [f"data_{i}" for i in range(2, len(expected_sizes) + 1)] + ["kosong"]
+    assert list(sheets) == names
+    assert [len(sheets[name]) for name in names] == expected_sizes + [0]
+    # Setiap sheet punya header sendiri dan baris tersambung tanpa ada yang hilang atau ganda
+    combined = pd.concat([sheets[name] for name in names[:-1]], ignore_index=True)
+    assert combined.columns.tolist() == df.columns.tolist()
+    assert combined["id"].tolist() == df["id"].tolist()
+    pd.testing.assert_series_equal(combined["harga"], df["harga"])
+    assert combined["kota"].where(combined["kota"].notna(), None).tolist() == df["kota"].tolist()
+    assert sheets["kosong"].columns.tolist() == df.columns.tolist()
+
+def test_nama_sheet_excel(tmp_path):
+    path = tmp_path / "hasil.xlsx"
+    df = pd.DataFrame({"a": [1]})
+    tulis_excel([("a/b:c", df), ("A_B_C", df), ("x" * 40, df), ("", df)], path)
+    assert list(pd.read_excel(path, sheet_name=None)) == ["a_b_c", "A_B_C_2", "x" * 31, "Sheet"]
+
+@pytest.mark.parametrize("n,batch", [(10, 3), (10, 50_000), (0, 3)])
+def test_csv_gz_bolak_balik(tmp_path, monkeypatch, n, batch):
+    monkeypatch.setattr(export, "WRITE_BATCH_ROWS", batch)
+    df = _data(n)
+    path = tmp_path / "hasil.csv.gz"
+    tulis_csv_gz(df, path)
+    with gzip.open(path, "rt", encoding="utf-8", newline="") as f:
+        assert f.read() == df.to_csv(index=False)
+    result = pd.read_csv(path, parse_dates=["tanggal"], dtype={"stok": "Int64"})
+    # CSV tidak membedakan None dan NaN
+    expected = df.assign(kota=df["kota"].fillna(np.nan))
+    pd.testing.assert_frame_equal(result, expected, check_dtype=n > 0)
+
+def test_parquet_bolak_balik(tmp_path):
+    df = _data()
+    df["kategori"] = pd.Categorical(df["kota"])
+    path = tmp_path / "hasil.parquet"
+    tulis_parquet(df, path)
+    pd.testing.assert_frame_equal(pd.read_parquet(path), df)
+
+def test_parquet_kolom_campuran_menjadi_teks(tmp_path):
+    df = pd.DataFrame({"id": [1, 2, 3], "nilai": pd.Series([1, "dua", None], dtype=object)})
+    path = tmp_path / "hasil.parquet"
+    tulis_parquet(df, path)
+    result = pd.read_parquet(path)
+    assert result["nilai"].tolist() == ["1", "dua", None]
+    assert result["id"].tolist() == [1, 2, 3]
+
+def test_tulis_format(tmp_path):
+    df = _data()
+    # CSV/Parquet hanya memuat sheet pertama
+    tulis(iter([("data", df), ("lain", df.iloc[:2])]), "parquet", tmp_path / "hasil.parquet")
+    assert len(pd.read_parquet(tmp_path / "hasil.parquet")) == len(df)
+    with pytest.raises(ValueError, match="Format ekspor tidak dikenal"):
+        tulis([("data", df)], "json", tmp_path / "hasil.json")
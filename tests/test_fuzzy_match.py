@@ -0,0 +1,85 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from fuzzy_match import FUZZY_MAX_CHARS, FUZZY_WINDOW, cocokkan_mirip
+from gabung_engine import data2_tidak_ada_di_data1, indeks_key, jalankan_mode, key_mirip
+
+def _dice(a, b):
+    def bigrams(text):
+        text = "\x01" + text[:FUZZY_MAX_CHARS] + "\x01"
+        return {text[i:i + 2] for i in range(len(text) - 1)}
+    x, y = bigrams(a), bigrams(b)
+    return 2 * len(x & y) / (len(x) + len(y))
+
+def _referensi(texts1, texts2, threshold):
+    """Semua pasangan dinilai, lalu dipasangkan satu-satu: skor tertinggi dulu, seri urutan key."""
+    uniques1, uniques2 = list(dict.fromkeys(texts1)), list(dict.fromkeys(texts2))
+    pairs = sorted(((-_dice(a, b), i, j) for i, a in enumerate(uniques1) for j, b in enumerate(uniques2)
+                    if a and b and _dice(a, b) >= threshold))
+    match, used = {}, set()
+    for score, i, j in pairs:
+        if i not in match and j not in used:
+            match[i] = (j, -score)
+            used.add(j)
+    result = [match.get(uniques1.index(t)) for t in texts1]
+    return ([texts2.index(uniques2[m[0]]) if m else -1 for m in result],
+            [m[1] if m else np.nan for m in result])
+
+@pytest.mark.parametrize("seed", range(30))
+def test_cocokkan_mirip_sama_dengan_referensi(seed):
+    # Paling banyak FUZZY_WINDOW + 1 key, jadi blocking membandingkan semua pasangan
+    rng = np.random.default_rng(seed)
+    base = ["".join(rng.choice(list("abcd12-"), rng.integers(3, 10))) for _ in range(4)]
+    def varian(text):
+        chars = list(text)
+        chars[rng.integers(0, len(chars))] = str(rng.choice(list("abxz9")))
+        return "".join(chars)
+    texts1 = [varian(t) if rng.random() < 0.5 else t for t in rng.choice(base, 5)] + [""]
+    texts2 = [varian(t) for t in rng.choice(base, FUZZY_WINDOW + 1 - 6)]
+    threshold = float(rng.choice([0.5, 0.7, 0.8]))
+    match, score, matched2 = cocokkan_mirip(texts1, texts2, threshold)
+    expected_match, expected_score = _referensi(texts1, texts2, threshold)
+    assert match.tolist() == expected_match
+    np.testing.assert_allclose(score, expected_score, rtol=1e-6)
+    assert matched2.tolist() == [t in {texts2[m] for m in expected_match if m >= 0} for t in texts2]
+
+def test_salah_ketik_dipasangkan():
+    match, score, matched2 = cocokkan_mirip(["PLG-000123", "PLG-000999"], ["PLG-000124", "XYZ"])
+    assert match.tolist() == [0, -1]
+    assert score[0] == pytest.approx(_dice("PLG-000123", "PLG-000124"))
+    assert matched2.tolist() == [True, False]
+
+def test_di_bawah_ambang_tidak_dipasangkan():
+    match, _, matched2 = cocokkan_mirip(["abcd"], ["wxyz"], 0.5)
+    assert match.tolist() == [-1] and not matched2.any()
+    score = _dice("PLG-000123", "PLG-000124")
+    assert cocokkan_mirip(["PLG-000123"], ["PLG-000124"], score + 1e-6)[0].tolist() == [-1]
+    assert cocokkan_mirip(["PLG-000123"], ["PLG-000124"], score)[0].tolist() == [0]
+
+def test_seri_dan_satu_satu():
+    # Dua key Data 1 sama mirip dengan satu key Data 2: hanya key pertama yang dipasangkan
+    match, _, matched2 = cocokkan_mirip(["abcdefgh1", "abcdefgh2"], ["abcdefgh3"])
+    assert match.tolist() == [0, -1]
+    # Key dengan skor lebih tinggi didahulukan walau urutannya belakangan
+    match, _, _ = cocokkan_mirip(["jalan mawar 1", "jalan mawar 10"], ["jalan mawar 10a"], 0.7)
+    assert match.tolist() == [-1, 0]
+    # Teks yang sama adalah satu key: semua barisnya ikut terpasang ke baris pertama Data 2
+    match, _, matched2 = cocokkan_mirip(["abcdefgh1", "abcdefgh1"], ["abcdefgh2", "abcdefgh2"])
+    assert match.tolist() == [0, 0]
+    assert matched2.tolist() == [True, True]
+
+def test_mode_validasi_dengan_key_mirip():
+    df1 = pd.DataFrame({"kode": ["PLG-000123", "PLG-000500"], "nilai": [1, 2]})
+    df2 = pd.DataFrame({"kode": ["PLG-000124", "PLG-000500", "ZZZ-1"], "nilai": [1, 2, 3]})
+    result = jalankan_mode("Gabung & Validasi", df1, df2, "kode", "kode", "nilai", "nilai", fuzzy_threshold=0.8)
+    assert result["Status"].tolist() == ["Mirip", "Valid", "Tidak Ada pada Data 1"]
+    assert result["kode"].tolist() == ["PLG-000123", "PLG-000500", "ZZZ-1"]
+
+def test_preview_data2_tanpa_pasangan_mirip():
+    df1 = pd.DataFrame({"kode": ["PLG-000123", "PLG-000500"]})
+    df2 = pd.DataFrame({"kode": ["PLG-000124", "PLG-000500", "ZZZ-1"]})
+    keys = indeks_key(df1, df2, "kode", "kode")
+    assert data2_tidak_ada_di_data1(df1, df2, "kode", "kode", keys)["kode"].tolist() == ["PLG-000124", "ZZZ-1"]
+    mirip = key_mirip(df1, df2, "kode", "kode", keys, 0.8)
+    assert data2_tidak_ada_di_data1(df1, df2, "kode", "kode", keys, mirip)["kode"].tolist() == ["ZZZ-1"]
@@ -0,0 +1,30 @@
+import pandas as pd
+import pytest
+
+from gabung_cli import main
+
+def _tulis_data(tmp_path):
+    df1 = pd.DataFrame({"kode": [" a1 ", "B2", "c3"], "harga": [10.0, 20.0, 30.0],
+                        "tanggal": ["2024-01-01", "2024-01-02", "2024-01-03"]})
+    df2 = pd.DataFrame({"kode": ["A1", "b2", "C3"], "harga": [10.004, 20.0, 31.0],
+                        "tanggal": ["2024-01-01", "2024-01-03", "2024-01-03"]})
+    path1, path2 = tmp_path / "master.csv", tmp_path / "cabang.csv"
+    df1.to_csv(path1, index=False)
+    df2.to_csv(path2, index=False)
+    return str(path1), str(path2)
+
+@pytest.mark.parametrize("streaming", [False, True])
+def test_diff_memakai_normalisasi_dan_toleransi(tmp_path, streaming):
+    path1, path2 = _tulis_data(tmp_path)
+    argv = [path1, path2, "--mode", "diff", "--pk1", "kode", "--pk2", "kode", "--normalisasi", "trim", "casefold",
+            "--toleransi-angka", "0.01", "--toleransi-tanggal", "1D", "--output-dir", str(tmp_path / "hasil"),
+            "--workers", "1"]
+    assert main(argv + (["--streaming"] if streaming else [])) == 0
+    result = pd.read_csv(tmp_path / "hasil" / "cabang_hasil.csv").sort_values("kode")
+    # Semua key berpasangan setelah trim+casefold; hanya harga c3 yang melewati toleransi
+    assert result["Status"].tolist() == ["Sama", "Sama", "Beda"]
+    assert result["Kolom Beda"].fillna("").tolist() == ["", "", "harga"]
+    summary = pd.read_csv(tmp_path / "hasil" / "cabang_hasil_per_kolom.csv")
+    assert summary[["Kolom Data 1", "Jumlah Beda"]].values.tolist() == [["harga", 1], ["tanggal", 0]]
+    diffs = pd.read_csv(tmp_path / "hasil" / "cabang_hasil_selisih.csv")
+    assert diffs[["Kolom", "Nilai Data 1", "Nilai Data 2"]].values.tolist() == [["harga", 30.0, 31.0]]
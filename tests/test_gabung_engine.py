@@ -0,0 +1,121 @@
+import warnings
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from gabung_engine import (
+    DIFF_MODE,
+    MAX_OUTPUT_FACTOR,
+    cek_ukuran_hasil,
+    gabung_data_saja,
+    gabung_validasi_data,
+    indeks_key,
+    jalankan_mode,
+    outer_join_key,
+    profil_key,
+    terapkan_kebijakan_duplikat,
+)
+
+KEYS = {
+    "angka": [2.0, np.nan, 1.0, 2.0],
+    "teks": ["b", None, "a", "b"],
+    "tanggal": pd.to_datetime(["2021-01-01", None, "2020-01-01", "2021-01-01"]),
+    "tanggal_tz": pd.to_datetime(["2021-01-01", None, "2020-01-01", "2021-01-01"]).tz_localize("UTC"),
+}
+
+@pytest.mark.parametrize("kind", KEYS)
+def test_outer_join_key_urutan_sama_dengan_merge(kind):
+    df1 = pd.DataFrame({"k": KEYS[kind], "a": [1, 2, 3, 4]})
+    df2 = pd.DataFrame({"k": pd.Series(KEYS[kind])[[3, 1, 1, 2]].to_numpy(), "b": [5, 6, 7, 8]})
+    expected = pd.merge(df1, df2, on="k", how="outer", suffixes=("_Data1", "_Data2"))
+    pd.testing.assert_frame_equal(outer_join_key(df1, df2, "k", "k"), expected, check_dtype=False)
+
+def test_gabung_tanpa_futurewarning():
+    df1 = pd.DataFrame({"id": [1, 2], "tgl": pd.to_datetime(["2024-01-01", "2024-01-02"]), "n": [1, 2],
+                        "h": [1.0, 2.0]})
+    df2 = pd.DataFrame({"id": [2, 3], "tgl": [None, None], "h": [2.0, 5.0]})
+    with warnings.catch_warnings():
+        warnings.simplefilter("error", FutureWarning)
+        result = gabung_validasi_data(df1, df2, "id", "id", "h", "h")
+        merged = gabung_data_saja(df1, df2, "id", "id")
+    # Kolom yang kosong di baris baru mengikuti dtype hasil validasi
+    assert result["tgl"].dtype.kind == "M"
+    assert result["n"].dtype == np.float64
+    assert merged["tgl"].dtype.kind == "M"
+
+def _data_duplikat():
+    # Key 1 berulang di kedua data (many-to-many), key kosong hanya di Data 1
+    df1 = pd.DataFrame({"id": [1, 1, 2, 3, np.nan], "v": [10, 20, 30, 40, 50], "nama": ["a", "b", "c", "d", "e"]})
+    df2 = pd.DataFrame({"id": [1, 1, 1, 2, 4], "w": [1, 2, 3, 4, 5]})
+    return df1, df2
+
+def test_profil_key():
+    df1, df2 = _data_duplikat()
+    profile = profil_key(indeks_key(df1, df2, "id", "id"))
+    assert profile["data1"] == {"rows": 5, "unique_keys": 3, "duplicate_keys": 1, "duplicate_rows": 1, "empty_keys": 1}
+    assert profile["data2"] == {"rows": 5, "unique_keys": 3, "duplicate_keys": 1, "duplicate_rows": 2, "empty_keys": 0}
+    assert profile["matched_keys"] == 2
+    assert profile["many_to_many_keys"] == 1
+    assert profile["rows_per_mode"] == {"Validasi Saja": 5, "Gabung & Validasi": 6, "Gabung Data Saja": 10,
+                                        DIFF_MODE: 6}
+    assert len(gabung_data_saja(df1, df2, "id", "id")) == 10
+
+@pytest.mark.parametrize("kebijakan, v, w, rows", [
+    ("semua", [10, 20, 30, 40, 50], [1, 2, 3, 4, 5], 10),
+    ("pertama", [10, 30, 40, 50], [1, 4, 5], 5),
+    ("terakhir", [20, 30, 40, 50], [3, 4, 5], 5),
+    ("agregasi", [30, 30, 40, 50], [6, 4, 5], 5),
+])
+def test_kebijakan_duplikat(kebijakan, v, w, rows):
+    df1, df2 = _data_duplikat()
+    keys = indeks_key(df1, df2, "id", "id")
+    out1, out2, (index1, index2) = terapkan_kebijakan_duplikat(df1, df2, "id", "id", keys, kebijakan)
+    assert out1["v"].tolist() == v
+    assert out2["w"].tolist() == w
+    assert (len(index1), len(index2)) == (len(out1), len(out2))
+    if kebijakan == "agregasi":
+        # Kolom selain angka memakai nilai pertama per key
+        assert out1["nama"].tolist() == ["a", "c", "d", "e"]
+    result = jalankan_mode("Gabung Data Saja", df1, df2, "id", "id", kebijakan_duplikat=kebijakan)
+    assert len(result) == rows
+
+def test_kebijakan_tolak():
+    df1, df2 = _data_duplikat()
+    with pytest.raises(ValueError, match="Key duplikat"):
+        jalankan_mode("Gabung Data Saja", df1, df2, "id", "id", kebijakan_duplikat="tolak")
+    unique1, unique2 = df1.iloc[1:], df2.iloc[2:]
+    assert len(jalankan_mode("Gabung Data Saja", unique1, unique2, "id", "id", kebijakan_duplikat="tolak")) == 5
+
+def test_batas_ukuran_hasil():
+    # 25 x 25 baris ber-key sama: 625 baris hasil, lebih dari 10x 50 baris input
+    df1 = pd.DataFrame({"id": [1] * 25, "v": range(25)})
+    df2 = pd.DataFrame({"id": [1] * 25, "w": range(25)})
+    keys = indeks_key(df1, df2, "id", "id")
+    with pytest.raises(ValueError, match="625"):
+        cek_ukuran_hasil(df1, df2, keys, "Gabung Data Saja", MAX_OUTPUT_FACTOR)
+    with pytest.raises(ValueError, match="Penggabungan dihentikan"):
+        jalankan_mode("Gabung Data Saja", df1, df2, "id", "id")
+    cek_ukuran_hasil(df1, df2, keys, "Validasi Saja", MAX_OUTPUT_FACTOR)
+    cek_ukuran_hasil(df1, df2, keys, "Gabung Data Saja", 13)
+    assert len(jalankan_mode("Gabung Data Saja", df1, df2, "id", "id", batas_faktor=None)) == 625
+    assert len(jalankan_mode("Gabung Data Saja", df1, df2, "id", "id", kebijakan_duplikat="pertama")) == 1
+
+def test_outer_join_key_melapor_progress_dan_bisa_dibatalkan():
+    df1 = pd.DataFrame({"k": [1, 2, 3], "a": [1, 2, 3], "x": [1, 1, 1]})
+    df2 = pd.DataFrame({"k": [3, 4], "a": [5, 6], "y": [0, 0]})
+    calls = []
+    result = outer_join_key(df1, df2, "k", "k", progress=lambda fraction, message=None: calls.append(fraction))
+    pd.testing.assert_frame_equal(result, pd.merge(df1, df2, on="k", how="outer", suffixes=("_Data1", "_Data2")),
+                                  check_dtype=False)
+    # Progress naik per kolom hasil, bukan hanya di awal dan akhir
+    assert calls == sorted(calls) and calls[-1] == 1.0 and len(calls) > len(result.columns)
+
+    class Batal(Exception):
+        pass
+
+    def progress(fraction, message=None):
+        if fraction > 0.5:
+            raise Batal()
+    with pytest.raises(Batal):
+        outer_join_key(df1, df2, "k", "k", progress=progress)
@@ -0,0 +1,66 @@
+import io
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from gabung_engine import DIFF_MODE, MODES, jalankan_mode, load_file, urutan_kolom
+from gabung_stream import file_pendamping_diff, rekonsiliasi_streaming
+
+def _tulis_data(tmp_path):
+    rng = np.random.default_rng(2)
+    n = 600
+    df1 = pd.DataFrame({
+        "id": np.arange(1000, 1000 + n),
+        "harga": rng.integers(0, 50, n),
+        "stok": np.where(rng.random(n) < 0.1, np.nan, rng.integers(0, 9, n)),
+        "aktif": rng.random(n) < 0.5,
+        "kota": rng.choice(["Jakarta", "Bandung", "Medan"], n),
+        "lunas": pd.Series(rng.random(n) < 0.5, dtype=object).where(rng.random(n) < 0.9),
+        "tanggal": pd.date_range("2024-01-01", periods=n, freq="D").strftime("%d/%m/%Y"),
+    })
+    df2 = df1.sample(frac=0.8, random_state=3).reset_index(drop=True)
+    df2["harga"] = df2["harga"].astype(object)
+    df2.loc[::9, "harga"] = df2.loc[::9, "harga"] + 1
+    # Satu nilai teks membuat kolom harga Data 2 bertipe object di seluruh file, bukan hanya di
+    # partisi yang memuatnya
+    df2.loc[len(df2) // 2, "harga"] = "x"
+    df2.loc[::17, "tanggal"] = "02/01/2024"
+    df2 = pd.concat([df2, pd.DataFrame({"id": [5000, 5001], "harga": [1, 2], "stok": [np.nan, 1.0],
+                                        "aktif": [True, False], "kota": ["Bogor", "Depok"],
+                                        "lunas": [True, np.nan], "tanggal": ["01/01/2024", np.nan]})],
+                    ignore_index=True)
+    # Key ditulis sebagai "1000.0" di Data 2 tetap sama dengan 1000 di Data 1
+    df2["id"] = df2["id"].astype(float)
+    path1, path2 = tmp_path / "data1.csv", tmp_path / "data2.csv"
+    df1.to_csv(path1, index=False)
+    df2.to_csv(path2, index=False, float_format="%.1f")
+    return str(path1), str(path2)
+
+def _urutkan(csv):
+    """Baris CSV sebagai teks apa adanya, diurutkan (urutan baris streaming mengikuti partisi)."""
+    df = pd.read_csv(csv, dtype=str, keep_default_na=False)
+    return df.sort_values(df.columns.tolist()).reset_index(drop=True)
+
+@pytest.mark.parametrize("mode", MODES)
+@pytest.mark.parametrize("n_partitions,chunksize", [(1, 1000), (3, 97), (7, 50)])
+def test_streaming_sama_dengan_in_memory(tmp_path, mode, n_partitions, chunksize):
+    path1, path2 = _tulis_data(tmp_path)
+    df1, df2 = load_file(path1), load_file(path2)
+    expected = jalankan_mode(mode, df1, df2, "id", "id", "harga", "harga")
+    if mode == DIFF_MODE:
+        expected, expected_summary, expected_diffs = expected
+    expected = expected[urutan_kolom(expected, df1.columns, mode, "harga", "harga")]
+    output = tmp_path / "hasil.csv"
+    summary = rekonsiliasi_streaming(path1, path2, "id", "id", mode, str(output), "harga", "harga",
+                                     chunksize=chunksize, n_partitions=n_partitions)
+    assert summary["rows"] == len(expected)
+    pd.testing.assert_frame_equal(_urutkan(output), _urutkan(io.StringIO(expected.to_csv(index=False))))
+    if "Status" in expected.columns:
+        assert summary["status_counts"] == {k: int(v) for k, v in expected["Status"].value_counts().items()}
+    if mode == DIFF_MODE:
+        summary_path, diff_path = file_pendamping_diff(str(output))
+        assert (summary["summary_output"], summary["diff_output"]) == (summary_path, diff_path)
+        pd.testing.assert_frame_equal(pd.read_csv(summary_path),
+                                      pd.read_csv(io.StringIO(expected_summary.to_csv(index=False))))
+        pd.testing.assert_frame_equal(_urutkan(diff_path), _urutkan(io.StringIO(expected_diffs.to_csv(index=False))))
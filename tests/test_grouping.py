@@ -0,0 +1,73 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from grouping import GROUP_AGGREGATES, GroupIndex, jumlah_halaman, kelompok_halaman, ringkasan_kelompok
+
+# GroupIndex dibandingkan dengan df.groupby (dropna=True, sort=True) pada data acak berisi NaN
+
+def _data(rng, n=300):
+    df = pd.DataFrame({
+        "kota": rng.choice(["Jakarta", "Bandung", "Medan", "Bogor", np.nan], n),
+        "kelas": rng.choice([1.0, 2.0, 3.0, np.nan], n),
+        "harga": np.where(rng.random(n) < 0.1, np.nan, rng.integers(0, 1000, n)),
+        "stok": rng.integers(0, 50, n),
+        "catatan": rng.choice(["a", "b"], n),
+    })
+    return df.set_axis(rng.permutation(n) + 100)
+
+@pytest.mark.parametrize("seed", range(10))
+@pytest.mark.parametrize("column", ["kota", "kelas"])
+def test_posisi_dan_ukuran_sama_dengan_groupby(seed, column):
+    df = _data(np.random.default_rng(seed))
+    index = GroupIndex(df[column].to_numpy())
+    grouped = df.groupby(column, sort=True)
+    assert index.keys == grouped.size().index.tolist()
+    assert index.sizes().tolist() == grouped.size().tolist()
+    for i, key in enumerate(index.keys):
+        np.testing.assert_array_equal(index.positions(i), grouped.indices[key])
+        pd.testing.assert_frame_equal(index.frame(df, i), grouped.get_group(key))
+    # Baris dengan nilai kosong tidak masuk kelompok mana pun
+    assert index.sizes().sum() == df[column].notna().sum()
+
+@pytest.mark.parametrize("seed", range(5))
+def test_kelompok_tingkat_kedua_sama_dengan_groupby_dua_kolom(seed):
+    df = _data(np.random.default_rng(seed))
+    index = GroupIndex(df["kota"].to_numpy())
+    grouped = df.groupby(["kota", "kelas"], sort=True)
+    pairs = []
+    for i, key in enumerate(index.keys):
+        sub_index = index.sub_index(df, i, "kelas")
+        for j, second in enumerate(sub_index.keys):
+            pairs.append((key, second))
+            pd.testing.assert_frame_equal(sub_index.frame(df, j), grouped.get_group((key, second)))
+    assert pairs == grouped.size().index.tolist()
+
+@pytest.mark.parametrize("seed", range(5))
+def test_ringkasan_sama_dengan_groupby(seed):
+    df = _data(np.random.default_rng(seed))
+    summary = ringkasan_kelompok(df, "kota", GroupIndex(df["kota"].to_numpy()))
+    grouped = df.groupby("kota", sort=True)
+    expected = grouped[["kelas", "harga", "stok"]].agg(GROUP_AGGREGATES)
+    expected.columns = [f"{col} ({agg})" for col, agg in expected.columns]
+    expected.insert(0, "Jumlah Baris", grouped.size())
+    expected = expected.reset_index()
+    pd.testing.assert_frame_equal(summary, expected, check_dtype=False)
+
+def test_kolom_kosong_semua():
+    df = pd.DataFrame({"kota": [np.nan, None, np.nan], "harga": [1, 2, 3]})
+    index = GroupIndex(df["kota"].to_numpy())
+    assert len(index) == 0
+    assert ringkasan_kelompok(df, "kota", index).columns.tolist() == ["kota", "Jumlah Baris"]
+    assert jumlah_halaman(index, 10) == 1 and list(kelompok_halaman(index, 1, 10)) == []
+
+def test_halaman_kelompok():
+    index = GroupIndex(np.arange(23) % 23)
+    assert jumlah_halaman(index, 10) == 3
+    pages = [list(kelompok_halaman(index, page, 10)) for page in range(1, 4)]
+    assert [len(page) for page in pages] == [10, 10, 3]
+    # Setiap kelompok tampil tepat sekali; halaman di luar rentang dibatasi ke halaman terdekat
+    assert sum(pages, []) == list(range(23))
+    assert list(kelompok_halaman(index, 9, 10)) == pages[-1]
+    assert list(kelompok_halaman(index, 0, 10)) == pages[0]
+    assert jumlah_halaman(GroupIndex(np.arange(20)), 10) == 2
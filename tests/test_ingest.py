@@ -0,0 +1,75 @@
+import pandas as pd
+import pytest
+
+import file_cache
+from ingest import SOURCE_COLUMN, baca_sumber, gabung_sumber, selaraskan_kolom, sidik_jari_sumber
+
+# Semua uji memakai workers=1 (jalur serial) agar tidak memulai process pool
+
+@pytest.fixture(autouse=True)
+def _cache_sementara(tmp_path, monkeypatch):
+    monkeypatch.setattr(file_cache, "CACHE_DIR", str(tmp_path / "cache"))
+
+def test_selaraskan_kolom():
+    frames = [
+        pd.DataFrame({"Kode Pos": [1], "Nama": ["a"]}),
+        pd.DataFrame({"nama": ["b"], "kode_pos": [2], "Kota": ["x"]}),
+        # Dua kolom dengan nama bersih sama di satu frame tetap terpisah
+        pd.DataFrame({"KOTA": ["y"], "kota ": ["z"]}),
+    ]
+    renamed, columns = selaraskan_kolom(frames)
+    assert columns == ["Kode Pos", "Nama", "Kota", "kota "]
+    assert [df.columns.tolist() for df in renamed] == [["Kode Pos", "Nama"], ["Nama", "Kode Pos", "Kota"],
+                                                       ["Kota", "kota "]]
+    # Frame yang namanya sudah sama dikembalikan apa adanya
+    assert renamed[0] is frames[0]
+
+def _tulis(tmp_path):
+    """Tiga file dengan kolom dan tipe berbeda: kolom hilang, int vs float vs teks, nama beda kapital."""
+    pd.DataFrame({"ID": [1, 2], "Harga": [10, 20], "Kota": ["a", "b"]}).to_csv(tmp_path / "jan.csv", index=False)
+    pd.DataFrame({"id": [3], "harga": [1.5], "Tanggal": ["2024-02-01"]}).to_csv(tmp_path / "feb.csv", index=False)
+    with pd.ExcelWriter(tmp_path / "mar.xlsx") as writer:
+        pd.DataFrame({"Harga": ["mahal"], "id": [4], "Sumber": ["kolom asli"]}).to_excel(
+            writer, sheet_name="Maret", index=False)
+        pd.DataFrame({"id": [5, 6]}).to_excel(writer, sheet_name="April", index=False)
+    return [(str(tmp_path / "jan.csv"), None), (str(tmp_path / "feb.csv"), None),
+            (str(tmp_path / "mar.xlsx"), "Maret"), (str(tmp_path / "mar.xlsx"), "April")]
+
+def test_gabung_sumber_dengan_kolom_dan_tipe_berbeda(tmp_path):
+    sources = _tulis(tmp_path)
+    result = gabung_sumber(sources, workers=1)
+    # Kolom sumber diberi akhiran karena nama "Sumber" sudah dipakai data
+    assert result.columns.tolist() == ["ID", "Harga", "Kota", "Tanggal", "Sumber", "Sumber_2"]
+    assert result["ID"].tolist() == [1, 2, 3, 4, 5, 6]
+    assert result["Harga"].tolist()[:4] == [10, 20, 1.5, "mahal"]
+    assert result["Harga"].iloc[4:].isna().all()
+    assert result["Kota"].tolist()[:2] == ["a", "b"] and result["Kota"].iloc[2:].isna().all()
+    assert result["Sumber_2"].tolist() == ["jan.csv", "jan.csv", "feb.csv", "mar.xlsx [Maret]",
+                                           "mar.xlsx [April]", "mar.xlsx [April]"]
+    # Hasil sama dengan concat manual setelah nama kolom disamakan
+    frames, columns = selaraskan_kolom(baca_sumber(sources, workers=1))
+    expected = pd.concat(frames, ignore_index=True).reindex(columns=columns)
+    pd.testing.assert_frame_equal(result.drop(columns="Sumber_2"), expected)
+
+def test_sumber_tunggal_dan_label_kembar(tmp_path):
+    sources = _tulis(tmp_path)
+    single = gabung_sumber(sources[:1], workers=1)
+    assert SOURCE_COLUMN not in single.columns
+    pd.testing.assert_frame_equal(single, pd.read_csv(sources[0][0]))
+    # File yang sama dipilih dua kali tetap bisa dibedakan asalnya
+    twice = gabung_sumber([sources[0], sources[0]], workers=1)
+    assert twice[SOURCE_COLUMN].tolist() == ["jan.csv"] * 2 + ["jan.csv (2)"] * 2
+    with pytest.raises(ValueError):
+        gabung_sumber([], workers=1)
+
+def test_baca_sumber_memakai_cache(tmp_path, monkeypatch):
+    sources = _tulis(tmp_path)
+    first = baca_sumber(sources, workers=1)
+    calls = []
+    monkeypatch.setattr(file_cache.pd, "read_csv", lambda *a, **k: calls.append(a) or pd.DataFrame())
+    again = baca_sumber(sources, workers=1)
+    assert calls == []
+    for a, b in zip(first, again):
+        pd.testing.assert_frame_equal(a, b)
+    assert sidik_jari_sumber(sources) == sidik_jari_sumber(list(sources))
+    assert sidik_jari_sumber(sources) != sidik_jari_sumber(sources[::-1])
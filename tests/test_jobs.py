@@ -0,0 +1,38 @@
+import threading
+
+from jobs import JobCancelled, buat_pool, jalankan
+
+def _tunggu_event(event, progress=None):
+    event.wait(5)
+    progress(1.0)
+    return "selesai"
+
+def test_pool_per_sesi_tidak_saling_menunggu():
+    blocker = threading.Event()
+    pool1, pool2 = buat_pool(max_workers=1), buat_pool(max_workers=1)
+    busy = jalankan(_tunggu_event, blocker, pool=pool1)
+    queued = jalankan(_tunggu_event, threading.Event(), pool=pool1)
+    # Job kedua di pool yang sama mengantre; job di pool sesi lain langsung berjalan
+    assert queued.menunggu()
+    other = jalankan(lambda progress=None: "lain", pool=pool2)
+    assert other.tunggu(5) and other.result() == "lain"
+    assert not busy.done() and queued.menunggu()
+    queued.batalkan()
+    blocker.set()
+    assert busy.tunggu(5) and busy.result() == "selesai" and not busy.menunggu()
+    assert queued.tunggu(5) and queued.cancelled() and queued.exception() is None
+
+def test_pembatalan_pada_progress_berikutnya():
+    started, release = threading.Event(), threading.Event()
+
+    def kerja(progress=None):
+        started.set()
+        release.wait(5)
+        progress(0.5)
+        return "tidak sampai"
+    job = jalankan(kerja, pool=buat_pool())
+    assert started.wait(5)
+    job.batalkan()
+    release.set()
+    assert job.tunggu(5) and job.cancelled()
+    assert isinstance(job.future.exception(), JobCancelled)
@@ -0,0 +1,98 @@
+import re
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from key_index import KeyIndex, KeyIndexCache, hash_kolom, hash_kunci, teks_kunci
+
+def _kanonik(value, normalisasi):
+    """Bentuk key satu nilai menurut NORMALIZATIONS, untuk dibandingkan dengan hash_kolom."""
+    if value is None or (isinstance(value, float) and np.isnan(value)):
+        return None
+    if isinstance(value, str):
+        text = value
+        if "trim" in normalisasi:
+            text = text.strip()
+        if "casefold" in normalisasi:
+            text = text.casefold()
+        if "nol_depan" in normalisasi:
+            text = re.sub(r"^0+(?=\d)", "", text)
+        if "numerik" in normalisasi:
+            number = pd.to_numeric(pd.Series([text]), errors="coerce").iloc[0]
+            if not np.isnan(number):
+                return ("angka", float(number))
+        return ("teks", text)
+    return ("angka", float(value))
+
+VALUES = ["A1", " A1 ", "a1", "00123", "123", "0123 ", "12", "12.0", " 12", "0", "000", "0A", "Straße", "STRASSE",
+          "", " ", 12, 12.0, 123, 0, 1.5, None, np.nan]
+COMBINATIONS = [(), ("trim",), ("casefold",), ("nol_depan",), ("numerik",), ("trim", "nol_depan"),
+                ("trim", "casefold", "nol_depan", "numerik")]
+
+@pytest.mark.parametrize("normalisasi", COMBINATIONS)
+def test_hash_sama_jika_bentuk_kanonik_sama(normalisasi):
+    s = pd.Series(VALUES, dtype=object)
+    hashes, missing = hash_kolom(s, normalisasi)
+    canonical = [_kanonik(v, normalisasi) for v in VALUES]
+    assert missing.tolist() == [c is None for c in canonical]
+    for i in range(len(VALUES)):
+        for j in range(len(VALUES)):
+            if canonical[i] is not None and canonical[j] is not None:
+                assert (hashes[i] == hashes[j]) == (canonical[i] == canonical[j]), (VALUES[i], VALUES[j])
+
+def test_normalisasi_satu_per_satu():
+    def sama(a, b, normalisasi=()):
+        hashes, _ = hash_kolom(pd.Series([a, b], dtype=object), normalisasi)
+        return hashes[0] == hashes[1]
+    assert not sama(" A1 ", "A1") and sama(" A1 ", "A1", ("trim",))
+    assert not sama("ABC", "abc") and sama("ABC", "abc", ("casefold",)) and sama("Straße", "STRASSE", ("casefold",))
+    assert not sama("00123", "123") and sama("00123", "123", ("nol_depan",))
+    # Nol tunggal dan nol di depan teks bukan angka tidak dihapus
+    assert sama("000", "0", ("nol_depan",)) and not sama("0A", "A", ("nol_depan",))
+    # Angka dibandingkan berdasarkan nilai; teks angka baru sama dengan angka dengan "numerik"
+    assert sama(12, 12.0) and not sama("12", 12) and not sama("12.0", "12")
+    assert sama("12.0", 12, ("numerik",)) and sama("12.0", "12", ("numerik",))
+    assert sama(" 012", 12.0, ("trim", "nol_depan", "numerik"))
+
+def test_kolom_angka_dan_object_sama():
+    ints, _ = hash_kolom(pd.Series([1, 2, 3]))
+    floats, _ = hash_kolom(pd.Series([1.0, 2.0, np.nan]))
+    texts, _ = hash_kolom(pd.Series(["1", "2.0", "3"], dtype=object), ("numerik",))
+    nullable, missing = hash_kolom(pd.Series([1, None, 3], dtype="Int64"))
+    assert ints[:2].tolist() == floats[:2].tolist() == texts[:2].tolist()
+    assert nullable[[0, 2]].tolist() == ints[[0, 2]].tolist() and missing.tolist() == [False, True, False]
+
+def test_key_gabungan_dengan_bagian_kosong():
+    df1 = pd.DataFrame({"a": ["x", None, "y", "x"], "b": [1, 2, np.nan, 1]})
+    df2 = pd.DataFrame({"a": ["x", np.nan, "y"], "b": [1.0, 2.0, None]})
+    hashes1, valid1 = hash_kunci(df1, ["a", "b"])
+    hashes2, valid2 = hash_kunci(df2, ["a", "b"])
+    assert valid1.tolist() == [True, False, False, True] and valid2.tolist() == [True, False, False]
+    # None dan NaN sama-sama kosong: key kosong berhash sama (konsisten dengan isin), tetapi tidak bisa dicari
+    assert hashes1.tolist()[:3] == hashes2.tolist()
+    index1, index2 = KeyIndex(df1, ["a", "b"]), KeyIndex(df2, ["a", "b"])
+    assert index1.cari(index2.hashes, index2.valid).tolist() == [0, -1, -1]
+    assert index1.ada_di(index2).tolist() == [True, True, True, True]
+    uniques, counts, valid = index1.jumlah_per_key()
+    assert counts.tolist() == [2, 1, 1] and valid.tolist() == [True, False, False]
+    # Urutan kolom key berpengaruh
+    assert hash_kunci(df1, ["b", "a"])[0][0] != hashes1[0]
+    with pytest.raises(ValueError):
+        hash_kunci(df1, [])
+
+def test_teks_kunci():
+    df = pd.DataFrame({"kode": [" 007 ", "AB", None], "angka": [12.0, 1.5, np.nan], "bulat": [1, 2, 3]})
+    assert teks_kunci(df, "angka").tolist() == ["12", "1.5", ""]
+    assert teks_kunci(df, "kode", ("trim", "nol_depan")).tolist() == ["7", "AB", ""]
+    assert teks_kunci(df, ["kode", "bulat"], ("trim", "casefold")).tolist() == ["007 1", "ab 2", " 3"]
+
+def test_key_index_cache():
+    df = pd.DataFrame({"id": [1, 2]})
+    cache = KeyIndexCache(max_entries=2)
+    first = cache.ambil("data1", df, "id")
+    assert cache.ambil("data1", df, ["id"]) is first
+    assert cache.ambil("data1", df, "id", ("trim",)) is not first
+    cache.ambil("data2", df, "id")
+    # Entri paling lama tidak dipakai dikeluarkan
+    assert cache.ambil("data1", df, "id") is not first
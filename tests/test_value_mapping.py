@@ -0,0 +1,118 @@
+import math
+import re
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from cleaning_kernels import map_values_series
+from cleaning_pipeline import step_replace
+from value_mapping import rules_dari_tabel
+
+# map_values_series dibandingkan dengan penggantian per sel yang mengikuti aturan docstring-nya
+
+def _ganti_per_sel(value, rules):
+    if value is None or (isinstance(value, float) and math.isnan(value)):
+        return value
+    key = str(value)
+    for old, new, regex, ignore_case in rules:
+        if not regex and not ignore_case and key == old:
+            return new
+    for old, new, regex, ignore_case in rules:
+        if not regex and ignore_case and key.lower() == old.lower():
+            return new
+    if isinstance(value, str):
+        for old, new, regex, ignore_case in rules:
+            if regex:
+                after = re.sub(old, new, value, flags=re.IGNORECASE if ignore_case else 0)
+                if after != value:
+                    return after
+    return value
+
+def _sama(a, b):
+    if pd.isna(a) or pd.isna(b):
+        return pd.isna(a) and pd.isna(b)
+    return type(a) is type(b) and a == b
+
+def _cek(s, rules):
+    result = map_values_series(s, rules)
+    expected = [_ganti_per_sel(v, rules) for v in s.astype(object)]
+    assert result.index.equals(s.index) and result.name == s.name
+    mismatch = [(v, r, e) for v, r, e in zip(s, result, expected) if not _sama(r, e)]
+    assert not mismatch, mismatch[:5]
+
+WORDS = ["Jakarta", "jakarta", "JAKARTA", "Bandung", "bdg", "Jl. Mawar", "jl mawar", "1200", "x", ""]
+
+def _aturan_acak(rng):
+    rules = []
+    for _ in range(rng.integers(1, 8)):
+        regex, ignore_case = bool(rng.random() < 0.3), bool(rng.random() < 0.4)
+        if regex:
+            old, new = [(r"^jl\.?\s*", "Jalan "), (r"a+", "A"), (r"(\d)00", r"\1k"), (r"^$", "kosong"),
+                        (r"[aeiou]", "")][rng.integers(0, 5)]
+        else:
+            old, new = str(rng.choice(WORDS + ["12", "True"])), str(rng.choice(["JKT", "BDG", "baru", "0"]))
+        rules.append((old, new, regex, ignore_case))
+    return tuple(rules)
+
+def _kolom_acak(rng, n=200):
+    values = np.array(rng.choice(WORDS, n), dtype=object)
+    extra = rng.random(n)
+    values[extra < 0.1] = np.nan
+    values[(extra >= 0.1) & (extra < 0.15)] = None
+    values[(extra >= 0.15) & (extra < 0.25)] = rng.choice([1200, 12, 7])
+    values[(extra >= 0.25) & (extra < 0.28)] = True
+    return pd.Series(values, index=pd.RangeIndex(3, 3 + n), name="kota", dtype=object)
+
+@pytest.mark.parametrize("seed", range(40))
+def test_map_values_series_sama_dengan_per_sel(seed):
+    rng = np.random.default_rng(seed)
+    _cek(_kolom_acak(rng), _aturan_acak(rng))
+
+def test_urutan_dan_prioritas_aturan():
+    s = pd.Series(["Jakarta", "JAKARTA", "jl. mawar", "aa"], dtype=object)
+    rules = (
+        ("^JL\\.\\s*", "Jalan ", True, True),
+        ("a+", "A", True, False),
+        ("jakarta", "huruf kecil", False, True),
+        ("Jakarta", "persis", False, False),
+        ("Jakarta", "persis kedua", False, False),
+        ("A", "tidak berantai", False, False),
+    )
+    # Persis > abaikan kapital > regex; aturan yang lebih awal menang; hasil tidak diganti lagi
+    assert map_values_series(s, rules).tolist() == ["persis", "huruf kecil", "Jalan mawar", "A"]
+    _cek(s, rules)
+
+def test_sel_bukan_teks():
+    s = pd.Series([1200, 1200.0, True, None, np.nan, "1200", 1], dtype=object)
+    rules = (("1200", "seribu dua ratus", False, False), ("true", "ya", False, True), (r"\d+", "angka", True, False))
+    # Angka cocok lewat bentuk teksnya ("1200.0" tidak); regex hanya untuk teks; kosong tetap kosong
+    assert map_values_series(s, rules).tolist()[:3] == ["seribu dua ratus", 1200.0, "ya"]
+    _cek(s, rules)
+    category = s.iloc[[0, 5, 5]].astype(str).astype("category")
+    assert map_values_series(category, rules).astype(object).tolist() == ["seribu dua ratus"] * 3
+
+def test_rules_dari_tabel():
+    table = pd.DataFrame({
+        "Kolom": [" kota ", "", "kota", "", ""],
+        "Nilai Lama": ["Jkt", "x", "", "^a", "b"],
+        "Nilai Baru": ["Jakarta", "y", "diabaikan", "", ""],
+        "Regex": ["", "", "", "ya", "no"],
+        "Abaikan Kapital": ["x", "", "", "", ""],
+    })
+    # Baris tanpa nilai lama, atau tanpa nilai baru pada aturan non-regex, dilewati; urutan tetap
+    assert rules_dari_tabel(table) == (("kota", "Jkt", "Jakarta", False, True), ("", "x", "y", False, False),
+                                       ("", "^a", "", True, False))
+    table.loc[3, "Nilai Lama"] = "(a"
+    with pytest.raises(ValueError, match=re.escape("(a")):
+        rules_dari_tabel(table)
+
+def test_aturan_kolom_kosong_berlaku_untuk_semua_kolom():
+    df = pd.DataFrame({"kota": ["jkt", "x", "bdg"], "cabang": ["jkt", "x", "bdg"], "lain": ["x"] * 3})
+    table = pd.DataFrame({"Kolom": ["kota", "", "cabang"], "Nilai Lama": ["jkt", "x", "bdg"],
+                          "Nilai Baru": ["Jakarta", "-", "Bandung"]})
+    result = step_replace(df, ["kota", "cabang"], rules_dari_tabel(table))
+    assert result["kota"].tolist() == ["Jakarta", "-", "bdg"]
+    assert result["cabang"].tolist() == ["jkt", "-", "Bandung"]
+    # Kolom yang tidak dipilih tidak diubah
+    assert result["lain"].tolist() == ["x"] * 3
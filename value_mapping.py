@@ -0,0 +1,97 @@
+import os
+import re
+
+import pandas as pd
+
+# ---------------------------
+# Tabel Mapping Nilai (Replace Value)
+# ---------------------------
+# Satu baris tabel = satu aturan penggantian. Tabel bisa diisi lewat grid, diunggah sebagai CSV,
+# atau disimpan dengan nama lalu dipakai lagi untuk file lain. Penerapannya ada di
+# cleaning_kernels.map_values_series.
+
+MAPPING_COLUMNS = ["Kolom", "Nilai Lama", "Nilai Baru", "Regex", "Abaikan Kapital"]
+MAPPING_DIR = os.environ.get(
+    "DATA_CLEANING_MAPPING_DIR", os.path.join(os.path.expanduser("~"), ".config", "data_cleaning", "mappings")
+)
+
+# Nama header CSV lain yang diterima (tanpa membedakan huruf besar/kecil)
+_ALIASES = {
+    "kolom": "Kolom", "column": "Kolom",
+    "nilai lama": "Nilai Lama", "lama": "Nilai Lama", "old": "Nilai Lama", "from": "Nilai Lama",
+    "nilai baru": "Nilai Baru", "baru": "Nilai Baru", "new": "Nilai Baru", "to": "Nilai Baru",
+    "regex": "Regex",
+    "abaikan kapital": "Abaikan Kapital", "ignore case": "Abaikan Kapital",
+}
+_TRUE = {"1", "true", "ya", "y", "yes", "x"}
+
+def tabel_kosong():
+    return pd.DataFrame({
+        "Kolom": pd.Series(dtype=object),
+        "Nilai Lama": pd.Series(dtype=object),
+        "Nilai Baru": pd.Series(dtype=object),
+        "Regex": pd.Series(dtype=bool),
+        "Abaikan Kapital": pd.Series(dtype=bool),
+    })
+
+def _flag(values):
+    return values.map(lambda v: bool(v) if isinstance(v, bool) or v is None else str(v).strip().lower() in _TRUE)
+
+def rapikan_tabel(df):
+    """Samakan nama/urutan kolom dan tipe data tabel mapping."""
+    df = df.rename(columns=lambda c: _ALIASES.get(str(c).strip().lower(), c))
+    if "Nilai Lama" not in df.columns and len(df.columns) == 2:
+        df.columns = ["Nilai Lama", "Nilai Baru"]  # CSV dua kolom tanpa header yang dikenal
+    if "Nilai Lama" not in df.columns or "Nilai Baru" not in df.columns:
+        raise ValueError("Tabel mapping harus punya kolom 'Nilai Lama' dan 'Nilai Baru'.")
+    table = tabel_kosong()
+    out = pd.DataFrame(index=df.index)
+    for col in MAPPING_COLUMNS:
+        if col in ("Regex", "Abaikan Kapital"):
+            out[col] = _flag(df[col]) if col in df.columns else False
+        else:
+            out[col] = df[col].fillna("").astype(str) if col in df.columns else ""
+    return pd.concat([table, out], ignore_index=True).astype(table.dtypes.to_dict())
+
+def baca_mapping_csv(file):
+    """Baca tabel mapping dari CSV; semua nilai dibaca sebagai teks apa adanya."""
+    return rapikan_tabel(pd.read_csv(file, dtype=str, keep_default_na=False))
+
+def rules_dari_tabel(df):
+    """Ubah tabel menjadi tuple aturan untuk langkah "replace".
+
+    Baris tanpa nilai lama, atau tanpa nilai baru pada aturan non-regex, diabaikan (belum diisi).
+    Pola regex yang tidak valid menghasilkan ValueError berisi pola tersebut.
+    """
+    rules = []
+    for row in rapikan_tabel(df).itertuples(index=False):
+        column, old, new, regex, ignore_case = row
+        if old == "" or (new == "" and not regex):
+            continue
+        if regex:
+            try:
+                re.compile(old)
+            except re.error as e:
+                raise ValueError(f"Regex tidak valid '{old}': {e}") from e
+        rules.append((column.strip(), old, new, bool(regex), bool(ignore_case)))
+    return tuple(rules)
+
+def _mapping_path(name):
+    safe = re.sub(r"[^\w\- ]", "_", name).strip()
+    if not safe:
+        raise ValueError("Nama mapping tidak boleh kosong.")
+    return os.path.join(MAPPING_DIR, f"{safe}.csv")
+
+def simpan_mapping(name, table):
+    os.makedirs(MAPPING_DIR, exist_ok=True)
+    path = _mapping_path(name)
+    rapikan_tabel(table).to_csv(path, index=False)
+    return path
+
+def daftar_mapping():
+    if not os.path.isdir(MAPPING_DIR):
+        return []
+    return sorted(name[:-4] for name in os.listdir(MAPPING_DIR) if name.endswith(".csv"))
+
+def muat_mapping(name):
+    return baca_mapping_csv(_mapping_path(name))